@@ -0,0 +1,201 @@
+"""Games with many snakes on one board. Every snake and piece of food is recorded in a single occupancy grid by
+owner, and one FreeCellPool holds the cells that are neither snake nor food, so placing food stays O(1) however
+many snakes there are.
+
+A tick moves every snake at once and resolves all collisions in one pass. The tails of snakes that aren't eating
+move out of the way first, so any snake may move into a cell a tail is leaving, even the tail of a snake of length 1,
+which is also its head. Heads moving into the same cell all die, two heads moving into each other's cells both die,
+and a head moving into any other body cell dies. Dead snakes are taken off the board. Every step of a tick is a loop
+over the snakes, the food that was eaten or the cells that changed, never over the board, so a tick costs the same
+on a 20 x 20 board as on a 2000 x 2000 one.
+"""
+
+import random
+from array import array
+
+from engine import MOVED, ATE, DIED
+from free_cells import FreeCellPool
+from snake import Snake
+
+# contents of the occupancy grid besides the owners of snakes, which count up from FIRST_OWNER
+EMPTY = 0
+FOOD = -1
+FIRST_OWNER = 1
+
+
+class ArenaSnake(Snake):
+    """A snake in an arena, which also remembers who it is and the direction it moves in"""
+
+    def __init__(self, owner, initial_cell, free_cells):
+        """creates a snake of length 1
+
+        Args:
+            owner (int) the snake's id in the occupancy grid
+            initial_cell (int) index of the cell to become the head
+            free_cells (FreeCellPool) the arena's free cells
+        """
+
+        Snake.__init__(self, initial_cell, free_cells)
+        self.owner = owner
+        self.direction = None
+
+
+class Arena:
+    """The occupancy grid, snakes and food of a game with many snakes"""
+
+    def __init__(self, dimensions, food_count=1, seed=None):
+        """sets up an empty board with its food. Snakes are added with add_snake
+
+        Args:
+            dimensions (int) number of cells along each side of the square board
+            food_count (int) number of pieces of food kept on the board
+            seed (int) seed for food and starting cells, or None for a random one
+        """
+
+        self.dimensions = dimensions
+        self.area = dimensions * dimensions
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
+        self.grid = array("i", bytes(4 * self.area))
+        self.free_cells = FreeCellPool(self.area)
+        self.snakes = {}
+        self.next_owner = FIRST_OWNER
+        self.food = set()
+        self.food_count = food_count
+        self.moves = 0
+        # cells whose contents changed since the renderer last looked, possibly more than once each
+        self.changed_cells = []
+        self.make_new_food()
+
+    def add_snake(self, cell=None):
+        """puts a new snake of length 1 on the board. It doesn't move until it is given a direction
+
+        Args:
+            cell (int) a cell that is neither snake nor food for its head, or None for a random one
+
+        Returns:
+            the new ArenaSnake
+        """
+
+        if cell is None:
+            cell = self.free_cells.sample(self.rng)
+        snake = ArenaSnake(self.next_owner, cell, self.free_cells)
+        self.snakes[snake.owner] = snake
+        self.next_owner += 1
+        self.grid[cell] = snake.owner
+        self.changed_cells.append(cell)
+        return snake
+
+    def remove_snake(self, owner):
+        """takes a snake off the board, freeing its cells
+
+        Args:
+            owner (int) the snake's id
+        """
+
+        snake = self.snakes.pop(owner)
+        (grid, free_cells) = (self.grid, self.free_cells)
+        for cell in snake.body:
+            grid[cell] = EMPTY
+            free_cells.add(cell)
+        self.changed_cells.extend(snake.body)
+
+    def get_new_cell(self, cell, direction):
+        """gets the cell a move leads to, or -1 if it leaves the board"""
+
+        dimensions = self.dimensions
+        (row, col) = divmod(cell, dimensions)
+        (dx, dy) = direction.deltas
+        row += dy
+        col += dx
+        if row < 0 or col < 0 or row >= dimensions or col >= dimensions:
+            return -1
+        return row * dimensions + col
+
+    def step(self, directions=None):
+        """moves every snake that has a direction a single time
+
+        Args:
+            directions (dict) new Direction for some of the snakes by owner, the others keep their direction
+
+        Returns:
+            dict of the outcome, MOVED, ATE or DIED, of every snake that moved, by owner
+        """
+
+        if directions:
+            for (owner, direction) in directions.items():
+                self.snakes[owner].direction = direction
+
+        grid = self.grid
+        # where every moving snake is going, how many heads are going to each cell, and where each head is going from
+        moving = []
+        targets = {}
+        head_moves = {}
+        leaving_tails = set()
+        for snake in self.snakes.values():
+            if snake.direction is None:
+                continue
+            new_cell = self.get_new_cell(snake.body[0], snake.direction)
+            ate = new_cell >= 0 and grid[new_cell] == FOOD
+            moving.append((snake, new_cell, ate))
+            targets[new_cell] = targets.get(new_cell, 0) + 1
+            head_moves[snake.body[0]] = new_cell
+            # a snake of length 1 has its head on its tail, which leaves like any other. Heads moving into each
+            # other's cells are caught by the swap check below
+            if not ate:
+                leaving_tails.add(snake.body[-1])
+
+        outcomes = {}
+        survivors = []
+        for (snake, new_cell, ate) in moving:
+            # two heads swapping cells pass through each other, so both die
+            swapped = head_moves.get(new_cell) == snake.body[0]
+            if (new_cell < 0 or targets[new_cell] > 1 or swapped
+                    or (grid[new_cell] > EMPTY and new_cell not in leaving_tails)):
+                outcomes[snake.owner] = DIED
+            else:
+                outcomes[snake.owner] = ATE if ate else MOVED
+                survivors.append((snake, new_cell, ate))
+        for (owner, outcome) in outcomes.items():
+            if outcome == DIED:
+                self.remove_snake(owner)
+
+        # every tail leaves before any head arrives, so heads can move into cells tails just left
+        (free_cells, changed_cells) = (self.free_cells, self.changed_cells)
+        for (snake, new_cell, ate) in survivors:
+            if not ate:
+                tail = snake.body.pop()
+                grid[tail] = EMPTY
+                free_cells.add(tail)
+                changed_cells.append(tail)
+        for (snake, new_cell, ate) in survivors:
+            if ate:
+                # food cells aren't in the free cell pool
+                self.food.discard(new_cell)
+            else:
+                free_cells.remove(new_cell)
+            grid[new_cell] = snake.owner
+            snake.body.appendleft(new_cell)
+            changed_cells.append(new_cell)
+
+        self.moves += 1
+        self.make_new_food()
+        return outcomes
+
+    def make_new_food(self):
+        """tops the food up to food_count pieces, on free cells chosen uniformly at random"""
+
+        (free_cells, grid) = (self.free_cells, self.grid)
+        while len(self.food) < self.food_count and len(free_cells) > 0:
+            cell = free_cells.sample(self.rng)
+            free_cells.remove(cell)
+            grid[cell] = FOOD
+            self.food.add(cell)
+            self.changed_cells.append(cell)
+
+    def take_changed_cells(self):
+        """gets every cell whose contents changed since the last call, once each"""
+
+        changed = set(self.changed_cells)
+        self.changed_cells.clear()
+        return changed
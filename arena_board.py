@@ -0,0 +1,146 @@
+"""A board the player shares with many bot snakes
+
+Usage:
+    python3 arena_board.py
+"""
+
+from tkinter import Tk, Canvas, Label, BOTTOM, X
+
+from arena import Arena, EMPTY, FOOD
+from board import GAME_WIDTH, KEY_DIRECTIONS
+from colors import GAME_BACKGROUND_COLOR, SNAKE_COLOR
+from engine import DIED
+from game_loop import GameLoop
+from input_queue import InputQueue
+from snakebot import ArenaSnakebot
+
+ARENA_DIMENSIONS = 60
+ARENA_BOTS = 30
+ARENA_FOOD = 20
+ARENA_TICK_INTERVAL = 0.1
+FOOD_COLOR = "#e0433a"
+BOT_COLORS = ("#e8a33d", "#b57edc", "#4fb3d9", "#d9d94f", "#d96c9e", "#9e9e9e")
+
+
+class ArenaBoard(Canvas):
+    """Draws an arena and lets the player steer one of its snakes with the arrow keys. The bots start right away,
+        the player's snake waits for the first key press, and bots that die are replaced by new ones. Each square
+        is a canvas item created when a cell fills and deleted when it empties, so a frame only touches the cells
+        that changed
+    """
+
+    def __init__(self, parent=None, dimensions=ARENA_DIMENSIONS, bot_count=ARENA_BOTS, food_count=ARENA_FOOD,
+                 width=GAME_WIDTH, tick_interval=ARENA_TICK_INTERVAL, score_label=None, **kwargs):
+        """sets up an arena and starts the bots
+
+        Args:
+            parent (widget) the frame/window this canvas belongs to
+            dimensions (int) number of cells along each side of the arena
+            bot_count (int) number of bot snakes kept in the arena
+            food_count (int) number of pieces of food kept in the arena
+            width (int) width and height of the canvas in pixels
+            tick_interval (float) seconds between moves
+            score_label (Label) the label showing the player's length, or None
+            **kwargs (arg list) other optional arguments for canvas
+        """
+
+        Canvas.__init__(self, parent, kwargs, width=width, height=width, background=GAME_BACKGROUND_COLOR,
+                        highlightthickness=0)
+        self.pack(side=BOTTOM)
+        self.square_width = width / dimensions
+        self.score_label = score_label
+        self.squares = {}
+        self.input_queue = InputQueue()
+        self.bind_all("<Key>", self.change_direction)
+
+        self.arena = Arena(dimensions, food_count)
+        middle = dimensions // 2 * dimensions + dimensions // 2
+        self.player = self.arena.add_snake(middle if middle in self.arena.free_cells else None)
+        self.player_alive = True
+        self.message = None
+        self.bots = [ArenaSnakebot(self.arena, self.arena.add_snake().owner) for _ in range(bot_count)]
+        self.render()
+        self.loop = GameLoop(self, self.tick, self.render, tick_interval)
+        self.loop.start()
+
+    def tick(self):
+        """moves every snake once, replacing bots that died. Called by self.loop on every tick
+
+        Returns:
+            true, the arena keeps going after the player dies
+        """
+
+        arena = self.arena
+        directions = {bot.owner: bot.get_new_direction() for bot in self.bots}
+        turn = self.input_queue.pop()
+        if turn is not None and self.player_alive:
+            directions[self.player.owner] = turn[0]
+        outcomes = arena.step(directions)
+        if outcomes.get(self.player.owner) == DIED:
+            self.player_alive = False
+            self.show_message("Game Over!")
+        self.bots = [bot if bot.owner in arena.snakes else ArenaSnakebot(arena, arena.add_snake().owner)
+                     for bot in self.bots]
+        return True
+
+    def render(self):
+        """draws the cells that changed since the last frame. Called by self.loop after ticking"""
+
+        grid = self.arena.grid
+        width = self.square_width
+        for cell in self.arena.take_changed_cells():
+            item = self.squares.pop(cell, None)
+            if item is not None:
+                self.delete(item)
+            owner = grid[cell]
+            if owner != EMPTY:
+                (row, col) = divmod(cell, self.arena.dimensions)
+                self.squares[cell] = self.create_rectangle(col * width, row * width, (col + 1) * width,
+                                                         (row + 1) * width, fill=self.get_color(owner), outline="")
+        if self.message is not None:
+            self.tag_raise(self.message)
+        if self.score_label is not None:
+            length = self.player.size() if self.player_alive else 0
+            self.score_label["text"] = "Length: %d   Snakes: %d" % (length, len(self.arena.snakes))
+
+    def get_color(self, owner):
+        """gets the color a cell is drawn in from what fills it"""
+
+        if owner == FOOD:
+            return FOOD_COLOR
+        if owner == self.player.owner:
+            return SNAKE_COLOR
+        return BOT_COLORS[owner % len(BOT_COLORS)]
+
+    def show_message(self, text):
+        """writes a message across the middle of the board, above the snakes"""
+
+        middle = self.arena.dimensions * self.square_width / 2
+        self.message = self.create_text(middle, middle, fill="white", font="Roboto 30 bold", text=text)
+
+    def change_direction(self, event):
+        """queues a turn for the player's snake
+
+        Args:
+            event (keyboard press) the event triggered when user presses arrow keys
+        """
+
+        direction = KEY_DIRECTIONS.get(event.keysym)
+        if direction is not None and self.player_alive:
+            self.input_queue.push(direction, self.player.direction, self.loop.clock())
+
+
+def main():
+    """sets up the window and starts the arena"""
+
+    window = Tk()
+    window.title("Snake arena")
+    window.resizable(width=False, height=False)
+    score_label = Label(window, font="Roboto 12", background=GAME_BACKGROUND_COLOR, foreground="WHITE")
+    ArenaBoard(window, score_label=score_label)
+    score_label.pack(side=BOTTOM, fill=X)
+    window.mainloop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""Many Snake games stepped in lockstep with NumPy, for evaluating and training bots. Follows the same rules as
+GameState, but every game's state lives in shared arrays instead of its own objects, so one call to step moves all
+of them. Requires numpy
+"""
+
+import numpy as np
+
+from direction import DIRECTIONS
+from engine import EMPTY, SNAKE, FOOD
+
+# outcome codes returned by step, the integer versions of engine.MOVED, ATE, DIED and WON
+MOVED = 0
+ATE = 1
+DIED = 2
+WON = 3
+
+# row and column deltas for each direction index in direction.DIRECTIONS
+ROW_DELTAS = np.array([direction.get_deltas()[1] for direction in DIRECTIONS], dtype=np.int64)
+COL_DELTAS = np.array([direction.get_deltas()[0] for direction in DIRECTIONS], dtype=np.int64)
+# food placement guesses random cells this many times before searching the board for a free one
+FOOD_ATTEMPTS = 8
+
+
+class BatchedGames:
+    """A batch of games on boards of the same size. Cells are indexed row * dimensions + col as in GameState.
+
+    Attributes:
+        grid (ndarray) (games, dimensions, dimensions) uint8 contents of every cell, EMPTY, SNAKE or FOOD
+        body (ndarray) (games, dimensions * dimensions) ring buffer of each snake's cells, oldest first
+        head_slot (ndarray) position of each head in its row of body; the tail is length - 1 slots behind it
+        length (ndarray) length of each snake
+        food (ndarray) cell of each game's food, -1 if there is none
+        moves (ndarray) moves made so far in each game
+    """
+
+    def __init__(self, games, dimensions, seed=None):
+        """creates a batch of new games
+
+        Args:
+            games (int) number of games
+            dimensions (int) number of cells along each side of every board
+            seed (int) seed for food placement
+        """
+
+        self.games = games
+        self.dimensions = dimensions
+        self.area = dimensions * dimensions
+        self.rng = np.random.default_rng(seed)
+        middle = dimensions // 2
+        self.start = middle * dimensions + middle
+
+        self.grid = np.zeros((games, dimensions, dimensions), dtype=np.uint8)
+        self.body = np.zeros((games, self.area), dtype=np.int64)
+        self.head_slot = np.zeros(games, dtype=np.int64)
+        self.length = np.zeros(games, dtype=np.int64)
+        self.food = np.full(games, -1, dtype=np.int64)
+        self.moves = np.zeros(games, dtype=np.int64)
+        # flat views so that (game, cell) pairs can be addressed with a single index game * area + cell
+        self.flat_grid = self.grid.reshape(-1)
+        self.flat_body = self.body.reshape(-1)
+        self.offsets = np.arange(games, dtype=np.int64) * self.area
+
+        self.reset(np.arange(games))
+
+    def reset(self, games):
+        """starts new games in the given slots
+
+        Args:
+            games (ndarray) indices of the games to reset
+        """
+
+        self.grid[games] = EMPTY
+        self.head_slot[games] = 0
+        self.length[games] = 1
+        self.moves[games] = 0
+        self.body[games, 0] = self.start
+        self.flat_grid[self.offsets[games] + self.start] = SNAKE
+        self.place_food(games)
+
+    def heads(self):
+        """gets the cell of every snake's head"""
+
+        return self.flat_body[self.offsets + self.head_slot]
+
+    def tails(self):
+        """gets the cell of every snake's tail"""
+
+        return self.flat_body[self.offsets + (self.head_slot - self.length + 1) % self.area]
+
+    def step(self, directions):
+        """moves every snake once. Games that end are reset before this returns, so every slot always holds a
+            game in progress
+
+        Args:
+            directions (ndarray) index into direction.DIRECTIONS for each game
+
+        Returns:
+            int8 array with the outcome of each game's move: MOVED, ATE, DIED or WON
+        """
+
+        area = self.area
+        dimensions = self.dimensions
+        offsets = self.offsets
+        flat_grid = self.flat_grid
+        heads = self.heads()
+        tails = self.tails()
+
+        rows = heads // dimensions + ROW_DELTAS[directions]
+        cols = heads % dimensions + COL_DELTAS[directions]
+        off_board = (rows < 0) | (rows >= dimensions) | (cols < 0) | (cols >= dimensions)
+        new_cells = np.where(off_board, 0, rows * dimensions + cols)
+        contents = flat_grid[offsets + new_cells]
+        # moving into the tail is allowed because the tail moves out of the way on the same step
+        died = off_board | ((contents == SNAKE) & (new_cells != tails))
+        alive = ~died
+        ate = alive & (contents == FOOD)
+
+        # the tail moves first, then the head moves into its new cell
+        moved = alive & ~ate
+        flat_grid[offsets[moved] + tails[moved]] = EMPTY
+        living = np.flatnonzero(alive)
+        self.head_slot[living] = (self.head_slot[living] + 1) % area
+        self.flat_body[offsets[living] + self.head_slot[living]] = new_cells[living]
+        flat_grid[offsets[living] + new_cells[living]] = SNAKE
+        self.length[ate] += 1
+        self.moves[living] += 1
+
+        outcomes = np.full(self.games, MOVED, dtype=np.int8)
+        outcomes[ate] = ATE
+        outcomes[died] = DIED
+        won = ate & (self.length == area)
+        outcomes[won] = WON
+        self.food[ate] = -1
+
+        hungry = np.flatnonzero(ate & ~won)
+        if hungry.size:
+            self.place_food(hungry)
+        finished = np.flatnonzero(died | won)
+        if finished.size:
+            self.reset(finished)
+        return outcomes
+
+    def place_food(self, games):
+        """puts food on a free cell chosen uniformly at random in each of the given games. Random cells are tried
+            first, which almost always works unless a board is nearly full, and any game still without food has
+            its free cells listed
+
+        Args:
+            games (ndarray) indices of the games that need food
+        """
+
+        flat_grid = self.flat_grid
+        for _ in range(FOOD_ATTEMPTS):
+            cells = self.rng.integers(0, self.area, size=games.size)
+            free = flat_grid[self.offsets[games] + cells] == EMPTY
+            placed = games[free]
+            self.food[placed] = cells[free]
+            flat_grid[self.offsets[placed] + cells[free]] = FOOD
+            games = games[~free]
+            if not games.size:
+                return
+        for game in games:
+            free_cells = np.flatnonzero(self.grid[game].reshape(-1) == EMPTY)
+            if free_cells.size:
+                cell = free_cells[self.rng.integers(free_cells.size)]
+                self.food[game] = cell
+                flat_grid[self.offsets[game] + cell] = FOOD
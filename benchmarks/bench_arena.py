@@ -0,0 +1,50 @@
+"""Measures how long a tick of an arena takes for different numbers of snakes and board sizes, split into the
+bots choosing their moves and the arena applying them. Snakes that die are replaced, so the count stays the same.
+
+Usage:
+    python -m benchmarks.bench_arena [--ticks N] [--snakes 10 100 ...] [--sizes 100 500 ...]
+"""
+
+import argparse
+import time
+
+from arena import Arena
+from snakebot import ArenaSnakebot
+
+FOOD_PER_SNAKE = 0.5
+
+
+def time_ticks(size, snakes, ticks):
+    """plays an arena of bots, returning the average seconds per tick spent in the bots and in Arena.step"""
+
+    arena = Arena(size, food_count=max(1, int(snakes * FOOD_PER_SNAKE)), seed=0)
+    bots = [ArenaSnakebot(arena, arena.add_snake().owner) for _ in range(snakes)]
+    (bot_seconds, step_seconds) = (0.0, 0.0)
+    for _ in range(ticks):
+        start = time.perf_counter()
+        directions = {bot.owner: bot.get_new_direction() for bot in bots}
+        chosen = time.perf_counter()
+        arena.step(directions)
+        step_seconds += time.perf_counter() - chosen
+        bot_seconds += chosen - start
+        bots = [bot if bot.owner in arena.snakes else ArenaSnakebot(arena, arena.add_snake().owner) for bot in bots]
+        arena.take_changed_cells()
+    return (bot_seconds / ticks, step_seconds / ticks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ticks", type=int, default=200)
+    parser.add_argument("--snakes", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 500, 2000])
+    args = parser.parse_args()
+
+    print("%6s %7s %12s %12s %14s" % ("size", "snakes", "bots ms", "step ms", "step us/snake"))
+    for size in args.sizes:
+        for snakes in args.snakes:
+            (bots, step) = time_ticks(size, snakes, args.ticks)
+            print("%6d %7d %12.3f %12.3f %14.2f" % (size, snakes, bots * 1000, step * 1000, step * 1e6 / snakes))
+
+
+if __name__ == "__main__":
+    main()
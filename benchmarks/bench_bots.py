@@ -0,0 +1,31 @@
+"""Compares the total moves and wall time the tournament's bots, Snakebot, ShortcutSnakebot and GreedySnakebot, take
+to finish boards of sizes 10 to 200. LookaheadSnakebot isn't one of them, as it traps itself long before the board
+is full.
+
+Usage:
+    python -m benchmarks.bench_bots [--sizes 10 20 ...] [--bots NAME ...] [--move-limit N] [--seed N]
+"""
+
+import argparse
+
+from tournament import BOTS, play_game
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 20, 50, 100, 200])
+    parser.add_argument("--move-limit", type=int, default=10 ** 8, help="moves after which a game is abandoned")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--bots", nargs="+", choices=sorted(BOTS), default=list(BOTS))
+    args = parser.parse_args()
+
+    print("%6s %18s %8s %12s %10s" % ("size", "bot", "outcome", "moves", "seconds"))
+    for size in args.sizes:
+        for bot_name in args.bots:
+            result = play_game(bot_name, size, args.seed, args.move_limit)
+            print("%6d %18s %8s %12d %10.2f" % (size, bot_name, result["outcome"], result["moves"],
+                                                 result["seconds"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Measures the cost of a single GameState.step as the snake grows, for board sizes from 10 to 1000.
+
+Usage:
+    python -m benchmarks.bench_engine [--moves N]
+"""
+
+import argparse
+import time
+
+from engine import GameState, MOVED, ATE
+from snakebot import Snakebot
+
+SIZES = (10, 50, 100, 500, 1000)
+FILL_FRACTIONS = (0.0, 0.25, 0.5, 0.75)
+
+
+def next_cell(game, direction):
+    """index of the cell the head would move into, or None if that is off the board"""
+
+    (row, col) = divmod(game.snake.get_head(), game.dimensions)
+    (dx, dy) = direction.get_deltas()
+    row += dy
+    col += dx
+    if 0 <= row < game.dimensions and 0 <= col < game.dimensions:
+        return row * game.dimensions + col
+    return None
+
+
+def grow_to(game, bot, length):
+    """follows the bot, feeding the snake on every move until it reaches the given length"""
+
+    # the bot's first moves run from the middle of the board down to its cycle, which a long snake would cross
+    for _ in range(game.dimensions):
+        game.step(bot.get_new_direction())
+    while game.snake.size() < length:
+        direction = bot.get_new_direction()
+        target = next_cell(game, direction)
+        if target != game.food and target in game.free_cells:
+            game.place_food(target)
+        if game.step(direction) not in (MOVED, ATE):
+            raise RuntimeError("snake died while growing")
+
+
+def time_moves(game, bot, moves):
+    """times the given number of bot moves, returning nanoseconds per move"""
+
+    step = game.step
+    get_new_direction = bot.get_new_direction
+    start = time.perf_counter()
+    for _ in range(moves):
+        step(get_new_direction())
+    return (time.perf_counter() - start) / moves * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--moves", type=int, default=100000, help="moves timed at each snake length")
+    args = parser.parse_args()
+
+    print("%6s %10s %10s" % ("size", "length", "ns/move"))
+    for size in SIZES:
+        for fraction in FILL_FRACTIONS:
+            game = GameState(size, 0)
+            bot = Snakebot(game)
+            grow_to(game, bot, max(1, int(size * size * fraction)))
+            # fewer timed moves than free cells keeps the bot from eating its way to a win mid-measurement
+            moves = min(args.moves, size * size - game.snake.size())
+            print("%6d %10d %10.0f" % (size, game.snake.size(), time_moves(game, bot, moves)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Measures SnakeEnv steps per second for each kind of observation against stepping GameState directly, and how
+many bytes each step leaves allocated. Every row replays the same won game, recorded once with Snakebot, so only
+the environment is timed. Requires numpy
+
+Usage:
+    python -m benchmarks.bench_env [--size N] [--games N]
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from engine import GameState, DIED, WON
+from snake_env import SnakeEnv
+from snakebot import Snakebot
+
+SEED = 0
+MODES = (
+    ("GameState.step", None),
+    ("grid view", {}),
+    ("channels", {"channels": True}),
+    ("grid crop 11", {"crop": 11}),
+    ("channels crop 11", {"channels": True, "crop": 11}),
+)
+
+
+def record_game(size):
+    """plays a game with Snakebot, returning its directions"""
+
+    game = GameState(size, SEED)
+    bot = Snakebot(game)
+    directions = []
+    outcome = None
+    while outcome != DIED and outcome != WON:
+        directions.append(bot.get_new_direction())
+        outcome = game.step(directions[-1])
+    return directions
+
+
+def play(size, options, directions):
+    """replays the directions once, in the environment if there are options or else on a GameState"""
+
+    if options is None:
+        step = GameState(size, SEED).step
+    else:
+        env = SnakeEnv(size, **options)
+        env.reset(SEED)
+        step = env.step
+    for direction in directions:
+        step(direction)
+
+
+def time_mode(size, options, directions, games):
+    """returns steps per second and bytes still allocated per step after replaying the game"""
+
+    play(size, options, directions)
+    start = time.perf_counter()
+    for _ in range(games):
+        play(size, options, directions)
+    rate = games * len(directions) / (time.perf_counter() - start)
+
+    # what's left allocated once a game is over, not counting the game itself, would grow with every step
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    play(size, options, directions)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    leaked = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return (rate, max(leaked, 0) / len(directions))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=20)
+    parser.add_argument("--games", type=int, default=5, help="times the game is replayed for each row")
+    args = parser.parse_args()
+
+    directions = record_game(args.size)
+    print("%d moves per game on %dx%d" % (len(directions), args.size, args.size))
+    print("%18s %12s %14s" % ("observation", "steps/s", "bytes/step"))
+    for (name, options) in MODES:
+        (rate, leaked) = time_mode(args.size, options, directions, args.games)
+        print("%18s %12.0f %14.3f" % (name, rate, leaked))
+
+
+if __name__ == "__main__":
+    main()
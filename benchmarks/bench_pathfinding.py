@@ -0,0 +1,126 @@
+"""Measures what a flood fill of the board costs with PathFinder against one that allocates a set and a deque on
+every search, and compares the moves GreedySnakebot takes to win with the cycle following bots. The searches all
+start from the food on the same half full board, with the snake's cells as walls.
+
+Usage:
+    python -m benchmarks.bench_pathfinding [--sizes 10 11 20 21] [--seeds N] [--searches N]
+"""
+
+import argparse
+import time
+import tracemalloc
+from collections import deque
+
+from engine import GameState, SNAKE, DIED, WON
+from pathfinding import PathFinder, get_neighbour_lists
+from tournament import BOTS
+
+SEED = 0
+
+
+def half_full_game(size):
+    """plays GreedySnakebot until the snake fills half the board"""
+
+    game = GameState(size, SEED)
+    bot = BOTS["GreedySnakebot"](game)
+    while len(game.snake.body) < size * size // 2:
+        if game.step(bot.get_new_direction()) in (DIED, WON):
+            break
+    return game
+
+
+def flood_fill(cells, neighbours, start):
+    """counts the cells reachable from start the way a search over a list of "SNAKE" strings would, with a new set
+        and queue for every search
+    """
+
+    seen = {start}
+    queue = deque([start])
+    while queue:
+        cell = queue.popleft()
+        for neighbour in neighbours[cell]:
+            if neighbour not in seen and cells[neighbour] != "SNAKE":
+                seen.add(neighbour)
+                queue.append(neighbour)
+    return len(seen) - 1
+
+
+def time_searches(game, searches):
+    """times both flood fills from the food
+
+    Returns:
+        list of tuples of the name, cells reached, microseconds and peak bytes allocated per search
+    """
+
+    neighbours = get_neighbour_lists(game.dimensions)
+    cells = ["SNAKE" if content == SNAKE else "EMPTY" for content in game.grid]
+    finder = PathFinder(game.dimensions)
+    (grid, food) = (game.grid, game.food)
+
+    def search_finder():
+        finder.search(grid, food)
+        return finder.reached
+
+    def search_set():
+        return flood_fill(cells, neighbours, food)
+
+    rows = []
+    for (name, search) in (("PathFinder", search_finder), ("set and deque", search_set)):
+        reached = search()
+        start = time.perf_counter()
+        for _ in range(searches):
+            search()
+        seconds = (time.perf_counter() - start) / searches
+        tracemalloc.start()
+        search()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        rows.append((name, reached, seconds * 1e6, peak))
+    return rows
+
+
+def play(bot_name, size, seed):
+    """plays a game until it ends
+
+    Returns:
+        tuple of the outcome, moves and seconds taken
+    """
+
+    game = GameState(size, seed)
+    get_new_direction = BOTS[bot_name](game).get_new_direction
+    step = game.step
+    start = time.perf_counter()
+    while True:
+        outcome = step(get_new_direction())
+        if outcome == DIED or outcome == WON:
+            break
+    return (outcome, game.moves, time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 11, 20, 21])
+    parser.add_argument("--seeds", type=int, default=10, help="games each bot plays on each size")
+    parser.add_argument("--searches", type=int, default=1000, help="times each flood fill is run")
+    args = parser.parse_args()
+
+    print("%6s %14s %8s %12s %12s" % ("size", "flood fill", "reached", "us/search", "peak bytes"))
+    for size in args.sizes:
+        for (name, reached, microseconds, peak) in time_searches(half_full_game(size), args.searches):
+            print("%6d %14s %8d %12.1f %12d" % (size, name, reached, microseconds, peak))
+
+    print()
+    print("%6s %18s %5s %6s %14s %12s" % ("size", "bot", "won", "died", "moves to win", "us/move"))
+    for size in args.sizes:
+        # Snakebot's cycle only exists on even sizes
+        for bot_name in (("Snakebot",) if size % 2 == 0 else ()) + ("ShortcutSnakebot", "GreedySnakebot"):
+            results = [play(bot_name, size, seed) for seed in range(args.seeds)]
+            won = [moves for (outcome, moves, _) in results if outcome == WON]
+            print("%6d %18s %5d %6d %14s %12.1f" % (
+                size, bot_name, len(won), sum(outcome == DIED for (outcome, _, _) in results),
+                "%.0f" % (sum(won) / len(won)) if won else "-",
+                sum(seconds for (_, _, seconds) in results) / sum(moves for (_, moves, _) in results) * 1e6))
+
+
+if __name__ == "__main__":
+    main()
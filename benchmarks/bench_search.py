@@ -0,0 +1,75 @@
+"""Measures how many positions per second a search can visit with Position: apply and undo, clone and apply, and
+LookaheadSnakebot playing whole games.
+
+Usage:
+    python -m benchmarks.bench_search [--moves N] [--games N] [--sizes 10 20 ...]
+"""
+
+import argparse
+import time
+
+from direction import UP, RIGHT, DOWN, LEFT
+from engine import GameState, DIED, WON
+from position import Position
+from snakebot import LookaheadSnakebot
+
+# a square the snake can walk around forever, so every move is a legal one
+LOOP = (RIGHT, DOWN, LEFT, UP)
+
+
+def time_apply_undo(size, moves):
+    """times applying a move and undoing it, returning positions per second"""
+
+    position = Position.from_game(GameState(size, 0))
+    directions = LOOP * (moves // len(LOOP))
+    start = time.perf_counter()
+    for direction in directions:
+        position.apply(direction)
+        position.undo()
+    return len(directions) / (time.perf_counter() - start)
+
+
+def time_clone_apply(size, moves):
+    """times cloning a position and moving the clone, returning positions per second"""
+
+    position = Position.from_game(GameState(size, 0))
+    directions = LOOP * (moves // len(LOOP))
+    start = time.perf_counter()
+    for direction in directions:
+        position.clone().apply(direction)
+    return len(directions) / (time.perf_counter() - start)
+
+
+def time_bot(size, games):
+    """plays games with LookaheadSnakebot, returning positions searched per second and the average length reached"""
+
+    (evaluated, seconds, length) = (0, 0.0, 0)
+    for seed in range(games):
+        game = GameState(size, seed)
+        bot = LookaheadSnakebot(game)
+        start = time.perf_counter()
+        # the bot can circle forever when it can't reach the food
+        while game.moves < size * size * 10 and game.step(bot.get_new_direction()) not in (DIED, WON):
+            pass
+        seconds += time.perf_counter() - start
+        evaluated += bot.evaluated
+        length += game.snake.size()
+    return (evaluated / seconds, length / games)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--moves", type=int, default=100000, help="moves timed for apply/undo and clone/apply")
+    parser.add_argument("--games", type=int, default=5, help="LookaheadSnakebot games played on each size")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 20, 50])
+    args = parser.parse_args()
+
+    print("%6s %14s %14s %14s %10s" % ("size", "apply+undo/s", "clone+apply/s", "bot search/s", "bot length"))
+    for size in args.sizes:
+        (searched, length) = time_bot(size, args.games)
+        print("%6d %14.0f %14.0f %14.0f %10.1f" % (size, time_apply_undo(size, args.moves),
+                                                   time_clone_apply(size, args.moves), searched, length))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""Load test for game_server: starts a server, then keeps adding clients that play along Snakebot's Hamiltonian
+cycle and measures whether every game still gets a move every tick.
+
+A level is sustained when at least 99% of the expected moves arrive, the 99th percentile gap between two moves of
+one game is under 1.5 ticks and no game died. Games only die here when a turn reached the server too late, since
+the cycle never runs into anything. The clients run on the same machine as the server, so on a single core they
+compete with it for time and the numbers are a lower bound.
+
+Usage:
+    python -m benchmarks.bench_server [--sessions 250 500 ...] [--seconds N] [--tick SECONDS] [--unix PATH]
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+from array import array
+
+from direction import DIRECTION_INDEXES, direction_between
+from game_server import HELLO, TURN, START, MOVE, EAT, END
+from snakebot import build_cycle
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DIMENSIONS = 20
+WARMUP_SECONDS = 1
+MESSAGE_SIZES = {ord("S"): START.size, ord("M"): MOVE.size, ord("E"): EAT.size, ord("X"): END.size}
+
+
+class LoadClient(asyncio.Protocol):
+    """One connection playing games along the cycle, counting the moves it receives and the gaps between them"""
+
+    def __init__(self, seed, next_cells, results):
+        """sets up a client, which starts a game once connected
+
+        Args:
+            seed (int) seed of the first game
+            next_cells (list) the cell after each cell on the cycle
+            results (dict) shared counters: "moves", "deaths" and "gaps", an array of seconds
+        """
+
+        self.seed = seed
+        self.next_cells = next_cells
+        self.results = results
+        self.buffer = bytearray()
+        self.direction = None
+        self.last_move = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.transport.write(HELLO.pack(b"H", DIMENSIONS, self.seed))
+
+    def data_received(self, data):
+        now = asyncio.get_running_loop().time()
+        buffer = self.buffer
+        buffer += data
+        offset = 0
+        while offset < len(buffer):
+            size = MESSAGE_SIZES[buffer[offset]]
+            if len(buffer) - offset < size:
+                break
+            kind = buffer[offset]
+            if kind == ord("X"):
+                if END.unpack_from(buffer, offset)[1] == b"D":
+                    self.results["deaths"] += 1
+                self.seed += 1
+                self.direction = self.last_move = None
+                self.transport.write(HELLO.pack(b"H", DIMENSIONS, self.seed))
+            elif kind == ord("S"):
+                self.steer(START.unpack_from(buffer, offset)[3])
+            else:
+                # moving messages send the tail before the new head, eating messages start with the new head
+                if kind == ord("M"):
+                    self.steer(MOVE.unpack_from(buffer, offset)[2])
+                else:
+                    self.steer(EAT.unpack_from(buffer, offset)[1])
+                self.results["moves"] += 1
+                if self.last_move is not None:
+                    self.results["gaps"].append(now - self.last_move)
+                self.last_move = now
+            offset += size
+        del buffer[:offset]
+
+    def steer(self, head):
+        """sends a turn if the next cell on the cycle is in a new direction
+
+        Args:
+            head (int) the cell the head is on
+        """
+
+        direction = direction_between(head, self.next_cells[head], DIMENSIONS)
+        if direction is not self.direction:
+            self.direction = direction
+            self.transport.write(TURN.pack(b"T", DIRECTION_INDEXES[direction]))
+
+
+def percentile(values, share):
+    """gets the value below which the given share of values fall"""
+
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * share))] if values else 0.0
+
+
+async def run_levels(levels, seconds, tick, connect):
+    """adds clients up to each level in turn and measures a window at each
+
+    Args:
+        levels (list) numbers of sessions to measure, increasing
+        seconds (float) length of each measured window
+        tick (float) the server's tick interval
+        connect (function) coroutine function making a connection for a protocol factory
+    """
+
+    loop = asyncio.get_running_loop()
+    cycle = build_cycle(DIMENSIONS)
+    next_cells = [0] * len(cycle)
+    for (i, cell) in enumerate(cycle):
+        next_cells[cell] = cycle[(i + 1) % len(cycle)]
+    results = {"moves": 0, "deaths": 0, "gaps": array("d")}
+    clients = []
+
+    print("%9s %10s %12s %10s %8s %10s" % ("sessions", "moves/s", "delivered", "p99 gap", "deaths", "sustained"))
+    for level in levels:
+        while len(clients) < level:
+            (transport, client) = await connect(lambda: LoadClient(len(clients), next_cells, results))
+            clients.append(client)
+        await asyncio.sleep(WARMUP_SECONDS)
+        results.update(moves=0, deaths=0, gaps=array("d"))
+        start = loop.time()
+        await asyncio.sleep(seconds)
+        elapsed = loop.time() - start
+        delivered = results["moves"] / (level * elapsed / tick)
+        gap = percentile(results["gaps"], 0.99)
+        sustained = delivered >= 0.99 and gap < 1.5 * tick and results["deaths"] == 0
+        print("%9d %10.0f %11.1f%% %8.1fms %8d %10s" % (level, results["moves"] / elapsed, delivered * 100,
+                                                      gap * 1000, results["deaths"], "yes" if sustained else "no"),
+              flush=True)
+    for client in clients:
+        client.transport.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[250, 500, 1000, 1500, 2000])
+    parser.add_argument("--seconds", type=float, default=5, help="length of the measured window at each level")
+    parser.add_argument("--tick", type=float, default=0.1, help="the server's seconds between moves")
+    parser.add_argument("--unix", metavar="PATH", help="connect over a Unix socket at this path instead of TCP")
+    args = parser.parse_args()
+
+    address = ["--unix", args.unix] if args.unix else ["--port", "0"]
+    server = subprocess.Popen([sys.executable, "game_server.py", "--tick", str(args.tick), "--report", "0"] + address,
+                              cwd=ROOT, stdout=subprocess.PIPE, text=True)
+    try:
+        # the server's first line says where it is listening
+        where = server.stdout.readline().split()[-1]
+        if args.unix:
+            connect = lambda factory: asyncio.get_running_loop().create_unix_connection(factory, where)
+        else:
+            (host, port) = where.rsplit(":", 1)
+            connect = lambda factory: asyncio.get_running_loop().create_connection(factory, host, int(port))
+        asyncio.run(run_levels(args.sessions, args.seconds, args.tick, connect))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Measures cold-start time of fresh Python processes: a headless game, the simulation and GUI imports, and opening
+the window (only when there is a display).
+
+Usage:
+    python -m benchmarks.bench_startup [--runs N]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (name, arguments to python, whether it needs a display)
+LAUNCHES = (
+    ("empty interpreter", ["-c", "pass"], False),
+    ("simulation imports", ["-c", "import engine, snakebot, replay, tournament"], False),
+    ("headless 10x10 game", ["snake_main.py", "--headless", "--size", "10", "--seed", "0"], False),
+    ("GUI imports", ["-c", "import board, bot_board, replay_board, stats_overlay, viewport, PIL.ImageTk"], False),
+    ("window until drawn", ["snake_main.py", "--exit-when-ready"], True),
+)
+
+
+def time_launch(arguments, runs):
+    """runs python with the given arguments, returning the median wall time in seconds"""
+
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + arguments, cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=11, help="launches timed for each row, the median is shown")
+    args = parser.parse_args()
+
+    has_display = sys.platform in ("win32", "darwin") or bool(os.environ.get("DISPLAY"))
+    print("%22s %10s" % ("launch", "ms"))
+    for (name, arguments, needs_display) in LAUNCHES:
+        if needs_display and not has_display:
+            print("%22s %10s" % (name, "no display"))
+        else:
+            print("%22s %10.1f" % (name, time_launch(arguments, args.runs) * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,385 @@
+"""Runs microbenchmarks of the hot paths and macrobenchmarks of whole boards at human and bot speed, without a
+display, and compares them to saved results. Exits with status 1 if a board now makes more canvas calls per tick
+than benchmarks/baseline.json, or if anything got slower by more than the tolerance than the times saved on this
+machine.
+
+Boards draw on a recording_canvas.RecordingCanvas. Human speed boards tick at the board size's pace on the
+canvas's virtual clock, so idle frames are counted without waiting for them, and bot speed boards tick as fast as
+they can. The microbenchmarks replay the same ShortcutSnakebot game, recorded once per size, so every run times the
+same moves. Timings are the best of --repeat runs. Board.check_for_collision and Board.make_new_food moved to
+GameState, which every board steps, so they are timed there, and Cell.draw's work is timed as Cell shapes and
+renderer.update.
+
+Canvas calls are the same everywhere, so their baseline is kept in the repository, but times only compare on the
+machine that measured them, so they are saved to benchmarks/timings.json, which isn't, and are only checked if it
+was saved on the same machine. A fresh checkout, such as a CI run, only checks the canvas calls. To check times
+there too, save them from the base commit and compare the change with them in the same job:
+
+    git checkout BASE && python -m benchmarks.bench_suite --save-timings --timings base-timings.json
+    git checkout - && python -m benchmarks.bench_suite --timings base-timings.json
+
+Both files also save --ticks and --moves, and results measured with others aren't compared.
+
+Usage:
+    python -m benchmarks.bench_suite [--sizes 10 50 ...] [--json FILE] [--save-baseline] [--save-timings]
+                                     [--tolerance 0.25]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+from board import Board, BoardConfig
+from bot_board import BotBoard
+from cell import Cell, get_cell_geometry
+from direction import DIRECTIONS
+from engine import GameState, ATE, DIED, WON
+from free_cells import FreeCellPool
+from recording_canvas import make_recording_board
+from snake import Snake
+from snakebot import Snakebot, ShortcutSnakebot
+
+SEED = 0
+# canvas call counts, which are the same on every machine
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+# times only mean something on the machine that measured them, so each machine keeps its own, outside git
+TIMINGS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "timings.json")
+# results measured in time per operation, and results that count work done, which don't vary between runs
+TIME_UNIT = "us"
+COUNT_UNIT = "calls"
+RecordingBoard = make_recording_board(Board)
+RecordingBotBoard = make_recording_board(BotBoard)
+
+
+class RecordedGame:
+    """A ShortcutSnakebot game played once, with each move's direction, new head and whether it ate"""
+
+    def __init__(self, size, moves):
+        """plays the game
+
+        Args:
+            size (int) board dimensions
+            moves (int) moves after which the game is stopped if it hasn't ended
+        """
+
+        self.size = size
+        game = GameState(size, SEED)
+        bot = ShortcutSnakebot(game)
+        self.start = game.snake.body[0]
+        self.directions = []
+        self.heads = []
+        self.ate = []
+        outcome = None
+        while outcome != DIED and outcome != WON and len(self.directions) < moves:
+            self.directions.append(bot.get_new_direction())
+            outcome = game.step(self.directions[-1])
+            self.heads.append(game.snake.body[0])
+            self.ate.append(outcome == ATE or outcome == WON)
+        self.game = game
+
+
+def time_snake_move(recorded):
+    """times Snake.move replaying the recorded snake's moves"""
+
+    snake = Snake(recorded.start, FreeCellPool(recorded.size * recorded.size))
+    move = snake.move
+    moves = list(zip(recorded.heads, recorded.ate))
+    start = time.perf_counter()
+    for (cell, ate) in moves:
+        move(cell, ate)
+    return (time.perf_counter() - start) / len(moves)
+
+
+def time_step(recorded):
+    """times GameState.step replaying the recorded game"""
+
+    step = GameState(recorded.size, SEED).step
+    start = time.perf_counter()
+    for direction in recorded.directions:
+        step(direction)
+    return (time.perf_counter() - start) / len(recorded.directions)
+
+
+def time_collision_check(recorded):
+    """times GameState.check_for_collision on the cells around the head at the end of the recorded game"""
+
+    game = recorded.game
+    (row, col) = divmod(game.snake.body[0], game.dimensions)
+    neighbours = [(row + dy, col + dx) for (dx, dy) in (direction.deltas for direction in DIRECTIONS)]
+    check = game.check_for_collision
+    repeats = len(recorded.directions) // 4 + 1
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for coords in neighbours:
+            check(coords)
+    return (time.perf_counter() - start) / (repeats * 4)
+
+
+def time_new_food(recorded):
+    """times GameState.make_new_food with the snake as long as it was at the end of the recorded game"""
+
+    game = GameState(recorded.size, SEED)
+    for direction in recorded.directions:
+        game.step(direction)
+    make_new_food = game.make_new_food
+    repeats = len(recorded.directions)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        make_new_food()
+    return (time.perf_counter() - start) / repeats
+
+
+def time_cell_shapes(recorded):
+    """times making the Cell for each recorded head and working out its head and tail shapes, as a renderer does
+        for every move
+    """
+
+    geometry = get_cell_geometry(BoardConfig(recorded.size).square_width)
+    size = recorded.size
+    cells = [(divmod(head, size), direction) for (head, direction) in zip(recorded.heads, recorded.directions)]
+    start = time.perf_counter()
+    for (row_col, direction) in cells:
+        cell = Cell(row_col, geometry)
+        cell.get_head_geometry(direction)
+        cell.get_tail_coords(direction)
+        cell.get_smiley_face_box()
+    return (time.perf_counter() - start) / len(cells)
+
+
+def time_renderer_update(recorded):
+    """times the board's renderer updating a recording canvas after each move of the recorded game"""
+
+    board = RecordingBoard(score_label={"text": ""}, board_config=BoardConfig(recorded.size))
+    board.game = game = GameState(recorded.size, SEED)
+    board.delete("all")
+    board.initialize_renderer()
+    update = board.renderer.update
+    clock = time.perf_counter
+    seconds = 0.0
+    for direction in recorded.directions:
+        game.step(direction)
+        start = clock()
+        update()
+        seconds += clock() - start
+    return seconds / len(recorded.directions)
+
+
+def time_bot(bot_class, recorded):
+    """times the bot's get_new_direction while it plays as many moves as the recorded game"""
+
+    game = GameState(recorded.size, SEED)
+    get_new_direction = bot_class(game).get_new_direction
+    step = game.step
+    clock = time.perf_counter
+    seconds = 0.0
+    for _ in recorded.directions:
+        start = clock()
+        direction = get_new_direction()
+        seconds += clock() - start
+        if step(direction) in (DIED, WON):
+            break
+    return seconds / max(game.moves, 1)
+
+
+MICROBENCHMARKS = (
+    ("Snake.move", time_snake_move),
+    ("GameState.step", time_step),
+    ("GameState.check_for_collision", time_collision_check),
+    ("GameState.make_new_food", time_new_food),
+    ("Cell shapes", time_cell_shapes),
+    ("renderer.update", time_renderer_update),
+    ("Snakebot.get_new_direction", lambda recorded: time_bot(Snakebot, recorded)),
+    ("ShortcutSnakebot.get_new_direction", lambda recorded: time_bot(ShortcutSnakebot, recorded)),
+)
+
+
+def play_board(size, ticks, human_speed):
+    """plays a Snakebot game on a recording board for a number of ticks, or until it ends
+
+    Args:
+        size (int) board dimensions
+        ticks (int) ticks to play
+        human_speed (bool) whether to tick at the pace a person plays this size at, on the canvas's virtual clock,
+            rather than as fast as possible
+
+    Returns:
+        tuple of wall clock seconds per tick and canvas calls per tick
+    """
+
+    # boards pick a random seed for every game, so it is fixed to draw the same game every time
+    random.seed(SEED)
+    tick_interval = BoardConfig(size).time_between_moves / 1000 if human_speed else 0
+    board = RecordingBotBoard(score_label={"text": ""}, board_config=BoardConfig(size), bot_class=Snakebot,
+                              tick_interval=tick_interval)
+    if human_speed:
+        board.loop.clock = board.clock
+    board.calls.clear()
+    start = time.perf_counter()
+    board.start_bot()
+    run_next = board.run_next
+    game = board.game
+    while game.moves < ticks and run_next():
+        pass
+    seconds = time.perf_counter() - start
+    return (seconds / game.moves, sum(board.calls.values()) / game.moves)
+
+
+def run(sizes, moves, ticks, repeat):
+    """runs every benchmark at every size
+
+    Returns:
+        list of result dicts with the benchmark's name, size, value and unit
+    """
+
+    results = []
+
+    def add(name, size, value, unit):
+        results.append({"name": name, "size": size, "value": value, "unit": unit})
+        print("%36s %6d %12.3f %s" % (name, size, value, unit), flush=True)
+
+    for size in sizes:
+        recorded = RecordedGame(size, moves)
+        for (name, benchmark) in MICROBENCHMARKS:
+            add(name, size, min(benchmark(recorded) for _ in range(repeat)) * 1e6, TIME_UNIT)
+        for (name, human_speed) in (("human speed board", True), ("bot speed board", False)):
+            timings = [play_board(size, ticks, human_speed) for _ in range(repeat)]
+            add(name + " tick", size, min(seconds for (seconds, _) in timings) * 1e6, TIME_UNIT)
+            # how often a bot speed board draws depends on how fast it runs, so only human speed is counted
+            if human_speed:
+                add(name + " canvas calls", size, timings[0][1], COUNT_UNIT)
+    return results
+
+
+def compare(results, counts, timings, tolerance):
+    """prints how each result changed from the baselines
+
+    Args:
+        results (list) result dicts from run
+        counts (list) count result dicts from an earlier run, on any machine
+        timings (list) time result dicts from an earlier run, or None if there are none from this machine
+        tolerance (float) share a time may grow by before it counts as a regression
+
+    Returns:
+        list of descriptions of the regressions
+    """
+
+    previous = {(result["name"], result["size"]): result["value"] for result in counts + (timings or [])}
+    regressions = []
+    print("%36s %6s %12s %12s %9s" % ("benchmark", "size", "value", "baseline", "change"))
+    for result in results:
+        key = (result["name"], result["size"])
+        value = result["value"]
+        if key not in previous:
+            checked = timings is not None or result["unit"] == COUNT_UNIT
+            print("%36s %6d %12.3f %12s %9s" % (key + (value, "-", "new" if checked else "unchecked")))
+            continue
+        old = previous[key]
+        change = value / old - 1 if old else 0.0
+        # counts don't depend on the machine, so any increase is real
+        limit = round(old, 6) if result["unit"] == COUNT_UNIT else old * (1 + tolerance)
+        flag = ""
+        if value > limit:
+            flag = "  REGRESSION"
+            regressions.append("%s at size %d: %.3f %s, baseline %.3f" % (key + (value, result["unit"], old)))
+        print("%36s %6d %12.3f %12.3f %+8.1f%%%s" % (key + (value, old, change * 100, flag)))
+    return regressions
+
+
+def describe_machine():
+    """describes where results were measured, to tell when a baseline came from somewhere else"""
+
+    return {"python": platform.python_version(), "machine": platform.machine(), "system": platform.system(),
+            "processor": platform.processor(), "cpus": os.cpu_count()}
+
+
+def check_settings(path, saved, settings):
+    """exits if a file saved by save was measured with different settings, since its results wouldn't compare
+
+    Args:
+        path (str) where the file was read from
+        saved (dict) its contents
+        settings (dict) the settings of this run by name
+    """
+
+    if any(saved.get(name) != value for (name, value) in settings.items()):
+        sys.exit("%s was saved with %s, not %s, so it can't be compared. Run with the same settings or save it again"
+                 % (path, ", ".join("%s %s" % (name, saved.get(name)) for name in sorted(settings)),
+                    ", ".join("%s %s" % (name, settings[name]) for name in sorted(settings))))
+
+
+def load(path):
+    """reads a file saved by save, or returns None if there isn't one"""
+
+    if not os.path.exists(path):
+        return None
+    with open(path) as file:
+        return json.load(file)
+
+
+def save(path, report):
+    with open(path, "w") as file:
+        json.dump(report, file, indent=2)
+    print("saved", path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 100, 500])
+    parser.add_argument("--moves", type=int, default=20000, help="moves of the game the microbenchmarks replay")
+    parser.add_argument("--ticks", type=int, default=2000, help="ticks each board is played for")
+    parser.add_argument("--repeat", type=int, default=5, help="runs of each benchmark, the fastest is kept")
+    parser.add_argument("--json", help="file to write the results to")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="counts to compare with")
+    parser.add_argument("--save-baseline", action="store_true", help="replace the counts with these results")
+    parser.add_argument("--timings", default=TIMINGS_PATH, help="times saved on this machine to compare with")
+    parser.add_argument("--save-timings", action="store_true", help="replace the times with these results")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="share a time may grow by before it fails, e.g. 0.25 for 25%%")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.moves, args.ticks, args.repeat)
+    machine = describe_machine()
+    # canvas calls per tick depend on how many ticks were played, and times on how many moves were replayed
+    settings = {"ticks": args.ticks, "moves": args.moves}
+    counts = [result for result in results if result["unit"] == COUNT_UNIT]
+    times = [result for result in results if result["unit"] != COUNT_UNIT]
+    if args.json:
+        save(args.json, {"machine": machine, "results": results})
+    print()
+    if args.save_baseline:
+        save(args.baseline, dict(settings, results=counts))
+    if args.save_timings:
+        save(args.timings, dict(settings, machine=machine, results=times))
+    if args.save_baseline or args.save_timings:
+        return
+
+    baseline = load(args.baseline)
+    if baseline is None:
+        print("no counts at %s, save them with --save-baseline" % args.baseline)
+        baseline = dict(settings, results=[])
+    check_settings(args.baseline, baseline, settings)
+    timings = load(args.timings)
+    if timings is None:
+        print("no times from this machine at %s, so times aren't checked. Save them with --save-timings"
+              % args.timings)
+    elif timings["machine"] != machine:
+        print("the times at %s were saved on another machine (%s), so they aren't checked" % (args.timings,
+                                                                                             timings["machine"]))
+        timings = None
+    if timings is not None:
+        check_settings(args.timings, timings, settings)
+    regressions = compare(results, baseline["results"], timings and timings["results"], args.tolerance)
+    if regressions:
+        print("\n%d REGRESSIONS:" % len(regressions), file=sys.stderr)
+        for regression in regressions:
+            print("    " + regression, file=sys.stderr)
+        sys.exit(1)
+    print("\nno regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Measures what telemetry costs a game and how fast logs can be summarized. Each format replays the same won game,
+recorded once with ShortcutSnakebot, with a TelemetryStream attached, against replaying it with none. Then a log
+of the game's events repeated under new game ids is written in each format and summarized in one streaming pass.
+
+Usage:
+    python -m benchmarks.bench_telemetry [--size N] [--games N] [--log-games N] [--dir DIR]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from engine import GameState, DIED, WON
+from snakebot import ShortcutSnakebot
+from telemetry import SINKS, BATCH_EVENTS, TelemetryStream, TelemetryRecorder, get_sink_class, summarize
+
+SEED = 0
+
+
+class EventList:
+    """Stands in for a TelemetryStream, keeping the events in a list"""
+
+    def __init__(self):
+        self.events = []
+
+    def emit(self, *fields):
+        self.events.append(fields + (0.0,))
+
+
+def record_game(size):
+    """plays a game with ShortcutSnakebot, returning its directions"""
+
+    game = GameState(size, SEED)
+    bot = ShortcutSnakebot(game)
+    directions = []
+    outcome = None
+    while outcome != DIED and outcome != WON:
+        directions.append(bot.get_new_direction())
+        outcome = game.step(directions[-1])
+    return directions
+
+
+def play(size, directions, stream):
+    """replays the directions on a new game, sending its events to the stream if there is one"""
+
+    game = GameState(size, SEED)
+    recorder = TelemetryRecorder(stream, game) if stream is not None else None
+    for direction in directions:
+        outcome = game.step(direction)
+        if recorder is not None:
+            recorder.record(direction, outcome)
+
+
+def time_games(size, directions, games, path):
+    """replays the game, returning moves per second and the events the stream dropped"""
+
+    stream = TelemetryStream(path) if path is not None else None
+    start = time.perf_counter()
+    for _ in range(games):
+        play(size, directions, stream)
+    rate = games * len(directions) / (time.perf_counter() - start)
+    if stream is None:
+        return (rate, 0)
+    stream.close()
+    return (rate, stream.dropped_events)
+
+
+def write_log(path, events, games):
+    """writes the events of a game games times over, each time with a new game id"""
+
+    sink = get_sink_class(path)(path)
+    batch = []
+    for game in range(games):
+        for event in events:
+            batch.append(event[:1] + (game,) + event[2:])
+            if len(batch) == BATCH_EVENTS:
+                sink.write(batch)
+                batch = []
+    sink.write(batch)
+    sink.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=20)
+    parser.add_argument("--games", type=int, default=5, help="times the game is replayed for each format")
+    parser.add_argument("--log-games", type=int, default=300, help="copies of the game's events in each log")
+    parser.add_argument("--dir", help="where to write the logs, a temporary directory if not given")
+    args = parser.parse_args()
+
+    directions = record_game(args.size)
+    events = EventList()
+    play(args.size, directions, events)
+    print("%d moves and %d events per game on %dx%d" % (len(directions), len(events.events), args.size, args.size))
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as directory:
+        print("%10s %12s %10s" % ("sink", "moves/s", "dropped"))
+        for extension in (None,) + tuple(SINKS):
+            path = os.path.join(directory, "game" + extension) if extension is not None else None
+            (rate, dropped) = time_games(args.size, directions, args.games, path)
+            print("%10s %12.0f %10d" % (extension or "none", rate, dropped))
+
+        print()
+        print("%10s %12s %12s %14s %10s" % ("log", "events", "MB", "events/s", "MB/s"))
+        for extension in SINKS:
+            path = os.path.join(directory, "log" + extension)
+            write_log(path, events.events, args.log_games)
+            megabytes = os.path.getsize(path) / 1e6
+            start = time.perf_counter()
+            summary = summarize(path)
+            elapsed = time.perf_counter() - start
+            print("%10s %12d %12.1f %14.0f %10.1f" % (extension, summary["events"], megabytes,
+                                                     summary["events"] / elapsed, megabytes / elapsed))
+
+
+if __name__ == "__main__":
+    main()
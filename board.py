@@ -1,25 +1,59 @@
-from tkinter import *
-from PIL.ImageTk import PhotoImage
-from PIL import Image
-from cell import Cell
-from snake import Snake
-from direction import Direction
-
-import random as rand
+from tkinter import Canvas, BOTTOM, NW
+from cell import get_cell_geometry
+from colors import SQUARE_OUTLINE_COLOR, GAME_BACKGROUND_COLOR, SNAKE_COLOR
+import direction
+from engine import GameState, MOVED, ATE, DIED, WON
+from game_loop import GameLoop
+from input_queue import InputQueue
+from instrumentation import INPUT
+from replay import ReplayRecorder
+from telemetry import TelemetryRecorder
+from renderer import CanvasRenderer
+from sprites import food_sprites, get_background
+from viewport import ViewportRenderer
 
 
 MENU_WIDTH = 150
 GAME_WIDTH = 500
 GAME_GRID_DIMENSIONS = 20
-SQUARE_WIDTH = GAME_WIDTH / GAME_GRID_DIMENSIONS
+# boards up to this size are drawn whole, bigger ones show a VIEWPORT_DIMENSIONS square following the head
+MAX_WHOLE_BOARD_DIMENSIONS = 100
+VIEWPORT_DIMENSIONS = 40
+MAX_GRID_DIMENSIONS = 2000
 SCORE_FRAME_HEIGHT = 50
 INVERSE_PROP_CONSTANT = 2000
-TIME_BETWEEN_MOVES = int(INVERSE_PROP_CONSTANT / GAME_GRID_DIMENSIONS)
-SQUARE_OUTLINE_COLOR = "#888888"
-GAME_BACKGROUND_COLOR = "#123456"
-SNAKE_COLOR = "#45d66b"
-MENU_COLOR = "#888888"
-BORDER_COLOR = "#222222"
+# a turn pressed when the next move is due within this share of a tick is made right away, 0 to always wait
+EARLY_TURN_SHARE = 0.25
+KEY_DIRECTIONS = {"Up": direction.UP, "Right": direction.RIGHT, "Down": direction.DOWN, "Left": direction.LEFT}
+
+
+class BoardConfig:
+    """The size of one board and everything that follows from it. Every board has its own, so boards of different
+        sizes can be open at the same time
+    """
+
+    def __init__(self, dimensions=GAME_GRID_DIMENSIONS, width=GAME_WIDTH):
+        """works out the drawing sizes and speed for a board
+
+        Args:
+            dimensions (int) number of cells along each side
+            width (int) width and height of the canvas in pixels
+        """
+
+        self.dimensions = dimensions
+        self.width = width
+        self.visible_dimensions = dimensions if dimensions <= MAX_WHOLE_BOARD_DIMENSIONS else VIEWPORT_DIMENSIONS
+        self.square_width = width / self.visible_dimensions
+        self.time_between_moves = int(INVERSE_PROP_CONSTANT / self.visible_dimensions)
+
+    def resized(self, dimensions):
+        """makes the config for a board of another size drawn on the same canvas
+
+        Args:
+            dimensions (int) number of cells along each side
+        """
+
+        return BoardConfig(dimensions, self.width)
 
 
 class Board(Canvas):
@@ -29,165 +63,167 @@ class Board(Canvas):
         Canvas - the basic drawing panel provided by tkinter
     """
 
-    def __init__(self, parent=None, score_label=None, **kwargs):
+    def __init__(self, parent=None, board_config=None, score_label=None, replay_file=None, stats=None, telemetry=None,
+                 **kwargs):
         """constructs a new game board (only called once, not on each new game)
 
         Args:
             parent (widget) the frame/window this canvas belongs to
+            board_config (BoardConfig) the size of this board, or None for the default size
             score_label (Label) the label for the snake's size
+            replay_file (str) path each finished game's replay is saved to, or None to not save them
+            stats (TickStats) where to record timings of the game loop, or None to not time it
+            telemetry (TelemetryStream) where to send the events of every game, or None to not send them
             **kwargs (arg list) other optional arguments for canvas
         """
 
-        Canvas.__init__(self, parent, kwargs)
+        # through super so a RecordingCanvas mixed in after Board takes Canvas's place
+        super().__init__(parent, kwargs)
         self.pack(side=BOTTOM)
 
-        self.changedDirectionThisTurnAlready = False
+        self.board_config = board_config or BoardConfig()
+        self.input_queue = InputQueue()
         self.initialize_directions()
         self.bind_all("<Key>", self.change_direction)
         self.score_label = score_label
+        self.replay_file = replay_file
+        self.stats = stats
+        self.telemetry = telemetry
 
-        self.initialize_empty_cells()
+        self.new_game()
         self.draw_all_cells()
-        self.initialize_snake(score_label)
         self.initialize_food_img()
-        self.make_new_food()
-
-    def initialize_empty_cells(self):
-        """sets up cells with the correct dimensions for the current game"""
-
-        self.empty_cells = set()
-        self.cells = [[Cell(self, (col * SQUARE_WIDTH, row * SQUARE_WIDTH, col * SQUARE_WIDTH + SQUARE_WIDTH, row * SQUARE_WIDTH + SQUARE_WIDTH),
-                            (row, col)) for col in range(GAME_GRID_DIMENSIONS)] for row in range(GAME_GRID_DIMENSIONS)]
-        for row in self.cells:
-            for cell in row:
-                self.empty_cells.add(cell)
-
-    def initialize_snake(self, score_label):
-        """initializes snake for the current game
-
-        Args:
-            score_label (Label) size label to be passed to snake
+        self.initialize_renderer()
+        self.outcome = None
+        self.loop = GameLoop(self, self.move_snake, self.render, self.get_tick_interval(), stats=stats)
+
+    def new_game(self):
+        """sets up self.game for a new game and starts recording it"""
+
+        self.game = GameState(self.board_config.dimensions)
+        self.game.stats = self.stats
+        self.recorder = ReplayRecorder(self.game)
+        if self.telemetry is not None:
+            self.telemetry_recorder = TelemetryRecorder(self.telemetry, self.game)
+
+    def initialize_renderer(self):
+        """sets up the renderer for the current board size and draws the game with it. The renderer makes cells as
+            it draws them, the contents of the board live in self.game
         """
 
-        middle = GAME_GRID_DIMENSIONS // 2
-        starting_cell = self.cells[middle][middle]
-        self.snake = Snake(self, starting_cell, score_label, self.empty_cells)
+        config = self.board_config
+        geometry = get_cell_geometry(config.square_width)
+        if config.visible_dimensions < config.dimensions:
+            self.renderer = ViewportRenderer(self, geometry, self.tk_img, SNAKE_COLOR, SQUARE_OUTLINE_COLOR,
+                                             config.visible_dimensions)
+        else:
+            self.renderer = CanvasRenderer(self, geometry, self.tk_img, SNAKE_COLOR, SQUARE_OUTLINE_COLOR)
+        self.renderer.reset(self.game)
 
     def initialize_directions(self):
         """initializes each of the 4 direction objects"""
 
-        self.up = Direction((0, -1))
-        self.right = Direction((1, 0))
-        self.down = Direction((0, 1))
-        self.left = Direction((-1, 0))
+        self.up = direction.UP
+        self.right = direction.RIGHT
+        self.down = direction.DOWN
+        self.left = direction.LEFT
         self.current_direction = None
 
-    def move_snake(self):
-        """makes the snake move a single time, also checking for game over"""
-
-        if self.snake.size() == GAME_GRID_DIMENSIONS * GAME_GRID_DIMENSIONS:
-            self.create_text(GAME_WIDTH / 2, GAME_WIDTH / 2, fill="white", font="Roboto 30 bold",
-                             text="You Win!")
-            return
-        self.changedDirectionThisTurnAlready = False
-        (row, col) = self.snake.get_head().get_row_col()
-        (dx, dy) = self.current_direction.get_deltas()
-
-        if (not self.check_for_collision((row + dy, col + dx))):
-            new_cell = self.cells[row + dy][col + dx]
-            need_more_food = new_cell.get_type() == "FOOD"
-            self.snake.move(new_cell, self.current_direction)
-            if (need_more_food):
-                self.make_new_food()
-            self.after(TIME_BETWEEN_MOVES, self.move_snake)
-        else:
-            self.create_text(GAME_WIDTH / 2, GAME_WIDTH / 2, fill="white", font="Roboto 30 bold",
-                             text="Game Over!")
+    def get_tick_interval(self):
+        """gets the number of seconds between moves for the current board size"""
 
-    def check_for_collision(self, new_coords):
-        """checks if the cell that the snake is about to move into will result in a game over
+        return self.board_config.time_between_moves / 1000
 
-        Args:
-            new_coords (tuple) the grid indexes of the cell being moved to
+    def move_snake(self):
+        """makes the snake move a single time, also checking for game over. Called by self.loop on every tick
 
         Returns:
-            true if game is over, else false
+            true if the game is still going
         """
 
-        (new_x, new_y) = new_coords
-        if new_x >= GAME_GRID_DIMENSIONS or new_y >= GAME_GRID_DIMENSIONS or new_x < 0 or new_y < 0 \
-                or self.cells[new_x][new_y].get_type() == "SNAKE":
+        turn = self.input_queue.pop()
+        if turn is not None:
+            (self.current_direction, pressed) = turn
+            if self.stats is not None:
+                self.stats.record(INPUT, self.loop.clock() - pressed)
+        self.outcome = self.game.step(self.current_direction)
+        self.recorder.record(self.current_direction, self.outcome)
+        if self.telemetry is not None:
+            self.telemetry_recorder.record(self.current_direction, self.outcome)
+        if self.outcome in (MOVED, ATE):
             return True
+        if self.replay_file is not None:
+            self.recorder.save(self.replay_file)
         return False
 
-    def make_new_food(self):
-        """generates a new piece of food on the board randomly"""
-        size = len(self.empty_cells)
-        if size > 0:
-            stop_sample = rand.randint(0, 10 if size > 10 else size - 1)
-            i = 0
-            for cell in self.empty_cells:
-                if i == stop_sample:
-                    cell.set_type("FOOD").draw()
-                    break
-                i += 1
+    def render(self):
+        """draws everything that changed since the last frame. Called by self.loop after ticking"""
+
+        self.renderer.update()
+        score = "Score: " + str(self.game.snake.size())
+        if self.score_label["text"] != score:
+            self.score_label["text"] = score
+        if self.outcome == DIED:
+            self.show_message("Game Over!")
+        elif self.outcome == WON:
+            self.show_message("You Win!")
+
+    def show_message(self, text):
+        """writes a message across the middle of the board
+
+        Args:
+            text (str) the message to show
+        """
+
+        width = self.board_config.width
+        font_size = max(int(30 * width / GAME_WIDTH), 8)
+        self.create_text(width / 2, width / 2, fill="white", font="Roboto %d bold" % font_size, text=text)
 
     def initialize_food_img(self):
-        """initializes the apple png used for the food"""
+        """gets the apple image used for the food, sized for the current squares"""
 
-        img = Image.open("food.png")
-        img = img.resize(
-            (int(SQUARE_WIDTH), int(SQUARE_WIDTH)), Image.ANTIALIAS)
-        self.tk_img = PhotoImage(img)
+        self.tk_img = food_sprites.get(int(self.board_config.square_width))
 
     def change_direction(self, event):
-        """changes the direction of the snake so that next time it moves, it makes a turn
+        """queues a turn for the snake, made on the next move that has no earlier turn waiting. The first turn
+            starts the game
 
         Args:
             event (keyboard press) the event triggered when user presses arrow keys
         """
 
-        if not self.changedDirectionThisTurnAlready:
-            key = event.keysym
-            new_direction = self.current_direction
-            if key == "Up" and not self.current_direction == self.down:
-                new_direction = self.up
-            elif key == "Right" and not self.current_direction == self.left:
-                new_direction = self.right
-            elif key == "Down" and not self.current_direction == self.up:
-                new_direction = self.down
-            elif key == "Left" and not self.current_direction == self.right:
-                new_direction = self.left
-
-            first_move = self.current_direction == None
-            if new_direction != self.current_direction:
-                self.current_direction = new_direction
-                self.snake.get_head().set_direction(new_direction)
-                self.changedDirectionThisTurnAlready = True
-                if first_move:
-                    self.move_snake()
+        turn = KEY_DIRECTIONS.get(event.keysym)
+        if turn is None or not self.input_queue.push(turn, self.current_direction, self.loop.clock()):
+            return
+        if self.current_direction is None:
+            self.loop.start()
+        elif len(self.input_queue) == 1:
+            self.loop.tick_early(self.loop.tick_interval * EARLY_TURN_SHARE)
 
     def draw_all_cells(self):
-        """draws all the empty cells on the board (these are only drawn once, snake goes on top)"""
+        """draws all the visible empty cells as a single image (drawn once per game, snake goes on top)"""
 
-        for row in self.cells:
-            for cell in row:
-                self.create_rectangle(
-                    cell.get_coords(), fill=GAME_BACKGROUND_COLOR, outline=SQUARE_OUTLINE_COLOR)
+        self.background_img = get_background(
+            int(self.board_config.width), self.board_config.visible_dimensions, GAME_BACKGROUND_COLOR, SQUARE_OUTLINE_COLOR)
+        self.create_image(0, 0, image=self.background_img, anchor=NW)
 
     def restart_game(self):
         """restarts the game (called when play again is pressed, and when user changes board dimensions)"""
 
+        self.loop.stop()
+        if self.telemetry is not None:
+            self.telemetry_recorder.stop()
+        self.loop.tick_interval = self.get_tick_interval()
         self.delete("all")
         self.current_direction = None
-        self.changedDirectionThisTurnAlready = False
+        self.input_queue.clear()
+        self.outcome = None
         self.score_label["text"] = "Score: 1"
 
-        self.initialize_empty_cells()
+        self.new_game()
         self.draw_all_cells()
-        self.initialize_snake(self.score_label)
         self.initialize_food_img()
-        self.make_new_food()
+        self.initialize_renderer()
 
     def handle_dimension_change(self, event):
         """handler for when the user changes board dimensions. Starts a new game
@@ -196,15 +232,11 @@ class Board(Canvas):
             event (submission) submission event triggered when user presses enter from inside the entry field
         """
 
-        global GAME_GRID_DIMENSIONS, GAME_WIDTH, SQUARE_WIDTH, TIME_BETWEEN_MOVES, INVERSE_PROP_CONSTANT
         try:
             new_dimens = int(event.widget.get())
-            if new_dimens < 2 or new_dimens > 100:
+            if new_dimens < 2 or new_dimens > MAX_GRID_DIMENSIONS:
                 raise ValueError('A very specific bad thing happened.')
-            GAME_GRID_DIMENSIONS = int(event.widget.get())
-            SQUARE_WIDTH = GAME_WIDTH / GAME_GRID_DIMENSIONS
-            TIME_BETWEEN_MOVES = int(
-                INVERSE_PROP_CONSTANT / GAME_GRID_DIMENSIONS)
+            self.board_config = self.board_config.resized(new_dimens)
             self.restart_game()
             self.focus_set()
         except:
@@ -4,41 +4,35 @@ from snakebot import Snakebot
 
 class BotBoard(board.Board):
 
+    def __init__(self, parent=None, bot_class=Snakebot, tick_interval=0, **kwargs):
+        """constructs a new game board played by a bot
+
+        Args:
+            parent (widget) the frame/window this canvas belongs to
+            bot_class (class) the bot to play with, constructed with the game for each new game
+            tick_interval (float) seconds between the bot's moves, or 0 to move as fast as the game can be simulated
+            **kwargs (arg list) other optional arguments for Board
+        """
+
+        self.bot_class = bot_class
+        self.tick_interval = tick_interval
+        board.Board.__init__(self, parent, **kwargs)
+
     def start_bot(self):
         """makes the bot start playing"""
 
-        print("bot starting")
-        self.bot = Snakebot(self.snake.get_head(), self)
+        self.bot = self.bot_class(self.game)
         self.current_direction = self.bot.get_new_direction()
-        print("direction: ", self.current_direction)
-        self.move_snake()
+        self.loop.start()
+
+    def get_tick_interval(self):
+        # Overridden from Board, the bot's speed doesn't depend on the board size
+        return self.tick_interval
 
     def move_snake(self):
         # Overridden from Board
-        if self.snake.size() == board.GAME_GRID_DIMENSIONS * board.GAME_GRID_DIMENSIONS:
-            self.create_text(board.GAME_WIDTH / 2, board.GAME_WIDTH / 2, fill="white", font="Roboto 30 bold",
-                             text="You Win!")
-            return
-
-        (row, col) = self.snake.get_head().get_row_col()
-        if not self.current_direction:
-            return
-        (dx, dy) = self.current_direction.get_deltas()
-
-        if not self.check_for_collision((row + dy, col + dx)) and self.current_direction:
-            new_cell = self.cells[row + dy][col + dx]
-            need_more_food = new_cell.get_type() == "FOOD"
-            self.snake.move(new_cell, self.current_direction)
-            if (need_more_food):
-                self.make_new_food()
-
-            self.bot.update_position(self.snake.get_head())
-            self.current_direction = self.bot.get_new_direction()
-            self.snake.get_head().set_direction(self.current_direction)
-            self.after(1, self.move_snake)
-        else:
-            self.create_text(board.GAME_WIDTH / 2, board.GAME_WIDTH / 2, fill="white", font="Roboto 30 bold",
-                             text="Game Over!")
+        self.current_direction = self.bot.get_new_direction()
+        return board.Board.move_snake(self)
 
     def restart_game(self):
         # Overridden from Board
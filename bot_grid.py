@@ -0,0 +1,60 @@
+"""A window of many bot games running at once in one process, each board with its own size
+
+Usage:
+    python3 bot_grid.py
+"""
+
+from tkinter import Tk, Frame, Label, BOTTOM, X
+from board import BoardConfig
+from bot_board import BotBoard
+from colors import GAME_BACKGROUND_COLOR
+from snakebot import Snakebot, ShortcutSnakebot
+
+# boards along each side of the window, so GRID_SIDE * GRID_SIDE games are played at once
+GRID_SIDE = 8
+BOARD_WIDTH = 100
+# sizes and bots are handed out to the boards in turn
+BOARD_DIMENSIONS = (6, 8, 10, 12)
+BOT_CLASSES = (Snakebot, ShortcutSnakebot)
+BOT_TICK_INTERVAL = 0.02
+
+
+def create_boards(window, side=GRID_SIDE):
+    """fills a window with a side x side grid of bot boards
+
+    Args:
+        window (widget) the window the boards are added to
+        side (int) number of boards along each side of the grid
+
+    Returns:
+        list of the boards, not yet started
+    """
+
+    boards = []
+    for i in range(side * side):
+        frame = Frame(window, background=GAME_BACKGROUND_COLOR, highlightthickness=1)
+        score_label = Label(frame, text="Score: 1", font="Roboto 8", background=GAME_BACKGROUND_COLOR,
+                            foreground="WHITE")
+        board_config = BoardConfig(BOARD_DIMENSIONS[i % len(BOARD_DIMENSIONS)], BOARD_WIDTH)
+        bot_class = BOT_CLASSES[i // len(BOARD_DIMENSIONS) % len(BOT_CLASSES)]
+        boards.append(BotBoard(frame, bot_class=bot_class, tick_interval=BOT_TICK_INTERVAL,
+                               board_config=board_config, score_label=score_label, background=GAME_BACKGROUND_COLOR,
+                               width=BOARD_WIDTH, height=BOARD_WIDTH, highlightthickness=0))
+        score_label.pack(side=BOTTOM, fill=X)
+        frame.grid(row=i // side, column=i % side)
+    return boards
+
+
+def main():
+    """sets up the window and starts every bot"""
+
+    window = Tk()
+    window.title("Snake bots")
+    window.resizable(width=False, height=False)
+    for game_board in create_boards(window):
+        window.after(1000, game_board.start_bot)
+    window.mainloop()
+
+
+if __name__ == "__main__":
+    main()
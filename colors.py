@@ -0,0 +1,8 @@
+"""Colors shared by the tkinter boards and the offscreen frame export, kept apart from board so that importing
+them doesn't need tkinter"""
+
+SQUARE_OUTLINE_COLOR = "#888888"
+GAME_BACKGROUND_COLOR = "#123456"
+SNAKE_COLOR = "#45d66b"
+MENU_COLOR = "#888888"
+BORDER_COLOR = "#222222"
@@ -15,3 +15,35 @@ class Direction:
     def get_deltas(self):
         """returns the deltas associated to this direction"""
         return self.deltas
+
+
+# the four directions are shared by every board, bot and game state so they can be compared with `is`
+UP = Direction((0, -1))
+RIGHT = Direction((1, 0))
+DOWN = Direction((0, 1))
+LEFT = Direction((-1, 0))
+# the order directions are numbered in wherever they are stored as integers
+DIRECTIONS = (UP, RIGHT, DOWN, LEFT)
+DIRECTION_INDEXES = {direction: i for (i, direction) in enumerate(DIRECTIONS)}
+
+
+def direction_between(cell, next_cell, dimensions):
+    """finds the direction leading from one cell index to a neighbouring one
+
+    Args:
+        cell (int) index of the starting cell, row * dimensions + col
+        next_cell (int) index of a cell next to it
+        dimensions (int) number of cells along each side of the board
+
+    Returns:
+        one of UP, RIGHT, DOWN, LEFT
+    """
+
+    difference = next_cell - cell
+    if difference == 1:
+        return RIGHT
+    elif difference == -1:
+        return LEFT
+    elif difference == dimensions:
+        return DOWN
+    return UP
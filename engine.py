@@ -0,0 +1,163 @@
+"""Display-independent Snake rules. A GameState can be stepped without tkinter, so bots and regression games
+can run on machines with no display, and the tkinter boards only watch it and draw what changed.
+
+Cells are identified by a single index, row * dimensions + col, and the contents of the board are kept in a
+bytearray with one byte per cell, so moving and collision checks are O(1) and never compare strings.
+"""
+
+import random
+import time
+
+import instrumentation
+from free_cells import FreeCellPool
+from snake import Snake
+
+# cell contents
+EMPTY = 0
+SNAKE = 1
+FOOD = 2
+
+# outcomes of a single step
+MOVED = "MOVED"
+ATE = "ATE"
+DIED = "DIED"
+WON = "WON"
+
+
+class GameState:
+    """Owns the grid, snake and food for a single game and applies moves to them"""
+
+    def __init__(self, dimensions, seed=None):
+        """sets up a new game with the snake in the middle of the board and one piece of food
+
+        Args:
+            dimensions (int) number of cells along each side of the square board
+            seed (int) seed for this game's food placement, so the game can be played again exactly. A random
+                seed is picked if it's None
+        """
+
+        self.dimensions = dimensions
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
+        self.grid = bytearray(dimensions * dimensions)
+        self.free_cells = FreeCellPool(dimensions * dimensions)
+
+        middle = dimensions // 2
+        start = middle * dimensions + middle
+        self.snake = Snake(start, self.free_cells)
+        self.grid[start] = SNAKE
+
+        self.direction = None
+        self.moves = 0
+        self.food = None
+        self.last_tail = None
+        self.over = False
+        self.stats = None
+        self.make_new_food()
+
+    def step(self, direction):
+        """moves the snake a single time in the given direction
+
+        Args:
+            direction (Direction) the direction the head moves in
+
+        Returns:
+            one of MOVED, ATE, DIED or WON
+        """
+
+        dimensions = self.dimensions
+        (row, col) = divmod(self.snake.body[0], dimensions)
+        (dx, dy) = direction.deltas
+        row += dy
+        col += dx
+        if row < 0 or col < 0 or row >= dimensions or col >= dimensions:
+            self.over = True
+            return DIED
+        new_cell = row * dimensions + col
+        contents = self.grid[new_cell]
+        if contents == SNAKE and new_cell != self.snake.body[-1]:
+            self.over = True
+            return DIED
+
+        ate = contents == FOOD
+        self.direction = direction
+        self.moves += 1
+        self.last_tail = self.snake.move(new_cell, ate)
+        if self.last_tail is not None:
+            self.grid[self.last_tail] = EMPTY
+        self.grid[new_cell] = SNAKE
+
+        if not ate:
+            return MOVED
+        self.food = None
+        if len(self.snake.body) == dimensions * dimensions:
+            self.over = True
+            return WON
+        if self.stats is None:
+            self.make_new_food()
+        else:
+            start = time.perf_counter()
+            self.make_new_food()
+            self.stats.record(instrumentation.FOOD, time.perf_counter() - start)
+        return ATE
+
+    def check_for_collision(self, new_coords):
+        """checks if the cell that the snake is about to move into will result in a game over. Moving into the
+            current tail is allowed because the tail moves out of the way on the same step
+
+        Args:
+            new_coords (tuple) the grid indices (row, col) of the cell being moved to
+
+        Returns:
+            true if game is over, else false
+        """
+
+        (new_row, new_col) = new_coords
+        if new_row >= self.dimensions or new_col >= self.dimensions or new_row < 0 or new_col < 0:
+            return True
+        new_cell = new_row * self.dimensions + new_col
+        return self.grid[new_cell] == SNAKE and new_cell != self.snake.get_tail()
+
+    def make_new_food(self):
+        """puts a new piece of food on a free cell chosen uniformly at random"""
+
+        if len(self.free_cells) > 0:
+            self.place_food(self.free_cells.sample(self.rng))
+
+    def restore(self, body, food, direction, moves):
+        """replaces the position on the board with a saved one
+
+        Args:
+            body (list) cell indices of the snake from head to tail
+            food (int) cell of the food, or None
+            direction (Direction) direction of the last move, or None
+            moves (int) number of moves made to reach this position
+        """
+
+        area = self.dimensions * self.dimensions
+        self.grid = bytearray(area)
+        self.free_cells = FreeCellPool(area)
+        self.snake = Snake(body[0], self.free_cells)
+        for cell in body[1:]:
+            self.snake.grow_tail(cell)
+        for cell in body:
+            self.grid[cell] = SNAKE
+        self.food = None
+        if food is not None:
+            self.place_food(food)
+        self.direction = direction
+        self.moves = moves
+        self.last_tail = None
+        self.over = False
+
+    def place_food(self, cell):
+        """puts the food on the given cell, moving it if there already is some
+
+        Args:
+            cell (int) index of an empty cell
+        """
+
+        if self.food is not None:
+            self.grid[self.food] = EMPTY
+        self.food = cell
+        self.grid[cell] = FOOD
@@ -0,0 +1,334 @@
+"""Draws games into images without a display, and turns replays or live bot games into GIFs, numbered PNGs or
+videos. Frames look the same as the tkinter board: the same head, tail, body and food shapes from CellGeometry and
+the same food sprite. Requires pillow, and ffmpeg on the path for video
+
+Frames are drawn and encoded by a pool of worker processes, in order. Only every stride-th move becomes a frame,
+so a long game can be turned into a timelapse. Frames of a replay are found by seeking it, so each worker
+replays at most one chunk per frame however long the game is. A live game is played in the main process and
+sends each frame's snake to the workers.
+
+Usage:
+    python frame_export.py --replay REPLAY --out OUT [--frames N | --stride N] [--cell PIXELS] [--fps N]
+    python frame_export.py --bot Snakebot --size N --seed N --out OUT [--stride N] ...
+    OUT ending in .gif writes a GIF, .mp4/.webm/.mkv/.avi a video, and anything else a directory of PNGs
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+from itertools import islice
+
+from PIL import Image, ImageChops, ImageDraw
+
+from cell import Cell, get_cell_geometry
+from colors import SQUARE_OUTLINE_COLOR, GAME_BACKGROUND_COLOR, SNAKE_COLOR
+from direction import DIRECTIONS, DIRECTION_INDEXES, direction_between
+from engine import GameState, DIED, WON
+from replay import Replay, ReplayPlayer
+from sprites import SpriteCache, food_sprites
+from tournament import BOTS
+
+DEFAULT_CELL_PIXELS = 10
+# without --cell, frames are about this wide, with cells of at least 2 pixels
+DEFAULT_FRAME_PIXELS = 500
+DEFAULT_FPS = 30
+DEFAULT_FRAMES = 600
+GIF_COLORS = 64
+# frames handed to the pool at once, so a live game isn't played further ahead than the workers have drawn
+BATCH_FRAMES = 256
+VIDEO_EXTENSIONS = (".mp4", ".webm", ".mkv", ".avi")
+
+# maps grid bytes with the snake's cells set to 1 onto a mask that is opaque on the snake
+SNAKE_MASK_TABLE = bytes([0, 255] + [0] * 254)
+
+backgrounds = SpriteCache(4)
+interiors = SpriteCache(4)
+
+
+def draw_grid(mode, dimensions, cell_pixels, fill, outline):
+    """draws cells of one color with a one pixel outline of another between them
+
+    Args:
+        mode (str) PIL mode of the image
+        dimensions (int) number of cells along each side
+        cell_pixels (int) width and height of a cell in pixels
+        fill (str or int) color inside the cells
+        outline (str or int) color of the outlines
+
+    Returns:
+        the new Image
+    """
+
+    width = dimensions * cell_pixels
+    image = Image.new(mode, (width, width), fill)
+    draw = ImageDraw.Draw(image)
+    for i in range(dimensions + 1):
+        position = min(i * cell_pixels, width - 1)
+        draw.line((position, 0, position, width - 1), fill=outline)
+        draw.line((0, position, width - 1, position), fill=outline)
+    return image
+
+
+def to_pil_angles(start, extent):
+    """converts a tkinter arc, counterclockwise from start, to the clockwise (start, end) that PIL draws"""
+
+    return (-(start + extent), -start)
+
+
+class FrameRenderer:
+    """Draws positions of games on boards of one size into PIL images. The empty board and the mask of cell
+        interiors are cached per size, and the food sprite per square size, so a frame is one copy of the
+        background, one masked paste for the whole body and a handful of shapes for the head, tail and food
+    """
+
+    def __init__(self, dimensions, cell_pixels=DEFAULT_CELL_PIXELS):
+        """sets up a renderer
+
+        Args:
+            dimensions (int) number of cells along each side of the board
+            cell_pixels (int) width and height of a cell in pixels
+        """
+
+        self.dimensions = dimensions
+        self.cell_pixels = cell_pixels
+        self.width = dimensions * cell_pixels
+        self.geometry = get_cell_geometry(cell_pixels)
+        key = (dimensions, cell_pixels)
+        self.background = backgrounds.get(key, lambda: draw_grid("RGB", dimensions, cell_pixels,
+                                                                 GAME_BACKGROUND_COLOR, SQUARE_OUTLINE_COLOR))
+        # opaque inside cells and clear on the outlines, so body squares keep their outline like on the canvas
+        self.interior = interiors.get(key, lambda: draw_grid("L", dimensions, cell_pixels, 255, 0))
+        self.food_image = food_sprites.get_resized(cell_pixels).convert("RGBA")
+
+    def get_cell(self, index):
+        return Cell(divmod(index, self.dimensions), self.geometry)
+
+    def draw(self, body, food, direction):
+        """draws one position
+
+        Args:
+            body (sequence) cell indices of the snake from head to tail
+            food (int) cell of the food, or None
+            direction (Direction) direction of the last move, or None
+
+        Returns:
+            RGB Image of the board
+        """
+
+        image = self.background.copy()
+        # every body cell but the head and tail is a plain square, drawn all at once through a mask
+        if len(body) > 2:
+            cells = bytearray(self.dimensions * self.dimensions)
+            for cell in body:
+                cells[cell] = 1
+            cells[body[0]] = cells[body[-1]] = 0
+            mask = Image.frombytes("L", (self.dimensions, self.dimensions), bytes(cells.translate(SNAKE_MASK_TABLE)))
+            mask = mask.resize((self.width, self.width), Image.NEAREST)
+            image.paste(SNAKE_COLOR, mask=ImageChops.multiply(mask, self.interior))
+
+        draw = ImageDraw.Draw(image)
+        if len(body) > 1:
+            direction_to_body = direction_between(body[-1], body[-2], self.dimensions)
+            draw.polygon(self.get_cell(body[-1]).get_tail_coords(direction_to_body), fill=SNAKE_COLOR,
+                         outline=SQUARE_OUTLINE_COLOR)
+        self.draw_head(draw, body[0], direction)
+        if food is not None:
+            (x1, y1, x2, y2) = self.get_cell(food).get_coords()
+            image.paste(self.food_image, (int(x1), int(y1)), self.food_image)
+        return image
+
+    def draw_head(self, draw, head, direction):
+        """draws the head in the same shapes as CanvasRenderer.draw_head"""
+
+        cell = self.get_cell(head)
+        (rectangle_coords, start_angle, eyes, mouth_start_angle) = cell.get_head_geometry(direction)
+        draw.rectangle(rectangle_coords, fill=SNAKE_COLOR)
+        (start, end) = to_pil_angles(start_angle, 180)
+        draw.pieslice(cell.get_coords(), start, end, fill=SNAKE_COLOR)
+        for eye in eyes:
+            draw.ellipse(eye, fill="black")
+        (start, end) = to_pil_angles(mouth_start_angle, 120)
+        draw.arc(cell.get_smiley_face_box(), start, end, fill="black",
+                 width=max(1, int(self.geometry.eye_radius * 1.5)))
+
+
+def replay_frame_moves(moves, stride):
+    """lists the moves of a replay that become frames: every stride-th one, and always the last"""
+
+    frames = list(range(0, moves + 1, stride))
+    if frames[-1] != moves:
+        frames.append(moves)
+    return frames
+
+
+def live_positions(bot_name, size, seed, stride, move_limit):
+    """plays a bot game in this process, yielding (body, food, direction index) for every stride-th move and the
+        last. Directions are sent to the workers as indexes, since unpickled copies wouldn't be the shared objects
+    """
+
+    game = GameState(size, seed)
+    bot = BOTS[bot_name](game)
+    (step, get_new_direction) = (game.step, bot.get_new_direction)
+    yield (list(game.snake.body), game.food, DIRECTION_INDEXES.get(game.direction))
+    outcome = None
+    while outcome != DIED and outcome != WON and game.moves < move_limit:
+        for _ in range(stride):
+            outcome = step(get_new_direction())
+            if outcome == DIED or outcome == WON:
+                break
+        yield (list(game.snake.body), game.food, DIRECTION_INDEXES.get(game.direction))
+
+
+# each worker process keeps its own renderer, and its own player when exporting a replay
+worker = {}
+
+
+def start_worker(dimensions, cell_pixels, replay_path, mode, out):
+    """sets up a worker process"""
+
+    worker["renderer"] = FrameRenderer(dimensions, cell_pixels)
+    worker["mode"] = mode
+    worker["out"] = out
+    if replay_path is not None:
+        worker["player"] = ReplayPlayer(Replay.load(replay_path))
+
+
+def render_frame(job):
+    """draws and encodes one frame in a worker
+
+    Args:
+        job (tuple) the frame's number and either the move of the replay to seek to or (body, food, direction
+            index)
+
+    Returns:
+        the encoded frame: nothing for PNGs, which are written by the worker, (P mode bytes, palette) for GIFs
+        and RGB bytes for video
+    """
+
+    (number, position) = job
+    if isinstance(position, int):
+        player = worker["player"]
+        player.seek(position)
+        game = player.game
+        (body, food, direction) = (game.snake.body, game.food, game.direction)
+    else:
+        (body, food, index) = position
+        direction = DIRECTIONS[index] if index is not None else None
+    image = worker["renderer"].draw(body, food, direction)
+    mode = worker["mode"]
+    if mode == "png":
+        image.save(os.path.join(worker["out"], "frame_%06d.png" % number), optimize=False, compress_level=1)
+        return None
+    if mode == "gif":
+        image = image.quantize(GIF_COLORS)
+        return (image.tobytes(), image.getpalette())
+    return image.tobytes()
+
+
+def get_mode(out):
+    """works out the kind of output from its name: gif, video or png"""
+
+    extension = os.path.splitext(out)[1].lower()
+    if extension == ".gif":
+        return "gif"
+    if extension in VIDEO_EXTENSIONS:
+        return "video"
+    return "png"
+
+
+def export(jobs, dimensions, out, cell_pixels=DEFAULT_CELL_PIXELS, fps=DEFAULT_FPS, workers=None, replay_path=None):
+    """draws and encodes frames on a pool of worker processes and writes them out in order
+
+    Args:
+        jobs (iterable) (frame number, position) for each frame, the position being a move of the replay or
+            (body, food, direction index)
+        dimensions (int) number of cells along each side of the board
+        out (str) the GIF, video or PNG directory to write
+        cell_pixels (int) width and height of a cell in pixels
+        fps (int) frames per second of a GIF or video
+        workers (int) number of worker processes, or None for one per core
+        replay_path (str) the replay seeked by the workers, if the positions are moves
+
+    Returns:
+        number of frames written
+    """
+
+    import multiprocessing
+
+    mode = get_mode(out)
+    width = dimensions * cell_pixels
+    encoder = None
+    if mode == "png":
+        os.makedirs(out, exist_ok=True)
+    elif mode == "video":
+        if shutil.which("ffmpeg") is None:
+            raise RuntimeError("writing video needs ffmpeg on the path, write a .gif or PNG directory instead")
+        encoder = subprocess.Popen(["ffmpeg", "-loglevel", "error", "-y", "-f", "rawvideo", "-pix_fmt", "rgb24",
+                                    "-s", "%dx%d" % (width, width), "-r", str(fps), "-i", "-",
+                                    "-pix_fmt", "yuv420p", out], stdin=subprocess.PIPE)
+
+    # GIFs are only written at the end, so their frames are kept (one byte per pixel) until then
+    gif_frames = []
+    count = 0
+    jobs = iter(jobs)
+    with multiprocessing.Pool(workers, start_worker, (dimensions, cell_pixels, replay_path, mode, out)) as pool:
+        while True:
+            batch = list(islice(jobs, BATCH_FRAMES))
+            if not batch:
+                break
+            for frame in pool.imap(render_frame, batch, chunksize=4):
+                count += 1
+                if mode == "gif":
+                    (data, palette) = frame
+                    image = Image.frombytes("P", (width, width), data)
+                    image.putpalette(palette)
+                    gif_frames.append(image)
+                elif mode == "video":
+                    encoder.stdin.write(frame)
+
+    if mode == "gif" and gif_frames:
+        gif_frames[0].save(out, save_all=True, append_images=gif_frames[1:], duration=int(1000 / fps), loop=0)
+    elif encoder is not None:
+        encoder.stdin.close()
+        encoder.wait()
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exports a replay or a live bot game as a GIF, video or PNGs")
+    parser.add_argument("--out", required=True, help=".gif, .mp4/.webm/.mkv/.avi, or a directory for PNGs")
+    parser.add_argument("--replay", help="replay file to export")
+    parser.add_argument("--bot", help="bot to play a live game with, instead of a replay")
+    parser.add_argument("--size", type=int, default=20, help="board size of a live game")
+    parser.add_argument("--seed", type=int, default=0, help="seed of a live game")
+    parser.add_argument("--move-limit", type=int, default=10 ** 8, help="moves after which a live game is cut")
+    parser.add_argument("--stride", type=int, help="moves between frames, 1 for every move")
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES,
+                        help="frames to spread over a replay when no stride is given")
+    parser.add_argument("--cell", type=int, help="pixels along each side of a cell, by default frames are about %d "
+                                                 "pixels wide" % DEFAULT_FRAME_PIXELS)
+    parser.add_argument("--fps", type=int, default=DEFAULT_FPS)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    if (args.replay is None) == (args.bot is None):
+        parser.error("give exactly one of --replay and --bot")
+    if args.bot is not None and args.bot not in BOTS:
+        parser.error("unknown bot %s, choose from %s" % (args.bot, ", ".join(BOTS)))
+    if args.replay is not None:
+        replay = Replay.load(args.replay)
+        dimensions = replay.dimensions
+        stride = args.stride or max(1, -(-replay.moves // args.frames))
+        jobs = enumerate(replay_frame_moves(replay.moves, stride))
+    else:
+        dimensions = args.size
+        stride = args.stride or 1
+        jobs = enumerate(live_positions(args.bot, args.size, args.seed, stride, args.move_limit))
+    cell_pixels = args.cell or max(2, DEFAULT_FRAME_PIXELS // dimensions)
+    count = export(jobs, dimensions, args.out, cell_pixels, args.fps, args.workers, args.replay)
+    print("wrote %d frames to %s, one every %d moves" % (count, args.out, stride))
+
+
+if __name__ == "__main__":
+    main()
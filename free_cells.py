@@ -0,0 +1,65 @@
+class FreeCellPool:
+    """The set of cells not covered by the snake, kept so that adding, removing and uniformly sampling a cell
+        are all O(1). The first `count` entries of `cells` are the free cells in no particular order, and
+        `positions[cell]` is where a cell currently sits in `cells`. Removing a cell swaps it with the last free
+        one, so a cell is free exactly when its position is below `count`.
+    """
+
+    def __init__(self, size):
+        """creates a pool in which every cell is free
+
+        Args:
+            size (int) total number of cells on the board
+        """
+
+        self.cells = list(range(size))
+        self.positions = list(range(size))
+        self.count = size
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, cell):
+        return self.positions[cell] < self.count
+
+    def remove(self, cell):
+        """marks a free cell as taken
+
+        Args:
+            cell (int) index of the cell to remove
+        """
+
+        self.count -= 1
+        self.swap(self.positions[cell], self.count)
+
+    def add(self, cell):
+        """marks a taken cell as free
+
+        Args:
+            cell (int) index of the cell to add
+        """
+
+        self.swap(self.positions[cell], self.count)
+        self.count += 1
+
+    def sample(self, rng):
+        """picks a free cell uniformly at random
+
+        Args:
+            rng (random.Random) source of randomness
+
+        Returns:
+            index of the chosen cell
+        """
+
+        return self.cells[rng.randrange(self.count)]
+
+    def swap(self, i, j):
+        """swaps the cells at positions i and j of the dense array, keeping positions up to date"""
+
+        cells = self.cells
+        (a, b) = (cells[i], cells[j])
+        cells[i] = b
+        cells[j] = a
+        self.positions[b] = i
+        self.positions[a] = j
@@ -0,0 +1,180 @@
+"""Fixed-timestep scheduling of a game on top of tkinter's after()"""
+
+import time
+
+from instrumentation import SIMULATE, DRAW, SCHEDULE
+
+FRAME_INTERVAL = 1 / 60
+# with no tick interval, this share of each frame is spent simulating and the rest is left for drawing
+SIMULATION_SHARE = 0.8
+# ticks between clock reads when simulating as fast as possible
+CLOCK_CHECK_INTERVAL = 64
+# ticks a frame may run to catch up before the rest of the backlog is dropped
+MAX_TICKS_PER_FRAME = 5
+
+
+class GameLoop:
+    """Runs simulation ticks at a fixed rate measured against the wall clock, and renders at most once per frame.
+        Time spent ticking and drawing doesn't push later ticks back, because each frame runs however many ticks
+        are due since the last one. Frames that would have been drawn while the loop was busy are skipped
+    """
+
+    def __init__(self, widget, tick, render, tick_interval, frame_interval=FRAME_INTERVAL, clock=time.perf_counter,
+                 stats=None):
+        """sets up a loop, which does nothing until started
+
+        Args:
+            widget (Widget) any tkinter widget, used to schedule frames with after()
+            tick (function) advances the game a single time, returns false once the game is over
+            render (function) draws the game as it currently is
+            tick_interval (float) seconds between ticks, or 0 to tick as fast as possible
+            frame_interval (float) minimum seconds between frames
+            clock (function) returns the current time in seconds
+            stats (TickStats) where to record how long each phase of a frame takes, or None to not time them
+        """
+
+        self.widget = widget
+        self.tick = tick
+        self.render = render
+        self.tick_interval = tick_interval
+        self.frame_interval = frame_interval
+        self.clock = clock
+        self.stats = stats
+
+        self.running = False
+        self.pending = None
+        self.ticks_per_second = 0.0
+        self.frame_time = 0.0
+        self.dropped_ticks = 0
+
+    def start(self):
+        """starts ticking, with the first tick happening right away"""
+
+        self.stop()
+        self.running = True
+        now = self.clock()
+        self.last_time = now
+        self.next_frame = now
+        self.lag = self.tick_interval
+        self.window_start = now
+        self.window_ticks = 0
+        self.run_frame()
+
+    def stop(self):
+        """stops ticking and cancels the next frame"""
+
+        self.running = False
+        if self.pending is not None:
+            self.widget.after_cancel(self.pending)
+            self.pending = None
+
+    def run_frame(self):
+        """runs the ticks that are due, draws if anything changed and schedules the next frame"""
+
+        self.pending = None
+        start = self.clock()
+        ticks = self.simulate(start) if self.tick_interval else self.simulate_unthrottled(start)
+        if self.stats is not None:
+            simulated = self.clock()
+            self.stats.record(SCHEDULE, max(start - self.next_frame, 0))
+            self.stats.record(SIMULATE, simulated - start)
+        if ticks:
+            self.render()
+        end = self.clock()
+        if self.stats is not None and ticks:
+            self.stats.record(DRAW, end - simulated)
+        self.frame_time = end - start
+        self.count_ticks(ticks, end)
+
+        if self.running:
+            # frames are scheduled against fixed deadlines, but never to make up for ones already missed
+            self.next_frame = max(self.next_frame + self.frame_interval, end)
+            self.pending = self.widget.after(int((self.next_frame - end) * 1000), self.run_frame)
+
+    def simulate(self, now):
+        """runs every tick that has come due since the last frame
+
+        Args:
+            now (float) the time this frame started
+
+        Returns:
+            number of ticks run
+        """
+
+        self.lag += now - self.last_time
+        self.last_time = now
+        ticks = 0
+        while self.lag >= self.tick_interval:
+            if ticks == MAX_TICKS_PER_FRAME:
+                # too far behind to catch up, so give up on the backlog rather than fall further behind
+                self.dropped_ticks += int(self.lag / self.tick_interval)
+                self.lag %= self.tick_interval
+                break
+            self.lag -= self.tick_interval
+            ticks += 1
+            if not self.tick():
+                self.running = False
+                break
+        return ticks
+
+    def tick_early(self, window):
+        """runs the next tick right away if it is due within a window, and draws it. The tick counts as the one that
+            was due, so the ticks after it keep to the same rate
+
+        Args:
+            window (float) seconds before the next tick within which it may be run early
+
+        Returns:
+            true if a tick was run
+        """
+
+        if not self.running or not self.tick_interval:
+            return False
+        now = self.clock()
+        self.lag += now - self.last_time
+        self.last_time = now
+        if self.tick_interval - self.lag > window:
+            return False
+        self.lag -= self.tick_interval
+        self.window_ticks += 1
+        if not self.tick():
+            self.stop()
+        self.render()
+        return True
+
+    def simulate_unthrottled(self, now):
+        """ticks as many times as fit in this frame's share of simulation time
+
+        Args:
+            now (float) the time this frame started
+
+        Returns:
+            number of ticks run
+        """
+
+        deadline = now + self.frame_interval * SIMULATION_SHARE
+        tick = self.tick
+        ticks = 0
+        while True:
+            for _ in range(CLOCK_CHECK_INTERVAL):
+                ticks += 1
+                if not tick():
+                    self.running = False
+                    return ticks
+            if self.clock() >= deadline:
+                return ticks
+
+    def count_ticks(self, ticks, now):
+        """updates ticks_per_second about once a second
+
+        Args:
+            ticks (int) ticks run in the frame that just finished
+            now (float) the time the frame finished
+        """
+
+        self.window_ticks += ticks
+        elapsed = now - self.window_start
+        if elapsed >= 1:
+            self.ticks_per_second = self.window_ticks / elapsed
+            self.window_start = now
+            self.window_ticks = 0
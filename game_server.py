@@ -0,0 +1,278 @@
+"""Hosts many games at once from one process, for remote bots and players, over TCP or a Unix socket. Every game
+is a GameState, and a single scheduler steps all of them on the same tick.
+
+Protocol (little endian, every message starts with one ASCII byte saying what it is):
+    client to server
+        H   dimensions uint16, seed uint32         start a new game, NO_SEED for a random seed
+        T   direction uint8                        turn, the index of the direction in DIRECTIONS
+    server to client
+        S   dimensions uint16, seed uint32, head uint32, food uint32      a new game has started
+        M   tail uint32, head uint32               the tail left a cell, then the head moved into one, which may
+                                                   be the cell the tail just left
+        E   head uint32, food uint32               the head moved onto the food and new food was placed, NO_CELL
+                                                   if the board is full
+        X   outcome (D or W), moves uint32         the game is over, send H to play again
+
+A game doesn't move until its first turn, like a board waiting for the first key press. Turns are queued the
+same way as key presses on a board, and each tick makes at most one of them.
+
+Usage:
+    python game_server.py [--port N | --unix PATH] [--tick SECONDS]
+"""
+
+import argparse
+import asyncio
+import struct
+import time
+
+from direction import DIRECTIONS
+from engine import GameState, MOVED, ATE, WON
+from input_queue import InputQueue
+from instrumentation import TickStats, SIMULATE, SCHEDULE, INPUT
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 5005
+TICK_INTERVAL = 0.1
+# the same limit as the boards
+MAX_DIMENSIONS = 2000
+# a client that has this much waiting to be sent isn't keeping up, and is disconnected
+MAX_BUFFERED_BYTES = 64 * 1024
+REPORT_SECONDS = 5
+
+HELLO = struct.Struct("<cHI")
+TURN = struct.Struct("<cB")
+START = struct.Struct("<cHIII")
+MOVE = struct.Struct("<cII")
+EAT = struct.Struct("<cII")
+END = struct.Struct("<ccI")
+NO_SEED = 0xFFFFFFFF
+NO_CELL = 0xFFFFFFFF
+
+
+class Session(asyncio.Protocol):
+    """The game played over one connection. Messages are parsed straight from the bytes received rather than
+        through streams, since a turn is only two bytes and awaiting each one would cost more than playing the move
+    """
+
+    def __init__(self, server):
+        """sets up a connection with no game yet
+
+        Args:
+            server (GameServer) the server this connection was made to
+        """
+
+        self.server = server
+        self.stats = server.stats
+        self.buffer = bytearray()
+        self.game = None
+        self.direction = None
+        self.input_queue = InputQueue()
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.server.sessions.add(self)
+
+    def connection_lost(self, exc):
+        self.server.sessions.discard(self)
+
+    def data_received(self, data):
+        buffer = self.buffer
+        buffer += data
+        offset = 0
+        while offset < len(buffer):
+            kind = buffer[offset]
+            if kind == ord("T"):
+                if len(buffer) - offset < TURN.size:
+                    break
+                index = buffer[offset + 1]
+                if index >= len(DIRECTIONS):
+                    self.transport.close()
+                    return
+                self.turn(DIRECTIONS[index], self.server.clock())
+                offset += TURN.size
+            elif kind == ord("H"):
+                if len(buffer) - offset < HELLO.size:
+                    break
+                (_, dimensions, seed) = HELLO.unpack_from(buffer, offset)
+                if not 2 <= dimensions <= MAX_DIMENSIONS:
+                    self.transport.close()
+                    return
+                self.start(dimensions, seed)
+                offset += HELLO.size
+            else:
+                self.transport.close()
+                return
+        del buffer[:offset]
+
+    def start(self, dimensions, seed):
+        """starts a new game, replacing the current one
+
+        Args:
+            dimensions (int) number of cells along each side of the board
+            seed (int) seed for the food, or NO_SEED for a random one
+        """
+
+        self.game = GameState(dimensions, None if seed == NO_SEED else seed)
+        self.direction = None
+        self.input_queue.clear()
+        self.transport.write(START.pack(b"S", dimensions, self.game.seed, self.game.snake.get_head(), self.game.food))
+
+    def turn(self, direction, now):
+        """queues a turn for the next tick
+
+        Args:
+            direction (Direction) the direction asked for
+            now (float) the time the turn arrived
+        """
+
+        if self.game is not None and not self.game.over:
+            self.input_queue.push(direction, self.direction, now)
+
+    def tick(self, now):
+        """makes one move if the game has started, and sends the client what changed
+
+        Args:
+            now (float) the time of this tick
+        """
+
+        game = self.game
+        if game is None or game.over:
+            return
+        turn = self.input_queue.pop()
+        if turn is not None:
+            (self.direction, pressed) = turn
+            if self.stats is not None:
+                self.stats.record(INPUT, now - pressed)
+        if self.direction is None:
+            return
+
+        outcome = game.step(self.direction)
+        if outcome == MOVED:
+            self.transport.write(MOVE.pack(b"M", game.last_tail, game.snake.get_head()))
+        elif outcome == ATE or outcome == WON:
+            food = game.food if game.food is not None else NO_CELL
+            message = EAT.pack(b"E", game.snake.get_head(), food)
+            if outcome == WON:
+                message += END.pack(b"X", b"W", game.moves)
+            self.transport.write(message)
+        else:
+            self.transport.write(END.pack(b"X", b"D", game.moves))
+
+
+class GameServer:
+    """Accepts connections, each playing its own game, and steps every game on a shared fixed-rate tick. Ticks are
+        scheduled against fixed deadlines, and ticks missed while the server was busy are skipped rather than run
+        in a burst, so a slow tick shows up as lateness in the stats
+    """
+
+    def __init__(self, tick_interval=TICK_INTERVAL, clock=time.monotonic, stats=None):
+        """sets up a server with no connections
+
+        Args:
+            tick_interval (float) seconds between ticks
+            clock (function) returns the current time in seconds
+            stats (TickStats) where to record how long ticks take and how late they start, or None to not time them
+        """
+
+        self.tick_interval = tick_interval
+        self.stats = stats
+        self.sessions = set()
+        self.ticks = 0
+        self.skipped_ticks = 0
+        self.clock = clock
+
+    def tick(self, now):
+        """steps every game once, dropping clients that can't keep up with what they are sent
+
+        Args:
+            now (float) the time of this tick
+        """
+
+        self.ticks += 1
+        for session in list(self.sessions):
+            session.tick(now)
+            if session.transport.get_write_buffer_size() > MAX_BUFFERED_BYTES:
+                session.transport.abort()
+
+    async def run_ticks(self):
+        """ticks forever at the server's rate"""
+
+        clock = self.clock
+        next_tick = clock()
+        while True:
+            next_tick += self.tick_interval
+            await asyncio.sleep(next_tick - clock())
+            start = clock()
+            if start - next_tick >= self.tick_interval:
+                missed = int((start - next_tick) / self.tick_interval)
+                self.skipped_ticks += missed
+                next_tick += missed * self.tick_interval
+            self.tick(start)
+            if self.stats is not None:
+                self.stats.record(SCHEDULE, start - next_tick)
+                self.stats.record(SIMULATE, clock() - start)
+
+    async def report(self, seconds):
+        """prints the number of sessions and the tick timings every so often
+
+        Args:
+            seconds (float) time between reports
+        """
+
+        if self.stats is None:
+            raise ValueError("reports need a server made with stats")
+        while True:
+            await asyncio.sleep(seconds)
+            phases = self.stats.to_dict()["phases"]
+            (tick, late) = (phases[SIMULATE], phases[SCHEDULE])
+            if tick["count"]:
+                print("%d sessions, tick p95 %.2f ms max %.2f ms, late p95 %.2f ms, %d ticks skipped"
+                      % (len(self.sessions), tick["p95"] * 1000, tick["max"] * 1000, late["p95"] * 1000,
+                         self.skipped_ticks), flush=True)
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT, path=None, report_seconds=None):
+        """listens for connections and ticks until cancelled
+
+        Args:
+            host (str) address to listen on over TCP
+            port (int) port to listen on over TCP
+            path (str) path of a Unix socket to listen on instead of TCP, or None to use TCP
+            report_seconds (float) time between printed reports, or None to not print them. Needs stats
+        """
+
+        loop = asyncio.get_running_loop()
+        if path is not None:
+            server = await loop.create_unix_server(lambda: Session(self), path)
+        else:
+            server = await loop.create_server(lambda: Session(self), host, port)
+        print("serving on", path or "%s:%d" % server.sockets[0].getsockname()[:2], flush=True)
+        tasks = [asyncio.ensure_future(self.run_ticks())]
+        if report_seconds is not None:
+            tasks.append(asyncio.ensure_future(self.report(report_seconds)))
+        async with server:
+            try:
+                await asyncio.gather(*tasks)
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serves many Snake games over TCP or a Unix socket")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="0 picks a free port")
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--tick", type=float, default=TICK_INTERVAL, help="seconds between moves")
+    parser.add_argument("--report", type=float, default=REPORT_SECONDS,
+                        help="seconds between printed timings, 0 to not print them")
+    args = parser.parse_args()
+
+    server = GameServer(args.tick, stats=TickStats())
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix, args.report or None))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
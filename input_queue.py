@@ -0,0 +1,66 @@
+"""Buffering of the player's turns, so quick presses between two moves are applied one per move instead of lost"""
+
+from collections import deque
+
+from direction import UP, RIGHT, DOWN, LEFT
+
+INPUT_QUEUE_CAPACITY = 3
+
+OPPOSITES = {UP: DOWN, DOWN: UP, LEFT: RIGHT, RIGHT: LEFT}
+
+
+class InputQueue:
+    """The turns pressed but not yet made, oldest first, each with the time it was pressed. A turn is checked
+        against the one queued before it, or the snake's direction when nothing is queued, so Up then Left is a
+        U-turn over two moves rather than a reversal. Presses that don't turn the snake, and presses once the queue
+        is full, are dropped
+    """
+
+    def __init__(self, capacity=INPUT_QUEUE_CAPACITY):
+        """creates an empty queue
+
+        Args:
+            capacity (int) most turns kept waiting at once
+        """
+
+        self.turns = deque()
+        self.capacity = capacity
+        self.dropped = 0
+
+    def __len__(self):
+        return len(self.turns)
+
+    def push(self, direction, current_direction, now):
+        """queues a turn if it makes sense after the turns already queued
+
+        Args:
+            direction (Direction) the direction pressed
+            current_direction (Direction) the direction the snake is moving in, or None before the first move
+            now (float) the time of the press in seconds
+
+        Returns:
+            true if the turn was queued
+        """
+
+        last = self.turns[-1][0] if self.turns else current_direction
+        if direction is last or OPPOSITES[direction] is last:
+            return False
+        if len(self.turns) == self.capacity:
+            self.dropped += 1
+            return False
+        self.turns.append((direction, now))
+        return True
+
+    def pop(self):
+        """takes the oldest turn off the queue
+
+        Returns:
+            tuple of the direction and the time it was pressed, or None if the queue is empty
+        """
+
+        return self.turns.popleft() if self.turns else None
+
+    def clear(self):
+        """forgets every queued turn, for a new game"""
+
+        self.turns.clear()
@@ -0,0 +1,148 @@
+"""Opt-in timing of the game loop. Nothing here runs unless a TickStats is handed to a board, so it can stay in
+every build; with stats turned off the loop only pays for an `is None` check per frame
+"""
+
+from array import array
+
+# phases timed by the game loop and engine, in seconds
+SIMULATE = "simulate"
+FOOD = "food"
+DRAW = "draw"
+SCHEDULE = "schedule"
+# time from a key press to the move that makes its turn
+INPUT = "input"
+PHASES = (SIMULATE, FOOD, DRAW, SCHEDULE, INPUT)
+# histogram buckets are powers of two of this many seconds
+BUCKET_BASE = 1e-6
+BUCKET_COUNT = 24
+
+
+class RollingSamples:
+    """The most recent samples of one measurement, kept in a fixed size ring buffer"""
+
+    def __init__(self, capacity):
+        """creates an empty buffer
+
+        Args:
+            capacity (int) number of samples kept
+        """
+
+        self.samples = array("d", bytes(8 * capacity))
+        self.capacity = capacity
+        self.next = 0
+        self.count = 0
+        self.total_count = 0
+
+    def add(self, value):
+        """adds a sample, overwriting the oldest one once the buffer is full"""
+
+        self.samples[self.next] = value
+        self.next = (self.next + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+        self.total_count += 1
+
+    def summarize(self):
+        """describes the samples in the buffer
+
+        Returns:
+            dict with the count, mean, 50th/95th/99th percentiles and maximum, and a histogram listing how many
+            samples fall below BUCKET_BASE * 2 ** i for each i
+        """
+
+        values = sorted(self.samples[:self.count])
+        if not values:
+            return {"count": 0, "total_count": self.total_count}
+        histogram = [0] * BUCKET_COUNT
+        for value in values:
+            bucket = 0
+            limit = BUCKET_BASE
+            while value >= limit and bucket < BUCKET_COUNT - 1:
+                bucket += 1
+                limit *= 2
+            histogram[bucket] += 1
+        return {
+            "count": len(values),
+            "total_count": self.total_count,
+            "mean": sum(values) / len(values),
+            "p50": values[len(values) // 2],
+            "p95": values[min(len(values) - 1, len(values) * 95 // 100)],
+            "p99": values[min(len(values) - 1, len(values) * 99 // 100)],
+            "max": values[-1],
+            "histogram": histogram,
+        }
+
+
+class TickStats:
+    """Rolling timings of each phase of the game loop, plus the latest values of gauges such as ticks per second
+        and the number of canvas items
+    """
+
+    def __init__(self, capacity=1024):
+        """creates empty stats
+
+        Args:
+            capacity (int) number of recent samples kept for each phase
+        """
+
+        self.phases = {phase: RollingSamples(capacity) for phase in PHASES}
+        self.gauges = {}
+
+    def record(self, phase, seconds):
+        """adds a timing for a phase
+
+        Args:
+            phase (str) one of PHASES
+            seconds (float) how long it took
+        """
+
+        self.phases[phase].add(seconds)
+
+    def set_gauge(self, name, value):
+        """sets the current value of a gauge
+
+        Args:
+            name (str) what is measured
+            value (float) its current value
+        """
+
+        self.gauges[name] = value
+
+    def to_dict(self):
+        """summarizes every phase and gauge"""
+
+        return {"phases": {phase: samples.summarize() for (phase, samples) in self.phases.items()},
+                "gauges": dict(self.gauges)}
+
+    def save_json(self, path):
+        """writes to_dict to a JSON file
+
+        Args:
+            path (str) where to write it
+        """
+
+        # json and csv are only imported when saving, because the engine imports this module and headless
+        # games shouldn't pay for loading them
+        import json
+
+        with open(path, "w") as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+    def save_csv(self, path):
+        """writes one row per phase with its summary in milliseconds, then one row per gauge
+
+        Args:
+            path (str) where to write it
+        """
+
+        import csv
+
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["name", "count", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms", "value"])
+            for (phase, summary) in self.to_dict()["phases"].items():
+                if summary["count"]:
+                    writer.writerow([phase, summary["count"]] +
+                                    [summary[key] * 1000 for key in ("mean", "p50", "p95", "p99", "max")] + [""])
+            for (name, value) in self.gauges.items():
+                writer.writerow([name, "", "", "", "", "", "", value])
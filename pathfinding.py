@@ -0,0 +1,148 @@
+"""Breadth-first searches over a game's flat grid, for bots that need to know where the snake can still get to.
+
+A PathFinder owns every buffer a search needs, each with one entry per cell of its board: the queue, the parent
+and distance of every cell reached, and a stamp marking the cells the current search has reached. Each search
+takes a new stamp number instead of clearing the stamps, so a search allocates nothing, never touches the cells it
+doesn't reach, and stops as soon as it finds what it is looking for.
+
+Searches can be told when each snake cell was entered. The tail leaves the cells of the body in the order they were
+entered, one per move, so a search knows which of them will be empty by the time it gets there and can go through
+them.
+"""
+
+from engine import SNAKE
+
+neighbour_lists = {}
+
+
+def get_neighbour_lists(dimensions):
+    """gets a tuple of the cells next to each cell of a board, shared by every search on a board of the same size
+
+    Args:
+        dimensions (int) number of cells along each side of the board
+
+    Returns:
+        list indexed by cell of tuples of neighbouring cells
+    """
+
+    lists = neighbour_lists.get(dimensions)
+    if lists is None:
+        lists = neighbour_lists[dimensions] = []
+        for cell in range(dimensions * dimensions):
+            (row, col) = divmod(cell, dimensions)
+            neighbours = []
+            if row > 0:
+                neighbours.append(cell - dimensions)
+            if col < dimensions - 1:
+                neighbours.append(cell + 1)
+            if row < dimensions - 1:
+                neighbours.append(cell + dimensions)
+            if col > 0:
+                neighbours.append(cell - 1)
+            lists.append(tuple(neighbours))
+    return lists
+
+
+class PathFinder:
+    """Searches one board size. Cells holding SNAKE are walls, except for the cell a search is looking for and
+        the ones the tail will have left by the time the search reaches them. The parents and distances of the cells
+        reached stay readable until the next search
+    """
+
+    def __init__(self, dimensions):
+        """allocates the buffers for a board
+
+        Args:
+            dimensions (int) number of cells along each side of the board
+        """
+
+        area = dimensions * dimensions
+        self.dimensions = dimensions
+        self.neighbours = get_neighbour_lists(dimensions)
+        self.queue = [0] * area
+        self.parents = [0] * area
+        self.distances = [0] * area
+        self.stamps = [0] * area
+        self.stamp = 0
+        self.reached = 0
+
+    def search(self, grid, start, goal=-1, entered=None, base=0, limit=None):
+        """reaches out from start one distance at a time until the goal is found, limit cells have been reached or
+            there is nowhere left to go
+
+        Args:
+            grid (bytearray) cell contents, as in GameState.grid
+            start (int) cell to search from, whatever it holds
+            goal (int) cell to stop at, even if it holds SNAKE, or -1 to search everything reachable
+            entered (list) move count at which the head entered each snake cell, or None if every snake cell is a
+                wall
+            base (int) move count the search starts at minus the length of the snake, so a snake cell can be
+                moved into at distance d if it was entered at or before base + d
+            limit (int) number of cells reached, not counting start, after which to stop, or None
+
+        Returns:
+            distance from start to goal, or -1 if it wasn't reached. reached is set to the number of cells reached
+        """
+
+        self.stamp += 1
+        stamp = self.stamp
+        (queue, parents, distances, stamps, neighbours) = (self.queue, self.parents, self.distances, self.stamps,
+                                                            self.neighbours)
+        if limit is None:
+            limit = len(queue)
+        stamps[start] = stamp
+        distances[start] = 0
+        queue[0] = start
+        (first, end) = (0, 1)
+        while first < end:
+            cell = queue[first]
+            first += 1
+            distance = distances[cell] + 1
+            for neighbour in neighbours[cell]:
+                if stamps[neighbour] == stamp:
+                    continue
+                if neighbour == goal:
+                    stamps[neighbour] = stamp
+                    parents[neighbour] = cell
+                    distances[neighbour] = distance
+                    self.reached = end
+                    return distance
+                if grid[neighbour] == SNAKE:
+                    # left unstamped, as a longer path may get there after the tail has gone
+                    if entered is None or entered[neighbour] > base + distance:
+                        continue
+                stamps[neighbour] = stamp
+                parents[neighbour] = cell
+                distances[neighbour] = distance
+                queue[end] = neighbour
+                end += 1
+                if end > limit:
+                    self.reached = end - 1
+                    return -1
+        self.reached = end - 1
+        return -1
+
+    def is_reached(self, cell):
+        """checks whether the last search reached a cell"""
+
+        return self.stamps[cell] == self.stamp
+
+    def get_path(self, start, goal):
+        """lists the cells of the shortest path the last search found from start to goal
+
+        Args:
+            start (int) the cell the search started from
+            goal (int) a cell the search reached
+
+        Returns:
+            list of cells after start, ending with goal
+        """
+
+        path = []
+        parents = self.parents
+        cell = goal
+        while cell != start:
+            path.append(cell)
+            cell = parents[cell]
+        path.reverse()
+        return path
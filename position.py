@@ -0,0 +1,253 @@
+"""A compact copy of a game position for bots that search ahead. A Position follows exactly the same rules as a
+GameState, including where the food appears, but every move can be undone and copies are cheap, so a search can
+try a move, look further and take it back without touching the real game.
+
+The body is a ring buffer of cell indices rather than a deque, the random number generator is kept as its
+(immutable) state tuple, and a Position keeps a rolling hash of its body so positions can be looked up in a table.
+"""
+
+import random
+
+from direction import DIRECTIONS
+from engine import EMPTY, SNAKE, FOOD, MOVED, ATE, DIED, WON
+
+# the body hash treats the body as a number in base HASH_BASE, tail first, modulo the prime HASH_MODULUS
+HASH_MODULUS = (1 << 61) - 1
+HASH_BASE = 1000003
+
+# only used to draw food from a saved generator state, never holds state between calls
+sampler = random.Random()
+
+neighbour_tables = {}
+
+
+def get_neighbour_table(dimensions):
+    """gets the cell each direction leads to from every cell of a board, -1 where it leaves the board. Every
+        position on a board of the same size shares one, creating it the first time
+
+    Args:
+        dimensions (int) number of cells along each side of the board
+
+    Returns:
+        dict from Direction to a list indexed by cell
+    """
+
+    table = neighbour_tables.get(dimensions)
+    if table is None:
+        table = neighbour_tables[dimensions] = {}
+        for direction in DIRECTIONS:
+            (dx, dy) = direction.deltas
+            table[direction] = [(row + dy) * dimensions + col + dx
+                                if 0 <= row + dy < dimensions and 0 <= col + dx < dimensions else -1
+                                for row in range(dimensions) for col in range(dimensions)]
+    return table
+
+
+class Position:
+    """The grid, snake, food and random number generator of a game at one point. Copies made with clone share
+        their buffers with the original until either of them moves, so a copy costs O(1) until it is changed and
+        one O(board area) memory copy after that. apply and undo are O(1)
+    """
+
+    def __init__(self, dimensions, grid, ring, head_slot, length, cells, positions, free_count, food, rng_state,
+                 direction, moves):
+        """wraps the given buffers, which the new position owns. Use from_game or clone to make one
+
+        Args:
+            dimensions (int) number of cells along each side of the board
+            grid (bytearray) contents of each cell, as in GameState.grid
+            ring (list) ring buffer of board area size holding the body, head at head_slot and the rest following
+            head_slot (int) index of the head in ring
+            length (int) number of cells in the body
+            cells (list) the free cells and then the taken ones, as in FreeCellPool.cells
+            positions (list) where each cell is in cells, as in FreeCellPool.positions
+            free_count (int) number of free cells at the start of cells
+            food (int) cell of the food, or None
+            rng_state (tuple) state of the game's random.Random, used for the next piece of food
+            direction (Direction) direction of the last move, or None
+            moves (int) number of moves made to reach this position
+        """
+
+        self.dimensions = dimensions
+        self.area = dimensions * dimensions
+        self.grid = grid
+        self.ring = ring
+        self.head_slot = head_slot
+        self.length = length
+        self.cells = cells
+        self.positions = positions
+        self.free_count = free_count
+        self.food = food
+        self.rng_state = rng_state
+        self.direction = direction
+        self.moves = moves
+        self.neighbours = get_neighbour_table(dimensions)
+        self.shared = False
+        self.history = []
+
+        # weight of the tail in the body hash
+        self.power = pow(HASH_BASE, length - 1, HASH_MODULUS)
+        self.body_hash = 0
+        for cell in reversed(list(self.body())):
+            self.body_hash = (self.body_hash * HASH_BASE + cell + 1) % HASH_MODULUS
+
+    @classmethod
+    def from_game(cls, game):
+        """copies the current position of a game
+
+        Args:
+            game (GameState) the game to copy
+        """
+
+        area = game.dimensions * game.dimensions
+        ring = [0] * area
+        for (i, cell) in enumerate(game.snake.body):
+            ring[i] = cell
+        return cls(game.dimensions, bytearray(game.grid), ring, 0, len(game.snake.body), list(game.free_cells.cells),
+                   list(game.free_cells.positions), game.free_cells.count, game.food, game.rng.getstate(),
+                   game.direction, game.moves)
+
+    def clone(self):
+        """makes a copy that can be moved independently. Nothing is copied until one of the two moves, and the copy
+            starts with no moves to undo
+        """
+
+        copy = Position.__new__(Position)
+        copy.__dict__.update(self.__dict__)
+        copy.history = []
+        copy.shared = self.shared = True
+        return copy
+
+    def unshare(self):
+        """takes private copies of the buffers shared with clones, before they are changed"""
+
+        self.grid = bytearray(self.grid)
+        self.ring = self.ring[:]
+        self.cells = self.cells[:]
+        self.positions = self.positions[:]
+        self.shared = False
+
+    def body(self):
+        """iterates over the body's cells from head to tail"""
+
+        (ring, area) = (self.ring, self.area)
+        for i in range(self.head_slot, self.head_slot + self.length):
+            yield ring[i % area]
+
+    def get_head(self):
+        """return the index of the current head of the snake"""
+
+        return self.ring[self.head_slot]
+
+    def get_tail(self):
+        """return the index of the current tail of the snake"""
+
+        return self.ring[(self.head_slot + self.length - 1) % self.area]
+
+    def key(self):
+        """a hash of the snake's body and the food, equal for equal positions whatever moves led to them"""
+
+        return hash((self.body_hash, self.food))
+
+    def apply(self, direction):
+        """moves the snake a single time, following the same rules as GameState.step
+
+        Args:
+            direction (Direction) the direction the head moves in
+
+        Returns:
+            one of MOVED, ATE, DIED or WON. The position doesn't change on DIED, so there is nothing to undo
+        """
+
+        ring = self.ring
+        area = self.area
+        new_cell = self.neighbours[direction][ring[self.head_slot]]
+        if new_cell < 0:
+            return DIED
+        tail_slot = (self.head_slot + self.length - 1) % area
+        tail = ring[tail_slot]
+        contents = self.grid[new_cell]
+        if contents == SNAKE and new_cell != tail:
+            return DIED
+
+        if self.shared:
+            self.unshare()
+            ring = self.ring
+        (grid, cells, positions) = (self.grid, self.cells, self.positions)
+        ate = contents == FOOD
+        free_count = self.free_count
+        old_hash = self.body_hash
+
+        tail_position = None
+        if ate:
+            self.length += 1
+            self.power = self.power * HASH_BASE % HASH_MODULUS
+        else:
+            # free the tail first, so the head may move into the cell it just left
+            grid[tail] = EMPTY
+            old_hash -= (tail + 1) * self.power
+            (i, j) = (positions[tail], free_count)
+            (a, b) = (cells[i], cells[j])
+            (cells[i], cells[j], positions[b], positions[a]) = (b, a, i, j)
+            free_count += 1
+            tail_position = i
+        free_count -= 1
+        (i, j) = (positions[new_cell], free_count)
+        (a, b) = (cells[i], cells[j])
+        (cells[i], cells[j], positions[b], positions[a]) = (b, a, i, j)
+        self.free_count = free_count
+        grid[new_cell] = SNAKE
+        head_slot = self.head_slot = (self.head_slot - 1) % area
+        ring[head_slot] = new_cell
+
+        # everything needed to put the position back. The tail is kept because the ring slot it was in can be
+        # reused by later heads, and the free cell pool is restored by repeating its swaps in reverse, so the
+        # positions the tail and new head were swapped from are kept too
+        self.history.append((new_cell, ate, tail, self.direction, self.body_hash, self.food, self.rng_state, i,
+                             tail_position))
+        self.body_hash = (old_hash * HASH_BASE + new_cell + 1) % HASH_MODULUS
+        self.direction = direction
+        self.moves += 1
+
+        if not ate:
+            return MOVED
+        self.food = None
+        if self.length == area:
+            return WON
+        if self.free_count > 0:
+            sampler.setstate(self.rng_state)
+            self.food = cells[sampler.randrange(self.free_count)]
+            grid[self.food] = FOOD
+            self.rng_state = sampler.getstate()
+        return ATE
+
+    def undo(self):
+        """takes back the last move applied since this position was made or cloned"""
+
+        if self.shared:
+            self.unshare()
+        (new_cell, ate, tail, self.direction, self.body_hash, old_food, self.rng_state, new_position,
+         tail_position) = self.history.pop()
+        (grid, cells, positions) = (self.grid, self.cells, self.positions)
+        if ate and self.food is not None:
+            grid[self.food] = EMPTY
+        self.food = old_food
+        self.moves -= 1
+        self.head_slot = (self.head_slot + 1) % self.area
+
+        # swapping the same two positions again undoes a swap, so the pool ends up in exactly its old order
+        (i, j) = (new_position, self.free_count)
+        (a, b) = (cells[i], cells[j])
+        (cells[i], cells[j], positions[b], positions[a]) = (b, a, i, j)
+        self.free_count += 1
+        grid[new_cell] = FOOD if ate else EMPTY
+        if ate:
+            self.length -= 1
+            self.power = pow(HASH_BASE, self.length - 1, HASH_MODULUS)
+        else:
+            self.free_count -= 1
+            self.ring[(self.head_slot + self.length - 1) % self.area] = tail
+            (i, j) = (tail_position, self.free_count)
+            (a, b) = (cells[i], cells[j])
+            (cells[i], cells[j], positions[b], positions[a]) = (b, a, i, j)
+            grid[tail] = SNAKE
@@ -0,0 +1,214 @@
+"""A stand-in for tkinter's Canvas that needs no display, so boards and renderers can be timed on machines without
+one. It records the items drawn on it and counts every call, and runs after() callbacks on a virtual clock rather
+than from an event loop.
+
+A board draws on it through make_recording_board, which puts RecordingCanvas between the board and Canvas:
+    board = make_recording_board(BotBoard)(score_label={"text": ""}, bot_class=Snakebot)
+    board.start_bot()
+    while board.run_next():
+        pass
+tkinter has to be importable, but no Tk window is ever made.
+"""
+
+import heapq
+from tkinter import Canvas, NW
+
+# stands in for the board's images, which can only be made once a Tk window exists
+PLACEHOLDER_IMAGE = "image"
+
+
+class RecordingCanvas(Canvas):
+    """Keeps the kind, coordinates and options of every item in shapes, and how many times each method was called
+        in calls. after() queues callbacks by due time, and run_next moves the clock forward to the earliest one and
+        runs it
+    """
+
+    def __init__(self, master=None, cnf=None, **kwargs):
+        """makes an empty canvas. Takes the same arguments as Canvas, which are kept in options
+
+        Args:
+            master (widget) ignored, there is no window to belong to
+            cnf (dict) options for the canvas
+            **kwargs (arg list) more options for the canvas
+        """
+
+        # Canvas.__init__ would need a Tk window, so it is never called
+        self.master = master
+        self.children = {}
+        self._w = "!recordingcanvas"
+        self.options = dict(cnf or {}, **kwargs)
+        self.shapes = {}
+        self.last_id = 0
+        self.calls = {}
+        self.time = 0.0
+        self.scheduled = []
+        self.cancelled = set()
+        self.last_after = 0
+
+    def count(self, name):
+        """adds a call of a method to calls"""
+
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def create(self, kind, args, options):
+        """adds an item, returning its id"""
+
+        self.count("create_" + kind)
+        self.last_id += 1
+        self.shapes[self.last_id] = [kind, flatten(args), options]
+        return self.last_id
+
+    def create_arc(self, *args, **kwargs):
+        return self.create("arc", args, kwargs)
+
+    def create_image(self, *args, **kwargs):
+        return self.create("image", args, kwargs)
+
+    def create_line(self, *args, **kwargs):
+        return self.create("line", args, kwargs)
+
+    def create_oval(self, *args, **kwargs):
+        return self.create("oval", args, kwargs)
+
+    def create_polygon(self, *args, **kwargs):
+        return self.create("polygon", args, kwargs)
+
+    def create_rectangle(self, *args, **kwargs):
+        return self.create("rectangle", args, kwargs)
+
+    def create_text(self, *args, **kwargs):
+        return self.create("text", args, kwargs)
+
+    def coords(self, item, *args):
+        """moves an item if given coordinates, and returns its coordinates"""
+
+        self.count("coords")
+        shape = self.shapes[item]
+        if args:
+            shape[1] = flatten(args)
+        return list(shape[1])
+
+    def itemconfigure(self, item, cnf=None, **kwargs):
+        """updates the options of an item"""
+
+        self.count("itemconfigure")
+        self.shapes[item][2].update(cnf or {}, **kwargs)
+
+    itemconfig = itemconfigure
+
+    def delete(self, *items):
+        """removes items, or every item if one of them is "all" """
+
+        self.count("delete")
+        for item in items:
+            if item == "all":
+                self.shapes.clear()
+            else:
+                self.shapes.pop(item, None)
+
+    def find_all(self):
+        self.count("find_all")
+        return tuple(self.shapes)
+
+    def tag_raise(self, *args):
+        self.count("tag_raise")
+
+    def tag_lower(self, *args):
+        self.count("tag_lower")
+
+    def pack(self, *args, **kwargs):
+        self.count("pack")
+
+    def bind_all(self, *args, **kwargs):
+        self.count("bind_all")
+
+    def focus_set(self):
+        self.count("focus_set")
+
+    def cget(self, key):
+        return self.options[key]
+
+    __getitem__ = cget
+
+    def configure(self, cnf=None, **kwargs):
+        self.options.update(cnf or {}, **kwargs)
+
+    config = configure
+
+    def __setitem__(self, key, value):
+        self.options[key] = value
+
+    def after(self, ms, func=None, *args):
+        """queues a call to func once the clock has gone forward ms milliseconds
+
+        Returns:
+            id that after_cancel takes
+        """
+
+        self.count("after")
+        self.last_after += 1
+        heapq.heappush(self.scheduled, (self.time + ms / 1000, self.last_after, func, args))
+        return self.last_after
+
+    def after_cancel(self, after_id):
+        self.count("after_cancel")
+        self.cancelled.add(after_id)
+
+    def after_idle(self, func, *args):
+        return self.after(0, func, *args)
+
+    def clock(self):
+        """gets the virtual time in seconds, which only moves when run_next runs a callback"""
+
+        return self.time
+
+    def run_next(self):
+        """moves the clock to the earliest queued callback and runs it
+
+        Returns:
+            false if nothing was queued
+        """
+
+        while self.scheduled:
+            (due, after_id, func, args) = heapq.heappop(self.scheduled)
+            if after_id in self.cancelled:
+                self.cancelled.discard(after_id)
+                continue
+            self.time = max(self.time, due)
+            if func is not None:
+                func(*args)
+            return True
+        return False
+
+
+def flatten(coords):
+    """turns coordinates given as separate numbers, tuples or lists of them into one tuple"""
+
+    if len(coords) == 1 and isinstance(coords[0], (tuple, list)):
+        return tuple(coords[0])
+    return coords
+
+
+def make_recording_board(board_class):
+    """makes a subclass of Board, or of one of its subclasses, that draws on a RecordingCanvas. The background and
+        food are drawn with PLACEHOLDER_IMAGE, and score_label can be any dict with a "text" key
+
+    Args:
+        board_class (class) Board or a subclass of it
+
+    Returns:
+        the new class, taking the same arguments as board_class
+    """
+
+    class RecordingBoard(board_class, RecordingCanvas):
+
+        def draw_all_cells(self):
+            # Overridden from Board
+            self.create_image(0, 0, image=PLACEHOLDER_IMAGE, anchor=NW)
+
+        def initialize_food_img(self):
+            # Overridden from Board
+            self.tk_img = PLACEHOLDER_IMAGE
+
+    RecordingBoard.__name__ = RecordingBoard.__qualname__ = "Recording" + board_class.__name__
+    return RecordingBoard
@@ -0,0 +1,169 @@
+"""Incremental drawing of a GameState onto a tkinter canvas"""
+
+from collections import deque
+from tkinter import ARC, NW, HIDDEN, NORMAL
+
+from cell import Cell
+from direction import direction_between
+
+
+class CanvasRenderer:
+    """Draws a game onto a canvas with a fixed set of items for the head, tail and food, plus one rectangle per
+        body cell. After each move only the items for the cells that changed (old and new head, old and new tail,
+        food) are moved with coords/itemconfig, so the canvas doesn't create and delete items every tick. Any number
+        of moves can happen between updates, in which case only the cells that changed over all of them are touched
+    """
+
+    def __init__(self, canvas, geometry, food_image, snake_color, outline_color):
+        """sets up a renderer for a board. Call reset before drawing a game
+
+        Args:
+            canvas (Canvas) the canvas to draw on
+            geometry (CellGeometry) the shapes for cells of the size being drawn
+            food_image (PhotoImage) the image drawn for food
+            snake_color (str) fill color of the snake
+            outline_color (str) outline color of body squares and the tail
+        """
+
+        self.canvas = canvas
+        self.geometry = geometry
+        self.food_image = food_image
+        self.snake_color = snake_color
+        self.outline_color = outline_color
+
+    def reset(self, game):
+        """creates the item pool and draws the game as it is. Must be called after the canvas is cleared
+
+        Args:
+            game (GameState) the game to draw
+        """
+
+        self.game = game
+        self.create_items()
+        self.drawn_moves = game.moves
+        body = game.snake.body
+        self.head_cell = body[0]
+        self.draw_body()
+        self.draw_head()
+        if len(body) > 1:
+            self.draw_tail(body[-1], body[-2])
+        self.draw_food()
+
+    def create_items(self):
+        """creates the items that are moved around rather than created for each cell"""
+
+        canvas = self.canvas
+        # coordinates are placeholders until the items are first moved into place
+        self.head_rectangle = canvas.create_rectangle(0, 0, 0, 0, fill=self.snake_color, outline="")
+        self.head_arc = canvas.create_arc(0, 0, 0, 0, fill=self.snake_color, extent=180, outline="")
+        self.eyes = (canvas.create_oval(0, 0, 0, 0, fill="black"), canvas.create_oval(0, 0, 0, 0, fill="black"))
+        radius = self.geometry.eye_radius
+        self.mouth = canvas.create_arc(0, 0, 0, 0, fill="black", extent=120, width=radius * 1.5, style=ARC)
+        self.tail = canvas.create_polygon(0, 0, 0, 0, 0, 0, fill=self.snake_color, outline=self.outline_color,
+                                          state=HIDDEN)
+        self.food = canvas.create_image(0, 0, image=self.food_image, anchor=NW, state=HIDDEN)
+        # (cell, rectangle) for every body cell between the head and tail, in the same order as the snake's body
+        self.body_items = deque()
+
+    def draw_body(self):
+        """creates a square for every body cell between the head and tail"""
+
+        body = self.game.snake.body
+        for i in range(1, len(body) - 1):
+            coords = self.get_cell(body[i]).get_coords()
+            rectangle = self.canvas.create_rectangle(coords, fill=self.snake_color, outline=self.outline_color)
+            self.body_items.append((body[i], rectangle))
+
+    def get_cell(self, index):
+        """makes the Cell used to draw the given cell index. Cells are cheap and only made when something is drawn,
+            so there is nothing kept per cell of the board
+
+        Args:
+            index (int) flat index of the cell in the game's grid
+        """
+
+        return Cell(divmod(index, self.game.dimensions), self.geometry)
+
+    def is_visible(self, index):
+        """checks whether a cell is on the canvas (always true here, the whole board is drawn)
+
+        Args:
+            index (int) flat index of the cell in the game's grid
+        """
+
+        return True
+
+    def update(self):
+        """moves the items for the cells that changed in the steps of the game since the last update"""
+
+        game = self.game
+        steps = game.moves - self.drawn_moves
+        if steps == 0:
+            return
+        self.drawn_moves = game.moves
+        body = game.snake.body
+        self.head_cell = body[0]
+
+        # after n steps the first n cells behind the head are new, and the rest of the body is the front part of
+        # what was drawn before, so squares come off the back and are reused for the new cells at the front
+        inner_size = max(len(body) - 2, 0)
+        new_cells = min(steps, inner_size)
+        spare = []
+        while len(self.body_items) > inner_size - new_cells:
+            spare.append(self.body_items.pop()[1])
+        for i in range(new_cells, 0, -1):
+            coords = self.get_cell(body[i]).get_coords()
+            if spare:
+                rectangle = spare.pop()
+                self.canvas.coords(rectangle, coords)
+            else:
+                rectangle = self.canvas.create_rectangle(coords, fill=self.snake_color, outline=self.outline_color)
+            self.body_items.appendleft((body[i], rectangle))
+        for rectangle in spare:
+            self.canvas.delete(rectangle)
+
+        self.draw_head()
+        if len(body) > 1:
+            self.draw_tail(body[-1], body[-2])
+        if game.food != self.food_cell:
+            self.draw_food()
+
+    def draw_head(self):
+        """moves the head items to the head cell, facing the direction of the last move"""
+
+        canvas = self.canvas
+        cell = self.get_cell(self.head_cell)
+        (rectangle_coords, start_angle, eyes, mouth_start_angle) = cell.get_head_geometry(self.game.direction)
+        canvas.coords(self.head_rectangle, rectangle_coords)
+        canvas.coords(self.head_arc, cell.get_coords())
+        canvas.itemconfig(self.head_arc, start=start_angle)
+        for (eye, container) in zip(self.eyes, eyes):
+            canvas.coords(eye, container)
+        canvas.coords(self.mouth, cell.get_smiley_face_box())
+        canvas.itemconfig(self.mouth, start=mouth_start_angle)
+
+    def draw_tail(self, tail_cell, next_cell):
+        """moves the tail polygon to the tail cell, pointing away from the next body cell
+
+        Args:
+            tail_cell (int) index of the tail
+            next_cell (int) index of the body cell in front of the tail
+        """
+
+        if not self.is_visible(tail_cell):
+            self.canvas.itemconfig(self.tail, state=HIDDEN)
+            return
+        direction = direction_between(tail_cell, next_cell, self.game.dimensions)
+        self.canvas.coords(self.tail, self.get_cell(tail_cell).get_tail_coords(direction))
+        self.canvas.itemconfig(self.tail, state=NORMAL)
+
+    def draw_food(self):
+        """moves the food image to the game's food, hiding it if there is none or it isn't on the canvas"""
+
+        self.food_cell = self.game.food
+        if self.food_cell is None or not self.is_visible(self.food_cell):
+            self.canvas.itemconfig(self.food, state=HIDDEN)
+            return
+        (x1, y1, x2, y2) = self.get_cell(self.food_cell).get_coords()
+        self.canvas.coords(self.food, x1, y1)
+        self.canvas.itemconfig(self.food, state=NORMAL)
@@ -0,0 +1,297 @@
+"""Recording games and playing them back.
+
+A replay holds the board size, the game's seed, every move as 2 bits and the cell of every piece of food in the
+order it appeared. Moves are split into chunks of CHUNK_MOVES, each starting with a snapshot of the position (the
+snake as a head cell plus 2 bits per segment, the food and the move count) and compressed on its own, so seeking
+to any move only decompresses one chunk and replays at most CHUNK_MOVES moves from its snapshot. The header says how
+the game ended, and a lost game keeps the move the snake died making after its last move, so playing it back ends
+in DIED.
+
+File layout (little endian):
+    header      magic, version, dimensions, seed, total moves, chunk moves, chunk count, outcome
+    foods       length, then zlib compressed uint32 cells
+    offsets     uint64 file offset of each chunk
+    chunks      length, then zlib compressed snapshot followed by packed moves
+"""
+
+import struct
+import zlib
+from array import array
+
+from direction import DIRECTIONS, DIRECTION_INDEXES, direction_between
+from engine import GameState, ATE, DIED, WON
+
+MAGIC = b"SNKR"
+VERSION = 2
+CHUNK_MOVES = 4096
+HEADER = struct.Struct("<4sBIQQIIB")
+SNAPSHOT = struct.Struct("<QIIiB")
+LENGTH = struct.Struct("<I")
+NO_DIRECTION = 255
+# how the recorded game ended, stored as the index in this tuple. None if it was stopped before it ended
+OUTCOMES = (None, DIED, WON)
+
+
+def pack_2bit(values):
+    """packs integers from 0 to 3 four to a byte, first value in the lowest bits"""
+
+    packed = bytearray((len(values) + 3) // 4)
+    for (i, value) in enumerate(values):
+        packed[i >> 2] |= value << ((i & 3) << 1)
+    return packed
+
+
+def unpack_2bit(packed, count):
+    """inverse of pack_2bit"""
+
+    return [(packed[i >> 2] >> ((i & 3) << 1)) & 3 for i in range(count)]
+
+
+def encode_snapshot(game, food_index):
+    """describes the position of a game compactly
+
+    Args:
+        game (GameState) the game
+        food_index (int) how many pieces of food had appeared before the current one
+
+    Returns:
+        bytes holding the position
+    """
+
+    body = game.snake.body
+    dimensions = game.dimensions
+    food = game.food if game.food is not None else -1
+    direction = DIRECTION_INDEXES[game.direction] if game.direction is not None else NO_DIRECTION
+    header = SNAPSHOT.pack(game.moves, food_index, len(body), food, direction)
+    # each segment is stored as the direction leading to it from the one in front
+    steps = []
+    previous = None
+    for cell in body:
+        if previous is not None:
+            steps.append(DIRECTION_INDEXES[direction_between(previous, cell, dimensions)])
+        previous = cell
+    return header + LENGTH.pack(body[0]) + pack_2bit(steps)
+
+
+def decode_snapshot(data, dimensions):
+    """inverse of encode_snapshot
+
+    Returns:
+        tuple of (moves, food index, body, food, direction, size of the snapshot in bytes)
+    """
+
+    (moves, food_index, length, food, direction) = SNAPSHOT.unpack_from(data)
+    (head,) = LENGTH.unpack_from(data, SNAPSHOT.size)
+    start = SNAPSHOT.size + LENGTH.size
+    end = start + (length + 2) // 4
+    body = [head]
+    deltas = [dimensions * direction.get_deltas()[1] + direction.get_deltas()[0] for direction in DIRECTIONS]
+    for step in unpack_2bit(data[start:end], length - 1):
+        body.append(body[-1] + deltas[step])
+    return (moves, food_index, body, None if food < 0 else food,
+            None if direction == NO_DIRECTION else DIRECTIONS[direction], end)
+
+
+class ReplayRecorder:
+    """Records a game as it is played. Call record after every step of the game"""
+
+    def __init__(self, game, chunk_moves=CHUNK_MOVES):
+        """starts recording a game that hasn't been played yet
+
+        Args:
+            game (GameState) the game to record
+            chunk_moves (int) moves between snapshots, a multiple of 4
+        """
+
+        self.game = game
+        self.chunk_moves = chunk_moves
+        self.moves = bytearray()
+        self.move_count = 0
+        self.foods = array("I")
+        if game.food is not None:
+            self.foods.append(game.food)
+        self.snapshots = [encode_snapshot(game, 0)]
+        self.outcome = None
+
+    def record(self, direction, outcome):
+        """records a move just made
+
+        Args:
+            direction (Direction) the direction the game was stepped in
+            outcome (str) what step returned
+        """
+
+        count = self.move_count
+        if count & 3 == 0:
+            self.moves.append(DIRECTION_INDEXES[direction])
+        else:
+            self.moves[-1] |= DIRECTION_INDEXES[direction] << ((count & 3) << 1)
+        if outcome == DIED:
+            # the fatal move doesn't count as a move of the game, so it's packed after the last one but left out of
+            # move_count, and playing it back is how a replay ends
+            self.outcome = DIED
+            return
+        self.move_count = count + 1
+        if outcome == WON:
+            self.outcome = WON
+        if outcome == ATE:
+            self.foods.append(self.game.food)
+        if self.move_count % self.chunk_moves == 0 and outcome != WON:
+            self.snapshots.append(encode_snapshot(self.game, len(self.foods) - 1))
+
+    def save(self, path):
+        """writes the replay to a file
+
+        Args:
+            path (str) where to write it
+        """
+
+        with open(path, "wb") as file:
+            file.write(self.to_bytes())
+
+    def to_bytes(self):
+        """encodes the replay in the file format described at the top of this module"""
+
+        chunk_bytes = self.chunk_moves // 4
+        chunks = []
+        for (i, snapshot) in enumerate(self.snapshots):
+            chunks.append(zlib.compress(snapshot + self.moves[i * chunk_bytes:(i + 1) * chunk_bytes]))
+        foods = zlib.compress(self.foods.tobytes())
+
+        header = HEADER.pack(MAGIC, VERSION, self.game.dimensions, self.game.seed, self.move_count,
+                             self.chunk_moves, len(chunks), OUTCOMES.index(self.outcome))
+        offset = len(header) + LENGTH.size + len(foods) + 8 * len(chunks)
+        offsets = array("Q")
+        for chunk in chunks:
+            offsets.append(offset)
+            offset += LENGTH.size + len(chunk)
+        parts = [header, LENGTH.pack(len(foods)), foods, offsets.tobytes()]
+        for chunk in chunks:
+            parts.append(LENGTH.pack(len(chunk)))
+            parts.append(chunk)
+        return b"".join(parts)
+
+
+class Replay:
+    """A recorded game read back from a file. Chunks are decompressed when they are first needed"""
+
+    def __init__(self, data):
+        """reads a replay
+
+        Args:
+            data (bytes) the contents of a replay file
+        """
+
+        (magic, version, self.dimensions, self.seed, self.moves, self.chunk_moves, chunk_count, outcome) = \
+            HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a version %d snake replay" % VERSION)
+        self.outcome = OUTCOMES[outcome]
+        position = HEADER.size
+        (foods_length,) = LENGTH.unpack_from(data, position)
+        position += LENGTH.size
+        self.foods = array("I", zlib.decompress(data[position:position + foods_length]))
+        position += foods_length
+        self.offsets = array("Q", data[position:position + 8 * chunk_count])
+        self.data = data
+        self.cached_chunk = None
+
+    @classmethod
+    def load(cls, path):
+        """reads a replay from a file
+
+        Args:
+            path (str) the file to read
+        """
+
+        with open(path, "rb") as file:
+            return cls(file.read())
+
+    def get_chunk(self, index):
+        """decompresses a chunk, keeping the last one used
+
+        Returns:
+            tuple of (snapshot, packed moves) where snapshot is what decode_snapshot returns
+        """
+
+        if self.cached_chunk is None or self.cached_chunk[0] != index:
+            offset = self.offsets[index]
+            (length,) = LENGTH.unpack_from(self.data, offset)
+            chunk = zlib.decompress(self.data[offset + LENGTH.size:offset + LENGTH.size + length])
+            snapshot = decode_snapshot(chunk, self.dimensions)
+            self.cached_chunk = (index, snapshot, chunk[snapshot[-1]:])
+        return self.cached_chunk[1:]
+
+    def get_direction(self, move):
+        """gets the direction of the given move, counting from 0"""
+
+        (snapshot, moves) = self.get_chunk(move // self.chunk_moves)
+        i = move % self.chunk_moves
+        return DIRECTIONS[(moves[i >> 2] >> ((i & 3) << 1)) & 3]
+
+
+class ReplayPlayer:
+    """Steps a GameState through a replay, placing food where it appeared in the recorded game"""
+
+    def __init__(self, replay):
+        """starts at the beginning of a replay
+
+        Args:
+            replay (Replay) the replay to play
+        """
+
+        self.replay = replay
+        self.seek(0)
+
+    def seek(self, move):
+        """jumps to the position after the given number of moves, restoring the nearest snapshot before it and
+            replaying the rest
+
+        Args:
+            move (int) number of moves from the start, at most replay.moves
+        """
+
+        replay = self.replay
+        move = max(0, min(move, replay.moves))
+        (snapshot, moves) = replay.get_chunk(min(move // replay.chunk_moves, len(replay.offsets) - 1))
+        (start, food_index, body, food, direction, size) = snapshot
+        self.game = GameState(replay.dimensions, replay.seed)
+        self.game.restore(body, food, direction, start)
+        self.food_index = food_index
+        self.fast_forward(move - start)
+
+    def step(self):
+        """plays the next move
+
+        Returns:
+            what GameState.step returned, or None if the replay is over
+        """
+
+        game = self.game
+        if game.over:
+            return None
+        if game.moves >= self.replay.moves:
+            if self.replay.outcome != DIED:
+                return None
+            # plays the move the snake died making, which was recorded after the last move
+            return game.step(self.replay.get_direction(game.moves))
+        outcome = game.step(self.replay.get_direction(game.moves))
+        if outcome == ATE:
+            self.food_index += 1
+            game.place_food(self.replay.foods[self.food_index])
+        return outcome
+
+    def fast_forward(self, moves):
+        """plays the given number of moves, or until the replay ends
+
+        Returns:
+            the outcome of the last move played
+        """
+
+        outcome = None
+        for _ in range(moves):
+            next_outcome = self.step()
+            if next_outcome is None:
+                break
+            outcome = next_outcome
+        return outcome
@@ -0,0 +1,79 @@
+import board
+from engine import MOVED, ATE
+from replay import ReplayPlayer
+
+# moves skipped by each press of the left or right arrow key
+SEEK_MOVES = 1000
+
+
+class ReplayBoard(board.Board):
+    """Plays a recorded game back. Space starts and pauses it, the left and right arrow keys seek"""
+
+    def __init__(self, parent=None, replay=None, **kwargs):
+        """constructs a board showing the start of a replay
+
+        Args:
+            parent (widget) the frame/window this canvas belongs to
+            replay (Replay) the recorded game to play
+            **kwargs (arg list) other optional arguments for Board
+        """
+
+        self.player = ReplayPlayer(replay)
+        board.Board.__init__(self, parent, board_config=board.BoardConfig(replay.dimensions), **kwargs)
+
+    def new_game(self):
+        # Overridden from Board, the replay is rewound instead of starting a new game
+        self.player.seek(0)
+        self.game = self.player.game
+
+    def move_snake(self):
+        # Overridden from Board
+        self.outcome = self.player.step()
+        return self.outcome in (MOVED, ATE)
+
+    def seek(self, move):
+        """shows the position after the given number of moves
+
+        Args:
+            move (int) number of moves from the start of the replay
+        """
+
+        running = self.loop.running
+        self.loop.stop()
+        self.player.seek(move)
+        self.game = self.player.game
+        self.outcome = None
+        self.delete("all")
+        self.draw_all_cells()
+        self.renderer.reset(self.game)
+        self.render()
+        if running:
+            self.loop.start()
+
+    def change_direction(self, event):
+        """controls playback with the keyboard
+
+        Args:
+            event (keyboard press) the event triggered when user presses a key
+        """
+
+        # Overridden from Board
+        if event.keysym == "space":
+            if self.loop.running:
+                self.loop.stop()
+            else:
+                self.loop.start()
+        elif event.keysym == "Right":
+            self.seek(self.game.moves + SEEK_MOVES)
+        elif event.keysym == "Left":
+            self.seek(self.game.moves - SEEK_MOVES)
+
+    def handle_dimension_change(self, event):
+        """prints an error message because a replay's board size can't change
+
+        Args:
+            event (submission) submission event triggered when user presses enter from inside the entry field
+        """
+
+        # Overridden from Board
+        print("Can't change dimensions while watching a replay")
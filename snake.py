@@ -1,61 +1,63 @@
+from collections import deque
+
+
 class Snake:
-    """Represents the player's snake in a given game. Resets at the start of a new game"""
+    """Represents the player's snake in a given game. Resets at the start of a new game. The body is a deque of
+        cell indices (row * dimensions + col) with the head on the left, so a move is O(1) regardless of length
+    """
 
-    def __init__(self, board, initial_cell, score_label, empty_cells):
+    def __init__(self, initial_cell, free_cells):
         """initializes the snake
 
         Args:
-            board (Board) the board this snake belongs to
-            initial_cell (Cell) the cell to become the head
-            score_label (tkinter.Label) the label that reports snake size
-            empty_cells (set) a set containing cells that are currently empty, i.e. those that can have food rendered
+            initial_cell (int) index of the cell to become the head
+            free_cells (FreeCellPool) the cells not covered by the snake, i.e. those that can have food placed
         """
 
-        self.board = board
-        self.score_label = score_label
-        self.empty_cells = empty_cells
-        self.body = []
-        initial_cell.set_type("HEAD").draw()
-        self.body.insert(0, initial_cell)
-        self.empty_cells.remove(initial_cell)
+        self.free_cells = free_cells
+        self.body = deque((initial_cell,))
+        self.free_cells.remove(initial_cell)
 
-    def move(self, next_cell, direction):
+    def move(self, next_cell, grow):
         """completes a single move for the snake
 
         Args:
-            next_cell(Cell) the cell the head is trying to move into
-            direciton(Direction) the direction the head is facing as it enters next_cell
+            next_cell (int) index of the cell the head is moving into
+            grow (bool) whether the snake ate food this move, in which case the tail stays put
+
+        Returns:
+            the index of the tail cell that was vacated, or None if the snake grew
         """
 
-        # reference the previous head because we'll need to turn it into a body part or tail later
-        prev_head = self.body[0]
-        # insert the new head at the start of the list and remove it from the set of empty cells
-        self.body.insert(0, next_cell)
-        if next_cell.get_type() == "SNAKE":
-            self.board.game_over = True
-            return
-        if next_cell in self.empty_cells:
-            self.empty_cells.remove(next_cell)
-        if next_cell.get_type() == "FOOD":
-            # update score label if we found food and leave the tail the same
-            self.score_label["text"] = "Score: " + str(len(self.body))
-        else:
-            # otherwise, we need to remove the tail and add it to the set of empty cells
+        prev_tail = None
+        if not grow:
+            # the tail moves first, so the head may move into the cell it just left
             prev_tail = self.body.pop()
-            self.empty_cells.add(prev_tail)
-            prev_tail.set_type("EMPTY").delete_drawing()
-        # make the new cell the head and draw it
-        next_cell.set_type("HEAD").set_direction(direction).draw()
-        if len(self.body) > 1:
-            self.body[len(self.body) - 1].set_type("TAIL").draw()
-        if len(self.body) > 2:
-            # if it's longer than 2, the previous head is now a body part
-            prev_head.set_type("SNAKE").draw()
+            self.free_cells.add(prev_tail)
+        # push the new head onto the front of the body and take it out of the free cells
+        self.body.appendleft(next_cell)
+        self.free_cells.remove(next_cell)
+        return prev_tail
+
+    def grow_tail(self, cell):
+        """adds a cell behind the tail, used to rebuild a saved snake
+
+        Args:
+            cell (int) index of a free cell next to the current tail
+        """
+
+        self.body.append(cell)
+        self.free_cells.remove(cell)
 
     def get_head(self):
-        """return the current head of the snake"""
+        """return the index of the current head of the snake"""
 
         return self.body[0]
 
+    def get_tail(self):
+        """return the index of the current tail of the snake"""
+
+        return self.body[-1]
+
     def size(self):
         return len(self.body)
@@ -0,0 +1,203 @@
+"""A reinforcement learning environment around GameState, with the usual reset() and step(action) returning
+(observation, reward, done, info). Actions are the Direction objects, or their indexes in direction.DIRECTIONS.
+Requires numpy
+
+Observations are read-only NumPy views that are never copied:
+    grid        the game's own grid bytearray viewed as (dimensions, dimensions) uint8 EMPTY, SNAKE or FOOD
+    channels    (3, dimensions, dimensions) uint8, one plane each for the head, body (including the head) and food
+    crop        a crop x crop square centred on the head of either of the above, with cells off the board marked
+                WALL in the grid, or in a fourth plane of the channels
+
+The grid view is the engine's buffer itself. Channels and crops are views of a padded buffer owned by the
+environment, which each step updates in place by writing only the cells the move changed. Either way the array
+returned by step changes on the next step, so copy it to keep it.
+"""
+
+import operator
+import random
+
+import numpy as np
+
+from direction import Direction, DIRECTIONS
+from engine import GameState, EMPTY, SNAKE, FOOD, MOVED, ATE, DIED, WON
+
+# value of cells off the board in cropped grid observations
+WALL = 3
+# planes of channel observations, WALL_PLANE only when cropping
+HEAD_PLANE = 0
+BODY_PLANE = 1
+FOOD_PLANE = 2
+WALL_PLANE = 3
+REWARDS = {MOVED: 0.0, ATE: 1.0, DIED: -1.0, WON: 1.0}
+
+
+class SnakeEnv:
+    """One game at a time, started again by reset. step never copies or allocates array data (a crop is a new
+        view object onto the same buffer), and returns the same info dict every time with its values updated
+    """
+
+    def __init__(self, dimensions, seed=None, channels=False, crop=None, max_moves=None):
+        """sets up an environment. Call reset before stepping
+
+        Args:
+            dimensions (int) number of cells along each side of the board
+            seed (int) seed for the seeds of the games, or None for random ones
+            channels (bool) whether observations have a plane for each of head, body and food rather than being
+                the grid
+            crop (int) odd number of cells along each side of a square centred on the head to observe instead of
+                the whole board, or None
+            max_moves (int) moves after which a game is ended, or None to play until it is won or lost
+        """
+
+        if crop is not None and crop % 2 == 0:
+            raise ValueError("crop has to be odd so the head is in the middle, not %d" % crop)
+        self.dimensions = dimensions
+        self.seeds = random.Random(seed)
+        self.channels = channels
+        self.crop = crop
+        self.max_moves = max_moves
+        self.actions = DIRECTIONS
+        self.game = None
+        self.info = {"outcome": None, "moves": 0, "length": 1, "seed": None}
+
+        # channel and crop observations are views of padded planes, the padding half a crop wide so that every crop
+        # is a plain slice
+        self.padding = crop // 2 if crop is not None else 0
+        self.side = dimensions + 2 * self.padding
+        if channels or crop is not None:
+            if not channels:
+                plane_count = 1
+            else:
+                plane_count = 4 if crop is not None else 3
+            self.planes = np.zeros((plane_count, self.side, self.side), dtype=np.uint8)
+            self.flat_planes = self.planes.reshape(-1)
+            # where each cell of the board is in the first plane of flat_planes, and how far apart the planes are
+            self.offsets = [(row + self.padding) * self.side + col + self.padding
+                            for row in range(dimensions) for col in range(dimensions)]
+            self.plane_size = self.side * self.side
+            self.planes_view = self.planes.view()
+            self.planes_view.flags.writeable = False
+            if not channels:
+                self.planes_view = self.planes_view[0]
+        else:
+            self.planes = None
+
+    def get_observation_shape(self):
+        """gets the shape of the arrays returned as observations"""
+
+        size = self.crop if self.crop is not None else self.dimensions
+        if self.channels:
+            return (self.planes.shape[0], size, size)
+        return (size, size)
+
+    def reset(self, seed=None):
+        """starts a new game
+
+        Args:
+            seed (int) seed of the game's food, or None to take the next seed
+
+        Returns:
+            the first observation
+        """
+
+        if seed is None:
+            seed = self.seeds.randrange(2 ** 32)
+        self.game = GameState(self.dimensions, seed)
+        self.grid_view = np.frombuffer(self.game.grid, dtype=np.uint8).reshape(self.dimensions, self.dimensions)
+        self.grid_view.flags.writeable = False
+        if self.planes is not None:
+            self.fill_planes()
+        self.info.update(outcome=None, moves=0, length=1, seed=seed)
+        return self.get_observation()
+
+    def fill_planes(self):
+        """writes the whole game into the padded planes"""
+
+        (planes, padding, dimensions) = (self.planes, self.padding, self.dimensions)
+        planes.fill(0)
+        inside = planes[:, padding:padding + dimensions, padding:padding + dimensions]
+        if not self.channels:
+            planes[0].fill(WALL)
+            inside[0] = self.grid_view
+            return
+        inside[BODY_PLANE] = self.grid_view == SNAKE
+        inside[FOOD_PLANE] = self.grid_view == FOOD
+        (row, col) = divmod(self.game.snake.get_head(), dimensions)
+        inside[HEAD_PLANE, row, col] = 1
+        if self.crop is not None:
+            planes[WALL_PLANE].fill(1)
+            inside[WALL_PLANE] = 0
+
+    def step(self, action):
+        """moves the snake once
+
+        Args:
+            action (Direction) the direction to move in, or its index in DIRECTIONS as any integer type
+
+        Returns:
+            tuple of the observation, the reward, whether the game is over and the info dict, holding the outcome
+            (MOVED, ATE, DIED or WON), moves, length and seed
+        """
+
+        # any integer, including the NumPy ones argmax and most agents return, is an index
+        if action.__class__ is not Direction:
+            index = operator.index(action)
+            # negative indexes would otherwise pick directions from the end
+            if not 0 <= index < len(DIRECTIONS):
+                raise ValueError("action has to be from 0 to %d, not %d" % (len(DIRECTIONS) - 1, index))
+            action = DIRECTIONS[index]
+        game = self.game
+        old_head = game.snake.body[0]
+        old_food = game.food
+        outcome = game.step(action)
+        if self.planes is not None and outcome != DIED:
+            self.update_planes(old_head, old_food)
+
+        info = self.info
+        info["outcome"] = outcome
+        info["moves"] = game.moves
+        info["length"] = len(game.snake.body)
+        done = outcome == DIED or outcome == WON or (self.max_moves is not None and game.moves >= self.max_moves)
+        return (self.get_observation(), REWARDS[outcome], done, info)
+
+    def update_planes(self, old_head, old_food):
+        """writes the cells that the last move changed into the planes
+
+        Args:
+            old_head (int) the cell the head was on before the move
+            old_food (int) the cell the food was on before the move, or None
+        """
+
+        (flat, offsets, game) = (self.flat_planes, self.offsets, self.game)
+        head = game.snake.body[0]
+        tail = game.last_tail
+        if not self.channels:
+            if tail is not None:
+                flat[offsets[tail]] = EMPTY
+            flat[offsets[head]] = SNAKE
+            if game.food is not None and game.food != old_food:
+                flat[offsets[game.food]] = FOOD
+            return
+        # HEAD_PLANE is the first plane
+        body_plane = BODY_PLANE * self.plane_size
+        food_plane = FOOD_PLANE * self.plane_size
+        flat[offsets[old_head]] = 0
+        flat[offsets[head]] = 1
+        if tail is not None:
+            flat[body_plane + offsets[tail]] = 0
+        flat[body_plane + offsets[head]] = 1
+        if game.food != old_food:
+            flat[food_plane + offsets[old_food]] = 0
+            if game.food is not None:
+                flat[food_plane + offsets[game.food]] = 1
+
+    def get_observation(self):
+        """gets the read-only view observed in the game's current state"""
+
+        if self.planes is None:
+            return self.grid_view
+        if self.crop is None:
+            return self.planes_view
+        (row, col) = divmod(self.game.snake.body[0], self.dimensions)
+        # the padding shifts the board by half a crop, so the crop centred on the head starts at the head's cell
+        return self.planes_view[..., row:row + self.crop, col:col + self.crop]
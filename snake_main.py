@@ -1,19 +1,119 @@
 """Implementation of Snake game using tkinter. Includes a brute-force bot that wins on even board sizes
 
 Usage:
-    python3 main.py
+    python3 snake_main.py
+    python3 snake_main.py --headless [--bot NAME] [--size N] [--seed N] [--move-limit N] [--replay-dir DIR]
+                          [--telemetry FILE]
+
+The window's settings are the variables below. With --headless a single bot game is played without tkinter or PIL
+ever being imported, so it also runs on machines with no display.
 """
 
-from tkinter import *
-from board import *
-from bot_board import BotBoard
+import argparse
+import random
 
+from snakebot import Snakebot, ShortcutSnakebot, GreedySnakebot, LookaheadSnakebot
 
-using_bot = False
 
+using_bot = False
+# Snakebot always follows its cycle, which only exists on even board sizes, ShortcutSnakebot cuts across it towards the
+# food on any size, GreedySnakebot also chases the food while the snake is short, LookaheadSnakebot searches a few
+# moves ahead but soon traps itself
+BOT_CLASSES = {bot_class.__name__: bot_class
+               for bot_class in (Snakebot, ShortcutSnakebot, GreedySnakebot, LookaheadSnakebot)}
+# name of the bot played in the window when using_bot is set, and with --headless unless --bot is given
+bot_name = "Snakebot"
+# path each finished game's replay is saved to, or None
+replay_file = None
+# path of a replay to watch instead of playing, or None
+watch_replay = None
+# show live timings of the game loop in the menu
+show_stats = False
+# show a small picture of the whole board in the menu, useful on boards too big to fit in the window
+show_minimap = False
+# .json or .csv path the game loop timings are written to when the window is closed, or None
+stats_file = None
+# .jsonl, .csv or .snkt path the events of every game are streamed to, or None (see telemetry.py)
+telemetry_file = None
+# board sizes whose food image is resampled in the background at startup
+PRELOADED_DIMENSIONS = range(10, 101, 10)
+# board size of headless games
+HEADLESS_DIMENSIONS = 20
+
+
+def main(args=None):
+    """plays in a window, or a single bot game without one if --headless is given
+
+    Args:
+        args (list) command line arguments, or None to use sys.argv
+    """
+
+    parser = argparse.ArgumentParser(description="Snake in a window, or a single bot game without one")
+    parser.add_argument("--headless", action="store_true", help="play one bot game without a window")
+    parser.add_argument("--bot", default=bot_name, help="bot played with --headless")
+    parser.add_argument("--size", type=int, default=HEADLESS_DIMENSIONS, help="board size with --headless")
+    parser.add_argument("--seed", type=int, help="seed of the game with --headless, random if not given")
+    parser.add_argument("--move-limit", type=int, default=10 ** 8, help="moves after which the game is abandoned")
+    parser.add_argument("--replay-dir", help="directory to save the headless game's replay in")
+    parser.add_argument("--telemetry", default=telemetry_file,
+                        help="file to stream the events of the games to, .jsonl, .csv or .snkt")
+    parser.add_argument("--exit-when-ready", action="store_true",
+                        help="close the window as soon as it is first drawn, for timing startup")
+    args = parser.parse_args(args)
+    if args.headless:
+        play_headless(parser, args)
+    else:
+        open_window(args.exit_when_ready, args.telemetry)
+
+
+def play_headless(parser, args):
+    """plays one bot game to the end and prints how it went
+
+    Args:
+        parser (ArgumentParser) used to report a bad bot name
+        args (Namespace) the parsed command line
+    """
+
+    from tournament import BOTS, play_game
+
+    if args.bot not in BOTS:
+        parser.error("unknown bot %s, choose from %s" % (args.bot, ", ".join(sorted(BOTS))))
+    seed = args.seed if args.seed is not None else random.randrange(2 ** 32)
+    telemetry = None
+    if args.telemetry:
+        from telemetry import TelemetryStream
+
+        telemetry = TelemetryStream(args.telemetry, lossless=True)
+    result = play_game(args.bot, args.size, seed, args.move_limit, args.replay_dir, telemetry)
+    if telemetry is not None:
+        telemetry.close()
+    print("%s on %dx%d, seed %d: %s after %d moves, %d food, %.3fs" % (
+        result["bot"], result["size"], result["size"], result["seed"], result["outcome"], result["moves"], result["food"],
+        result["seconds"]))
+
+
+def open_window(exit_when_ready=False, telemetry_path=None):
+    """sets up GUI window and initializes board
+
+    Args:
+        exit_when_ready (bool) close the window once it has been drawn instead of waiting for the user
+        telemetry_path (str) file to stream the events of every game to, or None
+    """
+
+    # the GUI is only imported here so headless games never load tkinter or PIL
+    from tkinter import Tk, Frame, Label, Entry, Button, BOTTOM, LEFT, X, Y
+    from board import Board, GAME_WIDTH, MENU_WIDTH
+    from bot_board import BotBoard
+    from colors import GAME_BACKGROUND_COLOR, SNAKE_COLOR, MENU_COLOR, BORDER_COLOR
+    from instrumentation import TickStats
+    from replay import Replay
+    from replay_board import ReplayBoard
+    from sprites import food_sprites
+    from stats_overlay import StatsOverlay
+    from viewport import Minimap
+
+    food_sprites.preload(int(GAME_WIDTH / dimensions) for dimensions in PRELOADED_DIMENSIONS)
 
-def main():
-    """sets up GUI window and initializes board"""
     # initialize window
     my_window = Tk()
     my_window.title("Snake")
@@ -24,10 +124,24 @@ def main():
         my_window, background=GAME_BACKGROUND_COLOR, highlightthickness=0)
     score_label = Label(game_frame, text="Score: 1", font="Roboto 20",
                         background=GAME_BACKGROUND_COLOR, height=1, foreground="WHITE")
-    game_board = BotBoard(game_frame, score_label=score_label, background=GAME_BACKGROUND_COLOR,
-                          width=GAME_WIDTH, height=GAME_WIDTH, highlightthickness=0) if using_bot else \
-        Board(game_frame, score_label=score_label, background=GAME_BACKGROUND_COLOR,
-              width=GAME_WIDTH, height=GAME_WIDTH, highlightthickness=0)
+    stats = TickStats() if show_stats or stats_file else None
+    telemetry = None
+    if telemetry_path:
+        from telemetry import TelemetryStream
+
+        telemetry = TelemetryStream(telemetry_path)
+    if watch_replay:
+        game_board = ReplayBoard(game_frame, replay=Replay.load(watch_replay), score_label=score_label, stats=stats,
+                                 background=GAME_BACKGROUND_COLOR, width=GAME_WIDTH, height=GAME_WIDTH,
+                                 highlightthickness=0)
+    elif using_bot:
+        game_board = BotBoard(game_frame, bot_class=BOT_CLASSES[bot_name], score_label=score_label, replay_file=replay_file,
+                              stats=stats, telemetry=telemetry, background=GAME_BACKGROUND_COLOR, width=GAME_WIDTH,
+                              height=GAME_WIDTH, highlightthickness=0)
+    else:
+        game_board = Board(game_frame, score_label=score_label, replay_file=replay_file, stats=stats,
+                           telemetry=telemetry, background=GAME_BACKGROUND_COLOR, width=GAME_WIDTH,
+                           height=GAME_WIDTH, highlightthickness=0)
 
     score_label.pack(side=BOTTOM, fill=X)
     game_frame.pack(side=LEFT)
@@ -62,11 +176,30 @@ def main():
                                font="Roboto 12 bold", command=game_board.restart_game)
     play_again_button.pack()
 
+    if show_stats:
+        stats_overlay = StatsOverlay(menu_frame, game_board, background=MENU_COLOR)
+        stats_overlay.pack(pady=20)
+
+    if show_minimap:
+        minimap = Minimap(menu_frame, game_board, GAME_BACKGROUND_COLOR, SNAKE_COLOR, "red", background=MENU_COLOR)
+        minimap.pack(pady=20)
+
     menu_frame.pack(side=LEFT, fill=Y)
 
-    if using_bot:
+    if using_bot and not watch_replay:
         my_window.after(1000, game_board.start_bot)
+    if exit_when_ready:
+        my_window.after_idle(my_window.destroy)
     my_window.mainloop()
 
+    if telemetry is not None:
+        telemetry.close()
+    if stats_file:
+        if stats_file.endswith(".csv"):
+            stats.save_csv(stats_file)
+        else:
+            stats.save_json(stats_file)
+
 
-main()
+if __name__ == "__main__":
+    main()
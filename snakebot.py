@@ -1,50 +1,584 @@
-import board
+from itertools import chain, islice
+
+from arena import EMPTY, FIRST_OWNER
+from direction import UP, RIGHT, DOWN, LEFT, DIRECTIONS, direction_between
+from engine import SNAKE, MOVED, DIED
+from pathfinding import PathFinder, get_neighbour_lists
+from position import Position
+
+# scores of the positions LookaheadSnakebot searches. Eating always beats not eating and dying always loses, and
+# within each the sooner the better for eating and the later the better for dying
+EAT_SCORE = 10 ** 6
+DEATH_SCORE = -10 ** 6
 
 
 class Snakebot:
     """Represents an autonomously played game of Snake that wins every time with brute force"""
 
-    def __init__(self, initial_cell, board):
-        """sets up bot with initial position
+    def __init__(self, game):
+        """sets up bot for a game
 
         Args:
-            initial_cell(Cell): cell containing head to start with
-            board(BotBoard): the board this bot is playing on
+            game (GameState) the game this bot is playing, read on every call to get_new_direction
         """
-        self.board = board
-        self.head_cell = initial_cell
-        self.direction = None
+        self.game = game
 
     def get_new_direction(self):
         """computes a direction for the snake head based on its current position and direction
 
         Returns:
-            Direction: one of board.up, board.right, board.down, board.left
+            Direction: one of UP, RIGHT, DOWN, LEFT
+        """
+
+        direction = self.game.direction
+        if not direction:
+            return DOWN
+        dimensions = self.game.dimensions
+        (y, x) = divmod(self.game.snake.get_head(), dimensions)
+        if direction is DOWN and y == dimensions - 1:
+            return LEFT
+        elif direction is LEFT and x == 0:
+            return UP
+        elif direction is RIGHT:
+            if x == dimensions - 1:
+                return DOWN
+            elif x == dimensions - 2 and y > 0:
+                return UP
+        elif direction is UP:
+            return RIGHT if x == 0 else LEFT
+
+        return direction
+
+
+def build_cycle(dimensions):
+    """lists the cells of the zig-zag Hamiltonian cycle that Snakebot follows: along the top row, down the right
+        column, back along the bottom row, then up through the remaining rows snaking between the first and
+        second to last column. Only closes into a cycle on even board sizes
+
+    Args:
+        dimensions (int) number of cells along each side of the board
+
+    Returns:
+        list of cell indices in the order they are visited, starting from the top left corner
+    """
+
+    rows_and_cols = [(0, col) for col in range(dimensions)]
+    rows_and_cols += [(row, dimensions - 1) for row in range(1, dimensions)]
+    rows_and_cols += [(dimensions - 1, col) for col in range(dimensions - 2, -1, -1)]
+    for row in range(dimensions - 2, 0, -1):
+        cols = range(dimensions - 1) if (dimensions - row) % 2 == 0 else range(dimensions - 2, -1, -1)
+        rows_and_cols += [(row, col) for col in cols]
+    return [row * dimensions + col for (row, col) in rows_and_cols]
+
+
+def build_odd_cycle(dimensions):
+    """lists the cells of a Hamiltonian cycle of an odd sized board without its top left corner: from the cell to
+        the right of the corner to the one diagonally below it, to the one below the corner and down the left
+        column, up through the rows below the second snaking between the second and last column, then back along
+        the top two rows a column at a time. The corner has the same two neighbours as the cell diagonally next to
+        it, which come either side of it on the cycle, so the two can be swapped over
+
+    Args:
+        dimensions (int) an odd number of cells along each side of the board, at least 3
+
+    Returns:
+        list of cell indices in the order they are visited, starting from the cell to the right of the corner
+    """
+
+    rows_and_cols = [(0, 1), (1, 1)] + [(row, 0) for row in range(1, dimensions)]
+    for row in range(dimensions - 1, 1, -1):
+        cols = range(1, dimensions) if (dimensions - row) % 2 == 1 else range(dimensions - 1, 0, -1)
+        rows_and_cols += [(row, col) for col in cols]
+    for col in range(dimensions - 1, 1, -1):
+        rows_and_cols += [(1, col), (0, col)] if (dimensions - col) % 2 == 1 else [(0, col), (1, col)]
+    return [row * dimensions + col for (row, col) in rows_and_cols]
+
+
+class HamiltonianCycle:
+    """The Hamiltonian cycle ShortcutSnakebot and GreedySnakebot play along: Snakebot's zig-zag on even board sizes,
+        and on odd ones build_odd_cycle, which swaps the cell it leaves out for the one diagonally next to it when
+        the food is there. While the snake lies in cycle order from its tail to its head, every cell ahead of the
+        head up to the tail is free, so following the cycle can never trap it
+    """
+
+    def __init__(self, dimensions):
+        """precomputes each cell's position on the cycle
+
+        Args:
+            dimensions (int) number of cells along each side of the board, at least 2
+        """
+
+        self.dimensions = dimensions
+        self.cells = build_cycle(dimensions) if dimensions % 2 == 0 else build_odd_cycle(dimensions)
+        # -1 for the cell left off the cycle on odd sizes, which has no position on it
+        self.index = [-1] * (dimensions * dimensions)
+        for (i, cell) in enumerate(self.cells):
+            self.index[cell] = i
+        self.left_out = None if dimensions % 2 == 0 else 0
+        self.neighbours = get_neighbour_lists(dimensions)
+
+    def swap_left_out(self):
+        """puts the cell left off the cycle on an odd sized board in the place of the one it shares both neighbours
+            with, which is left out instead
+        """
+
+        partner = self.dimensions + 1 if self.left_out == 0 else 0
+        i = self.index[partner]
+        self.cells[i] = self.left_out
+        self.index[self.left_out] = i
+        self.index[partner] = -1
+        self.left_out = partner
+
+    def get_next(self, cell):
+        """gets the cell after a cell on the cycle"""
+
+        return self.cells[(self.index[cell] + 1) % len(self.cells)]
+
+    def is_in_order(self, body):
+        """checks whether each cell of a snake's body comes further along the cycle from its tail than the one
+            behind it
+        """
+
+        (index, period) = (self.index, len(self.cells))
+        tail_index = index[body[-1]]
+        if tail_index < 0:
+            return False
+        last = 0
+        for cell in islice(reversed(body), 1, None):
+            distance = (index[cell] - tail_index) % period
+            if index[cell] < 0 or distance <= last:
+                return False
+            last = distance
+        return True
+
+    def can_join(self, cell, grid, body, spare=1):
+        """checks whether a snake can move to a cell and follow the cycle from there, getting to each cell of its
+            body no sooner than the tail has left it
+
+        Args:
+            cell (int) a cell next to the head
+            grid (bytearray) cell contents, as in GameState.grid
+            body (deque) cells of the snake, head first
+            spare (int) number of moves to get to each cell after the tail has left it, to leave room to eat on
+                the way
+        """
+
+        (index, period, length) = (self.index, len(self.cells), len(body))
+        if index[cell] < 0 or (grid[cell] == SNAKE and cell != body[-1]):
+            return False
+        for (i, body_cell) in enumerate(islice(body, length - 1)):
+            # the cell i behind the head is left length - 1 - i moves after this one
+            if index[body_cell] < 0 or (index[body_cell] - index[cell]) % period < length - 1 - i + spare:
+                return False
+        return True
+
+    def find_move(self, game):
+        """picks the move that gets furthest along the cycle without passing the food or coming too close to the
+            tail, falling back to the next cell on the cycle. Only safe while the snake is in cycle order. Food in the
+            cell left off the cycle is eaten from the cell before the one it swaps with, which is next on the cycle
+            and so free unless it is the tail
+
+        Args:
+            game (GameState) the game to move in
+
+        Returns:
+            the cell to move to
+        """
+
+        (grid, body, food) = (game.grid, game.snake.body, game.food)
+        (head, tail) = (body[0], body[-1])
+        (cells, index) = (self.cells, self.index)
+        period = len(cells)
+        head_index = index[head]
+        next_cell = cells[(head_index + 1) % period]
+        if food is None:
+            return next_cell
+        target = food
+        if food == self.left_out:
+            # the top left corner and the cell diagonally next to it are both next to cell 1
+            target = 1
+            partner = cells[(index[target] + 1) % period]
+            if head == target and (partner != tail or len(body) + 1 == len(grid)):
+                self.swap_left_out()
+                return food
+        # a snake of length 1 has the whole cycle in front of it
+        distance_to_tail = (index[tail] - head_index) % period or period
+        distance_to_food = (index[target] - head_index) % period
+
+        if distance_to_food > distance_to_tail:
+            # the food is behind the head, and only comes in front of it once the tail has gone past it
+            allowed = distance_to_tail - 5
+        else:
+            # leave room for the snake to grow into, and skip fewer free cells the further the food is
+            free = period - len(body) - 3
+            allowed = distance_to_tail - len(body) - 3
+            if distance_to_food < distance_to_tail:
+                allowed -= 1
+                if (distance_to_tail - distance_to_food) * 4 > free:
+                    allowed -= 10
+            allowed = min(allowed, distance_to_food)
+        if allowed < 2:
+            return next_cell
+
+        best_cell = next_cell
+        best_distance = 1
+        for cell in self.neighbours[head]:
+            if index[cell] < 0:
+                continue
+            distance = (index[cell] - head_index) % period
+            if best_distance < distance <= allowed and grid[cell] != SNAKE:
+                best_cell = cell
+                best_distance = distance
+        return best_cell
+
+
+class ShortcutSnakebot:
+    """Plays along a HamiltonianCycle, cutting across it towards the food whenever the head stays behind the tail in
+        cycle order, and leaving more room the fuller the board gets. Wins every time on any board size
+    """
+
+    def __init__(self, game):
+        """sets up bot for a game
+
+        Args:
+            game (GameState) the game this bot is playing, read on every call to get_new_direction
+        """
+
+        self.game = game
+        self.cycle = HamiltonianCycle(game.dimensions)
+
+    def get_new_direction(self):
+        """takes the best move along the cycle
+
+        Returns:
+            Direction: one of UP, RIGHT, DOWN, LEFT
+        """
+
+        game = self.game
+        head = game.snake.body[0]
+        # only a snake of length 1 can start on the cell left out
+        if head == self.cycle.left_out:
+            self.cycle.swap_left_out()
+        return direction_between(head, self.cycle.find_move(game), game.dimensions)
+
+
+class GreedySnakebot:
+    """Chases each piece of food along the shortest path while the snake is short, as long as the head could still
+        reach the tail once it had eaten it. Otherwise it joins a HamiltonianCycle and cuts across it towards the
+        food, which it keeps doing once the snake is too long to find its way back to the cycle. Wins every time on
+        any board size
+    """
+
+    def __init__(self, game, greedy_rows=3):
+        """sets up bot for a game
+
+        Args:
+            game (GameState) the game this bot is playing, read on every call to get_new_direction
+            greedy_rows (int) number of rows of the board the snake is as long as once it stops chasing food
+        """
+
+        self.game = game
+        self.finder = PathFinder(game.dimensions)
+        self.cycle = HamiltonianCycle(game.dimensions)
+        self.greedy_length = min(game.dimensions * greedy_rows, len(game.grid) // 4)
+        self.scratch = bytearray(len(game.grid))
+        # the move count at which the head entered each cell, kept up to date with one write per move
+        self.entered = [0] * len(game.grid)
+        self.entered_moves = None
+        # cells left to move to, last one first, the food and move count they are for, and the last food searched
+        # for
+        self.plan = []
+        self.plan_food = None
+        self.plan_moves = None
+        self.searched_food = None
+        # whether the snake is in cycle order, and if not, the number of moves it has followed the cycle for since
+        # joining it, or None if it hasn't, and its length after the last of them
+        self.in_order = False
+        self.joined = None
+        self.joined_length = 0
+
+    def get_new_direction(self):
+        """takes the next step of the path to the food, searching for one once for every piece of food, or the next
+            move along the cycle if there is none
+
+        Returns:
+            Direction: one of UP, RIGHT, DOWN, LEFT
+        """
+
+        game = self.game
+        body = game.snake.body
+        head = body[0]
+        # once the snake is too long to chase food, it stays in cycle order
+        if self.in_order and len(body) >= self.greedy_length:
+            return direction_between(head, self.cycle.find_move(game), game.dimensions)
+        if self.entered_moves == game.moves - 1:
+            self.entered[head] = game.moves
+        elif self.entered_moves != game.moves:
+            for (i, cell) in enumerate(body):
+                self.entered[cell] = game.moves - i
+        self.entered_moves = game.moves
+        if head == self.cycle.left_out:
+            self.cycle.swap_left_out()
+
+        if self.plan and self.plan_moves == game.moves and self.plan_food == game.food:
+            cell = self.plan.pop()
+        else:
+            self.plan = []
+            cell = -1
+            if game.food != self.searched_food and len(body) < self.greedy_length:
+                self.searched_food = game.food
+                cell = self.plan_path()
+            if cell < 0:
+                cell = self.follow_cycle()
+        self.plan_moves = game.moves + 1
+        self.plan_food = game.food
+        return direction_between(head, cell, game.dimensions)
+
+    def plan_path(self):
+        """finds the shortest path to the food, through the cells the tail will have left by the time the head gets
+            there, and keeps it as the plan if the head could still reach the tail once the snake had taken it
+
+        Returns:
+            the first cell of the path, or -1 if there is no such path
+        """
+
+        game = self.game
+        (grid, body, food, moves) = (game.grid, game.snake.body, game.food, game.moves)
+        (finder, scratch) = (self.finder, self.scratch)
+        length = len(body)
+        if food is None or finder.search(grid, body[0], food, self.entered, moves - length) < 0:
+            return -1
+        path = finder.get_path(body[0], food)
+        if length + 1 < len(grid):
+            # the snake once it has eaten, head first
+            eaten = list(islice(chain(reversed(path), body), length + 1))
+            scratch[:] = grid
+            for cell in body:
+                scratch[cell] = EMPTY
+            for cell in eaten:
+                scratch[cell] = SNAKE
+            if finder.search(scratch, eaten[0], eaten[-1]) < 0:
+                return -1
+        self.in_order = False
+        self.joined = None
+        path.reverse()
+        first = path.pop()
+        self.plan = path
+        return first
+
+    def follow_cycle(self):
+        """moves along the cycle once the snake is in cycle order, and otherwise joins the cycle if it can, or else
+            follows the tail
+
+        Returns:
+            the cell to move to
+        """
+
+        game = self.game
+        (grid, body) = (game.grid, game.snake.body)
+        cycle = self.cycle
+        if not self.in_order and (len(body) == 1 or self.joined is not None and self.joined >= len(body) - 1):
+            self.in_order = cycle.is_in_order(body)
+        if self.in_order:
+            return cycle.find_move(game)
+
+        if self.joined is not None:
+            # the tail stays put when the snake eats, which uses up some of the room left when it joined
+            next_cell = cycle.get_next(body[0])
+            if self.joined_length == len(body) or cycle.can_join(next_cell, grid, body, 0):
+                self.joined += 1
+                self.joined_length = len(body)
+                return next_cell
+            self.joined = None
+        for cell in sorted(cycle.neighbours[body[0]], key=lambda cell: cell != cycle.get_next(body[0])):
+            if cycle.can_join(cell, grid, body):
+                self.joined = 0
+                self.joined_length = len(body)
+                return cell
+        return self.follow_tail()
+
+    def follow_tail(self):
+        """picks a move after which the head can still reach the tail, through the cells the tail will have left by
+            the time the head gets there: the next cell on the cycle if it is one, which lines the snake up to join
+            the cycle, or else the one furthest from the tail. Moves that leave a move to spare, in case the snake
+            eats on the way, come first, and if there are none, any free cell is taken
+
+        Returns:
+            the cell to move to
+        """
+
+        game = self.game
+        (grid, body, food) = (game.grid, game.snake.body, game.food)
+        (head, tail) = (body[0], body[-1])
+        if len(body) == 1:
+            return self.finder.neighbours[head][0]
+        next_cell = self.cycle.get_next(head) if self.cycle.index[head] >= 0 else -1
+        for spare in (1, 0):
+            best_cell = -1
+            best_distance = -1
+            for cell in self.finder.neighbours[head]:
+                if grid[cell] == SNAKE and cell != tail:
+                    continue
+                # the tail only moves on if the snake doesn't eat
+                if cell == food:
+                    distance = self.finder.search(grid, cell, tail, self.entered, game.moves - len(body) - spare)
+                else:
+                    distance = self.finder.search(grid, cell, body[-2], self.entered,
+                                                  game.moves + 1 - len(body) - spare)
+                if distance >= 0 and cell == next_cell:
+                    return cell
+                if distance > best_distance:
+                    best_cell = cell
+                    best_distance = distance
+            if best_cell >= 0:
+                return best_cell
+        return next((cell for cell in self.finder.neighbours[head] if grid[cell] != SNAKE), tail)
+
+
+class LookaheadSnakebot:
+    """Tries every sequence of moves up to a fixed depth on a Position, and takes the first move of the best one:
+        the one eating soonest, or if none eat, ending nearest the food, avoiding any that die. Positions reached
+        more than once through different moves are only searched once. An example of searching with a Position
+        rather than a bot to play with: it only looks a few moves ahead, so it traps itself long before the board is
+        full, and isn't one of the tournament's bots
+    """
+
+    def __init__(self, game, depth=6):
+        """sets up bot for a game
+
+        Args:
+            game (GameState) the game this bot is playing, read on every call to get_new_direction
+            depth (int) number of moves to look ahead
+        """
+
+        self.game = game
+        self.depth = depth
+        self.evaluated = 0
+        self.position = Position.from_game(game)
+
+    def get_new_direction(self):
+        """searches the moves from the game's current position
+
+        Returns:
+            Direction: one of UP, RIGHT, DOWN, LEFT
         """
 
-        if not self.direction:
-            return self.board.down
-        up, right, down, left = self.board.up, self.board.right, self.board.down, self.board.left
-        (y, x) = self.head_cell.get_row_col()
-        if self.direction is down and y == board.GAME_GRID_DIMENSIONS - 1:
-            return left
-        elif self.direction is left and x == 0:
-            return up
-        elif self.direction is right:
-            if x == board.GAME_GRID_DIMENSIONS - 1:
-                return down
-            elif x == board.GAME_GRID_DIMENSIONS - 2 and y > 0:
-                return up
-        elif self.direction is up:
-            return right if x == 0 else left
+        # the bot's position follows the game by making the same moves, and is only copied again if the game
+        # was changed some other way
+        game = self.game
+        position = self.position
+        if (position.moves != game.moves or position.food != game.food
+                or position.get_head() != game.snake.get_head()):
+            position = self.position = Position.from_game(game)
+        self.table = {}
+        best_direction = game.direction or UP
+        best_score = None
+        for direction in DIRECTIONS:
+            score = self.score_move(position, direction, self.depth)
+            if best_score is None or score > best_score:
+                best_direction = direction
+                best_score = score
+        position.apply(best_direction)
+        position.history.clear()
+        return best_direction
+
+    def score_move(self, position, direction, depth):
+        """scores a move by the best position it can lead to
+
+        Args:
+            position (Position) the position to move from, left as it was
+            direction (Direction) the move to score
+            depth (int) number of moves left to look ahead, including this one
+        """
 
-        return self.direction
+        outcome = position.apply(direction)
+        if outcome == DIED:
+            return DEATH_SCORE - depth
+        self.evaluated += 1
+        if outcome != MOVED:
+            score = EAT_SCORE + depth
+        elif depth == 1:
+            score = self.evaluate(position)
+        else:
+            # a position already searched at least as deep scores the same, as scores only count moves from here
+            key = position.key()
+            (searched_depth, score) = self.table.get(key, (0, None))
+            if searched_depth < depth:
+                score = DEATH_SCORE - depth
+                for next_direction in DIRECTIONS:
+                    next_score = self.score_move(position, next_direction, depth - 1)
+                    if next_score > score:
+                        score = next_score
+                self.table[key] = (depth, score)
+        position.undo()
+        return score
 
-    def update_position(self, new_head):
-        """notifies snakebot of a change in head position after snake completes a move
+    def evaluate(self, position):
+        """scores a position where the search stops by how close the head is to the food"""
+
+        if position.food is None:
+            return 0
+        (row, col) = divmod(position.get_head(), position.dimensions)
+        (food_row, food_col) = divmod(position.food, position.dimensions)
+        return -abs(row - food_row) - abs(col - food_col)
+
+
+class ArenaSnakebot:
+    """Plays one snake in an arena by heading for the food that was nearest when it picked it, never moving into a
+        body and avoiding cells another head could also move into when it has a choice. A new piece of food is only
+        picked once the last one is gone, and otherwise only the cells around the head are looked at, so a tick of
+        many of these costs the same on any board size
+    """
+
+    def __init__(self, arena, owner):
+        """sets up bot for a snake
 
         Args:
-            new_head(Cell) the cell now containing the snake head
+            arena (Arena) the arena the snake is in, read on every call to get_new_direction
+            owner (int) the id of the snake this bot plays
+        """
+
+        self.arena = arena
+        self.owner = owner
+        self.target = None
+
+    def get_new_direction(self):
+        """picks the safest move, and of those the one that gets closest to the nearest food
+
+        Returns:
+            Direction: one of UP, RIGHT, DOWN, LEFT
         """
-        self.head_cell = new_head
-        self.direction = new_head.get_direction()
+
+        arena = self.arena
+        (grid, dimensions) = (arena.grid, arena.dimensions)
+        body = arena.snakes[self.owner].body
+        (head, tail) = (body[0], body[-1])
+        (row, col) = divmod(head, dimensions)
+        if self.target not in arena.food:
+            self.target = min(arena.food, key=lambda cell: abs(cell // dimensions - row) + abs(cell % dimensions - col),
+                              default=None)
+        food = self.target
+
+        best_direction = arena.snakes[self.owner].direction or UP
+        best_score = None
+        for direction in DIRECTIONS:
+            cell = arena.get_new_cell(head, direction)
+            if cell < 0 or (grid[cell] >= FIRST_OWNER and cell != tail):
+                continue
+            # a cell next to another snake's head could end in a head-on collision
+            contested = any(self.is_other_head(arena.get_new_cell(cell, other)) for other in DIRECTIONS)
+            distance = 0
+            if food is not None:
+                (food_row, food_col) = divmod(food, dimensions)
+                distance = abs(cell // dimensions - food_row) + abs(cell % dimensions - food_col)
+            score = (not contested, -distance)
+            if best_score is None or score > best_score:
+                best_direction = direction
+                best_score = score
+        return best_direction
+
+    def is_other_head(self, cell):
+        """checks whether a cell is the head of a snake other than this bot's"""
+
+        owner = self.arena.grid[cell] if cell >= 0 else EMPTY
+        return owner >= FIRST_OWNER and owner != self.owner and self.arena.snakes[owner].body[0] == cell
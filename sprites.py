@@ -0,0 +1,161 @@
+"""Caches for the images drawn on the board, so restarting a game or changing its size doesn't rebuild them"""
+
+import os
+import threading
+from collections import OrderedDict
+
+FOOD_IMAGE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "food.png")
+
+
+class SpriteCache:
+    """A small least-recently-used cache of images. Images are kept alive by the cache, which tkinter requires
+        for as long as they are on a canvas
+    """
+
+    def __init__(self, capacity):
+        """creates an empty cache
+
+        Args:
+            capacity (int) how many images to keep before evicting the least recently used one
+        """
+
+        self.capacity = capacity
+        self.images = OrderedDict()
+
+    def get(self, key, build):
+        """gets the image for a key, building and caching it if it isn't cached
+
+        Args:
+            key (hashable) whatever the image depends on
+            build (function) called with no arguments to make the image on a miss
+
+        Returns:
+            the cached image
+        """
+
+        image = self.images.get(key)
+        if image is None:
+            image = build()
+            self.images[key] = image
+            if len(self.images) > self.capacity:
+                self.images.popitem(last=False)
+        else:
+            self.images.move_to_end(key)
+        return image
+
+
+backgrounds = SpriteCache(8)
+
+
+def get_background(width, dimensions, fill, outline):
+    """gets an image of the empty board: every cell filled with one color and outlined with another
+
+    Args:
+        width (int) width and height of the board in pixels
+        dimensions (int) number of cells along each side
+        fill (str) background color of the cells
+        outline (str) color of the lines between cells
+
+    Returns:
+        PhotoImage of the whole grid, drawn as a single canvas item
+    """
+
+    return backgrounds.get((width, dimensions, fill, outline),
+                           lambda: build_background(width, dimensions, fill, outline))
+
+
+def build_background(width, dimensions, fill, outline):
+    """draws the grid into a new PhotoImage. Every row of pixels is either a line row or a row crossing cells, so
+        only those two rows are built and the image data is put in one call
+    """
+
+    # tkinter is imported here rather than at the top, so the offscreen export can use the food sprites on
+    # machines without it
+    from tkinter import PhotoImage
+
+    square_width = width / dimensions
+    lines = set(min(int(round(i * square_width)), width - 1) for i in range(dimensions + 1))
+    line_row = "{" + " ".join([outline] * width) + "}"
+    cell_row = "{" + " ".join(outline if x in lines else fill for x in range(width)) + "}"
+    image = PhotoImage(width=width, height=width)
+    image.put(" ".join(line_row if y in lines else cell_row for y in range(width)))
+    return image
+
+
+class FoodSprites:
+    """Resized copies of the food image. The png is read from disk once, each square size is resampled once, and
+        the tkinter images made from them are kept in a small LRU. Resampling can be done ahead of time on a
+        background thread with preload; tkinter images themselves are only ever created on the calling thread
+    """
+
+    def __init__(self, path=FOOD_IMAGE_PATH, capacity=8):
+        """creates an empty cache. Nothing is read until the first image is needed
+
+        Args:
+            path (str) location of the source png
+            capacity (int) how many tkinter images to keep
+        """
+
+        self.path = path
+        self.source = None
+        self.resized = {}
+        self.lock = threading.Lock()
+        self.photos = SpriteCache(capacity)
+
+    def get(self, size):
+        """gets the food image for squares of the given size
+
+        Args:
+            size (int) width and height of a square in pixels
+
+        Returns:
+            ImageTk.PhotoImage of the food
+        """
+
+        from PIL import ImageTk
+
+        return self.photos.get(size, lambda: ImageTk.PhotoImage(self.get_resized(size)))
+
+    def get_resized(self, size):
+        """gets the source image resampled to the given size, resampling it the first time
+
+        Args:
+            size (int) width and height in pixels
+
+        Returns:
+            PIL Image of the food
+        """
+
+        # PIL is imported on first use, so a preload started at launch loads it in the background
+        from PIL import Image
+
+        with self.lock:
+            image = self.resized.get(size)
+            if image is None:
+                if self.source is None:
+                    self.source = Image.open(self.path)
+                    self.source.load()
+                image = self.resized[size] = self.source.resize((size, size), Image.LANCZOS)
+            return image
+
+    def preload(self, sizes):
+        """resamples the image for the given sizes on a background thread
+
+        Args:
+            sizes (iterable) square sizes in pixels
+
+        Returns:
+            the started thread
+        """
+
+        sizes = list(sizes)
+
+        def resize_all():
+            for size in sizes:
+                self.get_resized(size)
+        thread = threading.Thread(target=resize_all, daemon=True)
+        thread.start()
+        return thread
+
+
+food_sprites = FoodSprites()
@@ -0,0 +1,45 @@
+from tkinter import Label, LEFT
+
+from instrumentation import SIMULATE, FOOD, DRAW, SCHEDULE, INPUT
+
+REFRESH_MILLISECONDS = 500
+
+
+class StatsOverlay(Label):
+    """A label in the menu showing a board's live timings, refreshed twice a second"""
+
+    def __init__(self, parent, board, **kwargs):
+        """creates the label and starts refreshing it
+
+        Args:
+            parent (widget) the frame this label belongs to
+            board (Board) a board constructed with stats
+            **kwargs (arg list) other optional arguments for Label
+        """
+
+        Label.__init__(self, parent, justify=LEFT, font="Courier 9", **kwargs)
+        self.board = board
+        self.refresh()
+
+    def refresh(self):
+        """updates the board's gauges and shows them with the 95th percentile of every phase"""
+
+        board = self.board
+        stats = board.stats
+        stats.set_gauge("ticks_per_second", board.loop.ticks_per_second)
+        stats.set_gauge("frame_time", board.loop.frame_time)
+        stats.set_gauge("dropped_ticks", board.loop.dropped_ticks)
+        stats.set_gauge("canvas_items", len(board.find_all()))
+        stats.set_gauge("dropped_inputs", board.input_queue.dropped)
+
+        lines = ["ticks/s %9.0f" % board.loop.ticks_per_second,
+                 "tick ms %9.2f" % (board.loop.tick_interval * 1000),
+                 "frame ms %8.2f" % (board.loop.frame_time * 1000),
+                 "items %11d" % stats.gauges["canvas_items"]]
+        phases = stats.to_dict()["phases"]
+        for (name, phase) in (("sim", SIMULATE), ("food", FOOD), ("draw", DRAW), ("late", SCHEDULE),
+                              ("key", INPUT)):
+            if phases[phase]["count"]:
+                lines.append("%-4s p95 ms %5.2f" % (name, phases[phase]["p95"] * 1000))
+        self["text"] = "\n".join(lines)
+        self.after(REFRESH_MILLISECONDS, self.refresh)
@@ -0,0 +1,456 @@
+"""Streaming telemetry of games as they are played: when each game starts, every food eaten, every change of
+direction and how each game ends. Events are handed to a TelemetryStream, which collects them into batches and
+writes the batches to a sink on a background thread, so the game loop only ever appends to a list.
+
+Every event has the same fields, in EVENT_FIELDS order:
+    kind        one of EVENT_KINDS
+    game        id of the game, its seed unless given another
+    size        board dimensions
+    move        moves made when the event happened
+    length      length of the snake
+    cell        cell of the head, -1 if the snake has no head yet
+    direction   index in direction.DIRECTIONS of the last move, -1 before the first one
+    seconds     seconds since the game started, so seconds / move is the time per tick
+    time        wall clock time of the event, seconds since the epoch
+
+Sinks are picked by file extension:
+    .jsonl      one JSON object per event
+    .csv        a header row, then one row per event
+    .snkt       columnar binary (little endian): magic and version, then for every batch its event count
+                followed by each field's values packed together in COLUMNS order
+
+Usage:
+    python telemetry.py LOG [--json]
+"""
+
+import queue
+import struct
+import threading
+import time
+from array import array
+
+from direction import DIRECTION_INDEXES
+from engine import ATE, DIED, WON
+
+# kinds of event
+STARTED = "start"
+FOOD_EATEN = "food"
+TURNED = "turn"
+GAME_OVER = "died"
+GAME_WON = "won"
+# the game was abandoned before it ended, e.g. by a move limit or a restart
+STOPPED = "stopped"
+EVENT_KINDS = (STARTED, FOOD_EATEN, TURNED, GAME_OVER, GAME_WON, STOPPED)
+KIND_CODES = {kind: code for (code, kind) in enumerate(EVENT_KINDS)}
+EVENT_FIELDS = ("kind", "game", "size", "move", "length", "cell", "direction", "seconds", "time")
+# array typecode of each field in columnar files, kinds are stored as their index in EVENT_KINDS
+COLUMNS = ("B", "Q", "I", "Q", "I", "i", "b", "d", "d")
+MAGIC = b"SNKT"
+VERSION = 1
+HEADER = struct.Struct("<4sB")
+LENGTH = struct.Struct("<I")
+# events per batch, and batches waiting to be written before the stream drops them instead of waiting
+BATCH_EVENTS = 4096
+MAX_PENDING_BATCHES = 64
+# a partial batch is handed to the writer once it is this many seconds old, so slow games still show up
+FLUSH_SECONDS = 1.0
+
+
+class JsonlSink:
+    """Writes each event as a JSON object on its own line"""
+
+    # every value is a number or one of EVENT_KINDS, so the line can be formatted directly
+    LINE = "{%s}\n" % ", ".join('"%s": %s' % (field, '"%s"' if field == "kind" else "%r") for field in EVENT_FIELDS)
+
+    def __init__(self, path):
+        self.file = open(path, "w")
+
+    def write(self, events):
+        """writes a batch of event tuples"""
+
+        line = self.LINE
+        self.file.write("".join([line % event for event in events]))
+
+    def close(self):
+        self.file.close()
+
+
+class CsvSink:
+    """Writes a header row of EVENT_FIELDS, then a row per event"""
+
+    def __init__(self, path):
+        import csv
+
+        self.file = open(path, "w", newline="")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(EVENT_FIELDS)
+
+    def write(self, events):
+        """writes a batch of event tuples"""
+
+        self.writer.writerows(events)
+
+    def close(self):
+        self.file.close()
+
+
+class ColumnarSink:
+    """Writes each batch as a block holding every field's values packed together, so reading one field of a
+        block doesn't touch the others and numbers are never turned into text
+    """
+
+    def __init__(self, path):
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION))
+
+    def write(self, events):
+        """writes a batch of event tuples"""
+
+        columns = list(zip(*events))
+        columns[0] = [KIND_CODES[kind] for kind in columns[0]]
+        parts = [LENGTH.pack(len(events))]
+        parts.extend(array(typecode, column).tobytes() for (typecode, column) in zip(COLUMNS, columns))
+        self.file.write(b"".join(parts))
+
+    def close(self):
+        self.file.close()
+
+
+SINKS = {".jsonl": JsonlSink, ".csv": CsvSink, ".snkt": ColumnarSink}
+
+
+def get_sink_class(path):
+    """gets the sink class for a file from its extension
+
+    Args:
+        path (str) the file
+
+    Returns:
+        one of the classes in SINKS
+    """
+
+    for (extension, sink_class) in SINKS.items():
+        if path.endswith(extension):
+            return sink_class
+    raise ValueError("can't tell the telemetry format of %s, use one of %s" % (path, ", ".join(SINKS)))
+
+
+class TelemetryStream:
+    """Batches events and writes them on a background thread. emit only appends to the current batch, and full
+        batches are passed to the writer through a bounded queue. If the writer falls that far behind, batches are
+        dropped and counted in dropped_events rather than making the game wait, unless the stream is lossless
+    """
+
+    def __init__(self, path, batch_events=BATCH_EVENTS, max_pending_batches=MAX_PENDING_BATCHES, lossless=False,
+                 clock=time.time):
+        """opens the file and starts the writer thread
+
+        Args:
+            path (str) where to write the events, its extension picking the format from SINKS
+            batch_events (int) events handed to the writer at a time
+            max_pending_batches (int) batches that can wait to be written
+            lossless (bool) whether to wait for the writer when it is behind instead of dropping batches, for
+                games that aren't being watched
+            clock (function) returns the wall clock time of an event in seconds
+        """
+
+        self.sink = get_sink_class(path)(path)
+        self.batch_events = batch_events
+        self.lossless = lossless
+        self.clock = clock
+        self.batch = []
+        self.batch_time = clock()
+        self.pending = queue.Queue(max_pending_batches)
+        self.dropped_events = 0
+        self.event_count = 0
+        self.writer = threading.Thread(target=self.write_batches, name="telemetry writer", daemon=True)
+        self.writer.start()
+
+    def emit(self, kind, game, size, move, length, cell, direction, seconds):
+        """adds an event to the current batch, handing the batch to the writer if it is full or old enough.
+            Arguments are the fields described at the top of this module
+        """
+
+        now = self.clock()
+        batch = self.batch
+        batch.append((kind, game, size, move, length, cell, direction, seconds, now))
+        if len(batch) >= self.batch_events or now - self.batch_time >= FLUSH_SECONDS:
+            self.flush()
+
+    def flush(self):
+        """hands the current batch to the writer, even if it isn't full"""
+
+        batch = self.batch
+        self.batch = []
+        self.batch_time = self.clock()
+        if not batch:
+            return
+        self.event_count += len(batch)
+        try:
+            self.pending.put(batch, block=self.lossless)
+        except queue.Full:
+            self.dropped_events += len(batch)
+
+    def write_batches(self):
+        """writes batches until the stream is closed. Runs on the writer thread"""
+
+        while True:
+            batch = self.pending.get()
+            if batch is None:
+                break
+            self.sink.write(batch)
+        self.sink.close()
+
+    def close(self):
+        """writes everything emitted so far and waits for the file to be closed"""
+
+        self.flush()
+        self.pending.put(None)
+        self.writer.join()
+
+
+class TelemetryRecorder:
+    """Emits the events of one game as it is played. Call record after every step of the game, like a
+        ReplayRecorder, and stop if the game is abandoned before it ends
+    """
+
+    def __init__(self, stream, game, game_id=None, clock=time.perf_counter):
+        """emits the start of a game that hasn't been played yet
+
+        Args:
+            stream (TelemetryStream) where to send the events
+            game (GameState) the game
+            game_id (int) id the game's events are tagged with, or None to use its seed
+            clock (function) returns the current time in seconds, for timing the game
+        """
+
+        self.stream = stream
+        self.game = game
+        self.game_id = game.seed if game_id is None else game_id
+        self.clock = clock
+        self.start = clock()
+        self.direction = None
+        self.ended = False
+        self.emit(STARTED, -1)
+
+    def emit(self, kind, direction):
+        """sends an event about the game as it is now"""
+
+        game = self.game
+        self.stream.emit(kind, self.game_id, game.dimensions, game.moves, len(game.snake.body), game.snake.body[0],
+                         direction, self.clock() - self.start)
+
+    def record(self, direction, outcome):
+        """emits the events of a move just made
+
+        Args:
+            direction (Direction) the direction the game was stepped in
+            outcome (str) what step returned
+        """
+
+        if outcome == DIED:
+            self.end(GAME_OVER)
+            return
+        if direction is not self.direction:
+            self.direction = direction
+            self.emit(TURNED, DIRECTION_INDEXES[direction])
+        if outcome == ATE:
+            self.emit(FOOD_EATEN, DIRECTION_INDEXES[direction])
+        elif outcome == WON:
+            self.end(GAME_WON)
+
+    def stop(self):
+        """emits that the game was abandoned, unless it has already ended"""
+
+        self.end(STOPPED)
+
+    def end(self, kind):
+        """emits the end of the game, once"""
+
+        if not self.ended:
+            self.ended = True
+            self.emit(kind, DIRECTION_INDEXES[self.direction] if self.direction is not None else -1)
+
+
+def read_events(path):
+    """reads the events in a telemetry file one at a time, never holding more than a batch in memory
+
+    Args:
+        path (str) a file written by a TelemetryStream
+
+    Returns:
+        generator of event tuples in EVENT_FIELDS order
+    """
+
+    sink_class = get_sink_class(path)
+    if sink_class is ColumnarSink:
+        return read_columnar(path)
+    if sink_class is CsvSink:
+        return read_csv(path)
+    return read_jsonl(path)
+
+
+def read_jsonl(path):
+    """reads events from a JSONL file"""
+
+    import json
+
+    with open(path) as file:
+        for line in file:
+            event = json.loads(line)
+            yield tuple(event[field] for field in EVENT_FIELDS)
+
+
+def read_csv(path):
+    """reads events from a CSV file"""
+
+    import csv
+
+    with open(path, newline="") as file:
+        rows = csv.reader(file)
+        next(rows)
+        for (kind, game, size, move, length, cell, direction, seconds, event_time) in rows:
+            yield (kind, int(game), int(size), int(move), int(length), int(cell), int(direction), float(seconds),
+                   float(event_time))
+
+
+def read_columnar(path):
+    """reads events from a columnar file a block at a time"""
+
+    with open(path, "rb") as file:
+        (magic, version) = HEADER.unpack(file.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("%s isn't a version %d telemetry file" % (path, VERSION))
+        while True:
+            length = file.read(LENGTH.size)
+            if not length:
+                return
+            (count,) = LENGTH.unpack(length)
+            columns = []
+            for typecode in COLUMNS:
+                column = array(typecode)
+                column.frombytes(file.read(column.itemsize * count))
+                columns.append(column)
+            columns[0] = [EVENT_KINDS[code] for code in columns[0]]
+            yield from zip(*columns)
+
+
+class TelemetrySummary:
+    """Totals of a stream of events, kept up to date one event at a time so logs of any size can be summarized in
+        a single pass. Only games that have started but not ended are remembered individually
+    """
+
+    def __init__(self):
+        self.event_count = 0
+        self.outcomes = {GAME_OVER: 0, GAME_WON: 0, STOPPED: 0}
+        self.moves = 0
+        self.seconds = 0.0
+        self.turns = 0
+        self.foods = 0
+        self.max_moves_per_food = 0
+        # for each power of two bucket of snake length: food eaten, moves and seconds taken to reach it
+        self.length_buckets = {}
+        # game id -> (move, seconds) of the game's start or latest food
+        self.open_games = {}
+
+    def add(self, event):
+        """counts an event
+
+        Args:
+            event (tuple) fields in EVENT_FIELDS order
+        """
+
+        (kind, game, _, move, length, _, _, seconds, _) = event
+        self.event_count += 1
+        if kind == TURNED:
+            self.turns += 1
+            return
+        if kind == STARTED:
+            self.open_games[game] = (move, seconds)
+            return
+        # winning eats the last piece of food
+        if kind == FOOD_EATEN or kind == GAME_WON:
+            (last_move, last_seconds) = self.open_games.get(game, (move, seconds))
+            self.open_games[game] = (move, seconds)
+            bucket = self.length_buckets.setdefault(length.bit_length() - 1, [0, 0, 0.0])
+            bucket[0] += 1
+            bucket[1] += move - last_move
+            bucket[2] += seconds - last_seconds
+            self.foods += 1
+            self.max_moves_per_food = max(self.max_moves_per_food, move - last_move)
+        if kind in self.outcomes:
+            self.outcomes[kind] += 1
+            self.open_games.pop(game, None)
+            self.moves += move
+            self.seconds += seconds
+
+    def to_dict(self):
+        """describes the events counted so far
+
+        Returns:
+            dict of totals, with lengths listing the food eaten, mean moves per food and mean milliseconds per tick
+            for snakes that grew to between 2 ** i and 2 ** (i + 1) long
+        """
+
+        games = sum(self.outcomes.values())
+        lengths = []
+        for (bucket, (foods, moves, seconds)) in sorted(self.length_buckets.items()):
+            lengths.append({"min_length": 1 << bucket, "foods": foods, "moves_per_food": moves / foods,
+                            "ms_per_tick": seconds * 1000 / moves if moves else 0.0})
+        return {
+            "events": self.event_count, "games": games, "unfinished": len(self.open_games),
+            "won": self.outcomes[GAME_WON], "died": self.outcomes[GAME_OVER], "stopped": self.outcomes[STOPPED],
+            "mean_moves": self.moves / games if games else 0.0,
+            "ms_per_tick": self.seconds * 1000 / self.moves if self.moves else 0.0,
+            "turns_per_move": self.turns / self.moves if self.moves else 0.0,
+            "foods": self.foods, "max_moves_per_food": self.max_moves_per_food, "lengths": lengths,
+        }
+
+
+def summarize(path):
+    """summarizes a telemetry file in one pass
+
+    Args:
+        path (str) a file written by a TelemetryStream
+
+    Returns:
+        the TelemetrySummary's to_dict
+    """
+
+    summary = TelemetrySummary()
+    add = summary.add
+    for event in read_events(path):
+        add(event)
+    return summary.to_dict()
+
+
+def main():
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Summarizes a telemetry file of any size in one pass")
+    parser.add_argument("log", help="a .jsonl, .csv or .snkt file written by a TelemetryStream")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    summary = summarize(args.log)
+    elapsed = time.perf_counter() - start
+    if args.json:
+        print(json.dumps(summary))
+        return
+    print("%d events in %.1f s (%.0f events/s)" % (summary["events"], elapsed, summary["events"] / elapsed))
+    print("%d games: %d won, %d died, %d stopped, %d unfinished" % (
+        summary["games"], summary["won"], summary["died"], summary["stopped"], summary["unfinished"]))
+    print("%.1f moves per game, %.4f ms per tick, %.3f turns per move" % (
+        summary["mean_moves"], summary["ms_per_tick"], summary["turns_per_move"]))
+    print("%d food eaten, at most %d moves apart" % (summary["foods"], summary["max_moves_per_food"]))
+    print()
+    print("%10s %10s %16s %12s" % ("length", "foods", "moves per food", "ms per tick"))
+    for row in summary["lengths"]:
+        print("%10s %10d %16.1f %12.4f" % ("%d+" % row["min_length"], row["foods"], row["moves_per_food"],
+                                          row["ms_per_tick"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+from arena import Arena, EMPTY
+from direction import UP, RIGHT, DOWN, LEFT
+from engine import MOVED, DIED
+
+
+def add_snake(arena, cells):
+    """puts a snake on the given cells, head first"""
+
+    snake = arena.add_snake(cells[0])
+    for cell in cells[1:]:
+        arena.free_cells.remove(cell)
+        arena.grid[cell] = snake.owner
+        snake.body.append(cell)
+    return snake
+
+
+def test_heads_swapping_cells_both_die():
+    arena = Arena(10, food_count=0, seed=0)
+    left = add_snake(arena, [11])
+    right = add_snake(arena, [12])
+    outcomes = arena.step({left.owner: RIGHT, right.owner: LEFT})
+    assert outcomes == {left.owner: DIED, right.owner: DIED}
+    assert arena.grid[11] == EMPTY and arena.grid[12] == EMPTY
+
+
+def test_longer_heads_swapping_cells_both_die():
+    arena = Arena(10, food_count=0, seed=0)
+    left = add_snake(arena, [11, 10])
+    right = add_snake(arena, [12, 13])
+    outcomes = arena.step({left.owner: RIGHT, right.owner: LEFT})
+    assert outcomes == {left.owner: DIED, right.owner: DIED}
+
+
+def test_head_can_follow_snake_of_length_one():
+    arena = Arena(10, food_count=0, seed=0)
+    leader = add_snake(arena, [12])
+    follower = add_snake(arena, [11])
+    outcomes = arena.step({leader.owner: RIGHT, follower.owner: RIGHT})
+    assert outcomes == {leader.owner: MOVED, follower.owner: MOVED}
+    assert list(leader.body) == [13] and list(follower.body) == [12]
+    assert arena.grid[11] == EMPTY and 11 in arena.free_cells
+
+
+def test_head_swapping_with_snake_of_length_one_dies():
+    arena = Arena(10, food_count=0, seed=0)
+    short = add_snake(arena, [12])
+    long = add_snake(arena, [11, 10])
+    outcomes = arena.step({short.owner: LEFT, long.owner: RIGHT})
+    assert outcomes == {short.owner: DIED, long.owner: DIED}
+
+
+def test_head_can_follow_leaving_tail():
+    arena = Arena(10, food_count=0, seed=0)
+    leader = add_snake(arena, [13, 12])
+    follower = add_snake(arena, [11])
+    outcomes = arena.step({leader.owner: RIGHT, follower.owner: RIGHT})
+    assert outcomes == {leader.owner: MOVED, follower.owner: MOVED}
+    assert list(leader.body) == [14, 13] and list(follower.body) == [12]
+
+
+def test_heads_meeting_in_one_cell_both_die():
+    arena = Arena(10, food_count=0, seed=0)
+    top = add_snake(arena, [2])
+    bottom = add_snake(arena, [22])
+    outcomes = arena.step({top.owner: DOWN, bottom.owner: UP})
+    assert outcomes == {top.owner: DIED, bottom.owner: DIED}
@@ -0,0 +1,72 @@
+import random
+
+import numpy as np
+import pytest
+
+import batch_env
+from batch_env import BatchedGames
+from direction import DIRECTIONS, DIRECTION_INDEXES
+from engine import GameState, MOVED, ATE, DIED, WON
+from snakebot import Snakebot
+
+OUTCOME_CODES = {MOVED: batch_env.MOVED, ATE: batch_env.ATE, DIED: batch_env.DIED, WON: batch_env.WON}
+
+
+def move_food(batch, cell):
+    """moves the food of the batch's only game to the given cell, so it can follow a GameState's food"""
+
+    batch.flat_grid[batch.food[0]] = batch_env.EMPTY
+    batch.flat_grid[cell] = batch_env.FOOD
+    batch.food[0] = cell
+
+
+def assert_same(batch, game):
+    (area, head_slot) = (batch.area, batch.head_slot[0])
+    body = [batch.body[0, (head_slot - i) % area] for i in range(batch.length[0])]
+    assert body == list(game.snake.body)
+    assert batch.food[0] == game.food
+    assert batch.moves[0] == game.moves
+    assert bytes(batch.grid[0].reshape(-1)) == bytes(game.grid)
+
+
+def play_both(game, directions):
+    """steps a GameState and a batch of one game with the same moves, checking they agree after every move
+
+    Returns:
+        the outcome the game ended with
+    """
+
+    batch = BatchedGames(1, game.dimensions, seed=0)
+    move_food(batch, game.food)
+    assert_same(batch, game)
+    for direction in directions:
+        outcome = game.step(direction)
+        assert batch.step(np.array([DIRECTION_INDEXES[direction]]))[0] == OUTCOME_CODES[outcome]
+        if outcome == DIED or outcome == WON:
+            return outcome
+        if outcome == ATE:
+            move_food(batch, game.food)
+        assert_same(batch, game)
+
+
+def bot_directions(game):
+    bot = Snakebot(game)
+    while True:
+        yield bot.get_new_direction()
+
+
+def random_directions(seed):
+    rng = random.Random(seed)
+    while True:
+        yield rng.choice(DIRECTIONS)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_batch_matches_game_state_to_a_win(seed):
+    game = GameState(6, seed)
+    assert play_both(game, bot_directions(game)) == WON
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_batch_matches_game_state_to_a_death(seed):
+    assert play_both(GameState(5, seed), random_directions(seed)) == DIED
@@ -0,0 +1,66 @@
+from direction import UP, RIGHT, DOWN, LEFT
+from engine import GameState, MOVED, ATE, DIED, WON
+from snakebot import Snakebot
+
+
+def opposite(direction):
+    (dx, dy) = direction.get_deltas()
+    return next(other for other in (UP, RIGHT, DOWN, LEFT) if other.get_deltas() == (-dx, -dy))
+
+
+def play_until(game, done, move_limit=10000):
+    """plays Snakebot until done(game) holds, returning the last outcome"""
+
+    bot = Snakebot(game)
+    outcome = None
+    for _ in range(move_limit):
+        if done(game):
+            return outcome
+        outcome = game.step(bot.get_new_direction())
+    raise AssertionError("game never got there")
+
+
+def test_moving_into_empty_cell_moves_head():
+    game = GameState(5)
+    head = game.snake.get_head()
+    outcome = game.step(RIGHT)
+    assert outcome in (MOVED, ATE)
+    assert game.snake.get_head() != head
+    assert game.direction is RIGHT
+
+
+def test_leaving_board_dies():
+    game = GameState(5)
+    outcomes = [game.step(UP) for _ in range(3)]
+    assert all(outcome in (MOVED, ATE) for outcome in outcomes[:2])
+    assert outcomes[2] == DIED
+    assert game.over
+
+
+def test_eating_grows_snake():
+    game = GameState(6)
+    outcome = play_until(game, lambda game: game.snake.size() == 2)
+    assert outcome == ATE
+    assert game.food is not None and game.food != game.snake.get_head()
+
+
+def test_turning_back_into_body_dies():
+    game = GameState(6)
+    play_until(game, lambda game: game.snake.size() >= 3)
+    assert game.step(opposite(game.direction)) == DIED
+    assert game.over
+
+
+def test_head_can_move_into_leaving_tail():
+    game = GameState(6)
+    play_until(game, lambda game: game.snake.size() == 2)
+    tail = game.snake.get_tail()
+    assert game.step(opposite(game.direction)) == MOVED
+    assert game.snake.get_head() == tail
+
+
+def test_filling_board_wins():
+    game = GameState(4)
+    outcome = play_until(game, lambda game: game.over)
+    assert outcome == WON
+    assert game.snake.size() == 16
@@ -0,0 +1,42 @@
+import random
+
+from free_cells import FreeCellPool
+
+
+def test_remove_and_add_keep_membership():
+    pool = FreeCellPool(10)
+    for cell in (3, 0, 9, 5):
+        pool.remove(cell)
+    assert len(pool) == 6
+    assert sorted(cell for cell in range(10) if cell in pool) == [1, 2, 4, 6, 7, 8]
+    pool.add(0)
+    assert 0 in pool and len(pool) == 7
+
+
+def test_positions_track_cells_after_swaps():
+    pool = FreeCellPool(20)
+    rng = random.Random(0)
+    taken = set()
+    for _ in range(200):
+        cell = rng.randrange(20)
+        if cell in taken:
+            pool.add(cell)
+            taken.discard(cell)
+        else:
+            pool.remove(cell)
+            taken.add(cell)
+        assert all(pool.cells[pool.positions[cell]] == cell for cell in range(20))
+        assert set(pool.cells[:len(pool)]) == set(range(20)) - taken
+
+
+def test_sample_only_returns_free_cells_uniformly():
+    pool = FreeCellPool(8)
+    for cell in (1, 4, 6):
+        pool.remove(cell)
+    rng = random.Random(1)
+    counts = {}
+    for _ in range(5000):
+        cell = pool.sample(rng)
+        counts[cell] = counts.get(cell, 0) + 1
+    assert sorted(counts) == [0, 2, 3, 5, 7]
+    assert all(800 < count < 1200 for count in counts.values())
@@ -0,0 +1,44 @@
+from direction import UP, RIGHT, DOWN, LEFT
+from input_queue import InputQueue, INPUT_QUEUE_CAPACITY
+
+
+def test_turns_come_out_oldest_first():
+    queue = InputQueue()
+    assert queue.push(UP, RIGHT, 1.0)
+    assert queue.push(LEFT, RIGHT, 2.0)
+    assert queue.pop() == (UP, 1.0)
+    assert queue.pop() == (LEFT, 2.0)
+    assert queue.pop() is None
+
+
+def test_reversal_and_same_direction_are_dropped():
+    queue = InputQueue()
+    assert not queue.push(LEFT, RIGHT, 0.0)
+    assert not queue.push(RIGHT, RIGHT, 0.0)
+    assert len(queue) == 0
+    assert queue.dropped == 0
+
+
+def test_turns_are_checked_against_the_last_queued_one():
+    queue = InputQueue()
+    assert queue.push(UP, RIGHT, 0.0)
+    # a U-turn over two moves, not a reversal of the snake's direction
+    assert queue.push(LEFT, RIGHT, 0.0)
+    assert not queue.push(RIGHT, RIGHT, 0.0)
+
+
+def test_presses_beyond_capacity_are_dropped():
+    assert INPUT_QUEUE_CAPACITY == 3
+    queue = InputQueue()
+    for direction in (UP, LEFT, DOWN):
+        assert queue.push(direction, RIGHT, 0.0)
+    assert not queue.push(RIGHT, RIGHT, 0.0)
+    assert len(queue) == 3
+    assert queue.dropped == 1
+
+
+def test_clear_empties_queue():
+    queue = InputQueue()
+    queue.push(UP, None, 0.0)
+    queue.clear()
+    assert len(queue) == 0 and queue.pop() is None
@@ -0,0 +1,70 @@
+from direction import DIRECTIONS
+from engine import GameState, DIED
+from position import Position
+from snakebot import Snakebot
+
+
+def snapshot(position):
+    """the parts of a position that moves change"""
+
+    return (bytes(position.grid), list(position.body()), list(position.cells), list(position.positions),
+            position.free_count, position.food, position.body_hash, position.moves)
+
+
+def played_position(size=6, moves=40):
+    """a position some way into a Snakebot game, so the snake has eaten and the pool has been shuffled"""
+
+    game = GameState(size, 1)
+    bot = Snakebot(game)
+    for _ in range(moves):
+        game.step(bot.get_new_direction())
+    return Position.from_game(game)
+
+
+def legal_directions(position):
+    return [direction for direction in DIRECTIONS if position.clone().apply(direction) != DIED]
+
+
+def test_undo_after_clone_leaves_clone_intact():
+    position = played_position()
+    position.apply(legal_directions(position)[0])
+    before_undo = snapshot(position)
+    copy = position.clone()
+    position.undo()
+    assert snapshot(copy) == before_undo
+    assert snapshot(position) != before_undo
+
+
+def test_undo_restores_position_after_clone():
+    position = played_position()
+    original = snapshot(position)
+    for _ in range(5):
+        position.apply(legal_directions(position)[0])
+    copy = position.clone()
+    expected_copy = snapshot(copy)
+    for _ in range(5):
+        position.undo()
+    assert snapshot(position) == original
+    assert snapshot(copy) == expected_copy
+
+
+def test_clone_moves_independently():
+    position = played_position()
+    original = snapshot(position)
+    copy = position.clone()
+    copy.apply(legal_directions(copy)[0])
+    assert snapshot(position) == original
+    copy.undo()
+    assert snapshot(copy) == original
+
+
+def test_position_matches_game():
+    game = GameState(6, 2)
+    bot = Snakebot(game)
+    position = Position.from_game(game)
+    for _ in range(200):
+        direction = bot.get_new_direction()
+        assert position.apply(direction) == game.step(direction)
+        assert bytes(position.grid) == bytes(game.grid)
+        assert list(position.body()) == list(game.snake.body)
+        assert position.food == game.food
@@ -0,0 +1,58 @@
+from direction import UP
+from engine import GameState, DIED, WON
+from replay import CHUNK_MOVES, Replay, ReplayPlayer, ReplayRecorder
+from snakebot import Snakebot
+
+
+def record(game, directions):
+    """plays directions on game until it ends, returning the replay and the position after every move"""
+
+    recorder = ReplayRecorder(game)
+    positions = [(list(game.snake.body), game.food)]
+    for direction in directions:
+        outcome = game.step(direction)
+        recorder.record(direction, outcome)
+        if outcome == DIED:
+            break
+        positions.append((list(game.snake.body), game.food))
+        if outcome == WON:
+            break
+    return (Replay(recorder.to_bytes()), positions)
+
+
+def bot_directions(game, moves=None):
+    """yields Snakebot's moves, then UP forever once it has made the given number"""
+
+    bot = Snakebot(game)
+    while moves is None or game.moves < moves:
+        yield bot.get_new_direction()
+    while True:
+        yield UP
+
+
+def test_won_game_round_trips_across_snapshots():
+    game = GameState(20, 3)
+    (replay, positions) = record(game, bot_directions(game))
+    assert (replay.moves, replay.outcome) == (game.moves, WON)
+    assert replay.moves > 2 * CHUNK_MOVES
+    player = ReplayPlayer(replay)
+    # seeks either side of each snapshot, and backwards
+    for move in (CHUNK_MOVES - 1, CHUNK_MOVES, CHUNK_MOVES + 1, 2 * CHUNK_MOVES + 5, 3, replay.moves):
+        player.seek(move)
+        assert player.game.moves == move
+        assert (list(player.game.snake.body), player.game.food) == positions[move]
+    assert player.step() is None
+
+
+def test_lost_game_replays_to_its_death():
+    game = GameState(20, 5)
+    (replay, positions) = record(game, bot_directions(game, CHUNK_MOVES))
+    assert (replay.moves, replay.outcome) == (game.moves, DIED)
+    assert replay.moves >= CHUNK_MOVES
+    player = ReplayPlayer(replay)
+    player.seek(CHUNK_MOVES - 1)
+    assert (list(player.game.snake.body), player.game.food) == positions[CHUNK_MOVES - 1]
+    assert player.fast_forward(CHUNK_MOVES) == DIED
+    assert player.game.over
+    assert (list(player.game.snake.body), player.game.food) == positions[-1]
+    assert player.step() is None
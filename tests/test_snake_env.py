@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from direction import DIRECTIONS, RIGHT
+from snake_env import SnakeEnv
+
+
+def play(actions):
+    """plays the actions on a new environment, returning the infos of every step"""
+
+    env = SnakeEnv(10, seed=1)
+    env.reset()
+    return [dict(env.step(action)[3]) for action in actions]
+
+
+def test_numpy_integer_actions_match_directions():
+    indexes = [1, 1, 2, 2, 3]
+    expected = play([DIRECTIONS[index] for index in indexes])
+    assert play(indexes) == expected
+    assert play([np.int64(index) for index in indexes]) == expected
+    assert play([np.uint8(index) for index in indexes]) == expected
+
+
+def test_argmax_action():
+    scores = np.zeros(len(DIRECTIONS))
+    scores[DIRECTIONS.index(RIGHT)] = 1.0
+    assert play([np.argmax(scores)]) == play([RIGHT])
+
+
+@pytest.mark.parametrize("action", [-1, len(DIRECTIONS), np.int64(-1), np.uint8(len(DIRECTIONS))])
+def test_out_of_range_action_is_rejected(action):
+    env = SnakeEnv(10, seed=1)
+    env.reset()
+    with pytest.raises(ValueError):
+        env.step(action)
+    assert env.game.moves == 0
@@ -0,0 +1,41 @@
+import pytest
+
+from engine import GameState, ATE, DIED, WON
+from pathfinding import get_neighbour_lists
+from snakebot import ShortcutSnakebot, GreedySnakebot, build_odd_cycle
+
+
+def play(bot_class, size, seed):
+    game = GameState(size, seed)
+    bot = bot_class(game)
+    while True:
+        outcome = game.step(bot.get_new_direction())
+        if outcome == DIED or outcome == WON:
+            return outcome
+
+
+@pytest.mark.parametrize("size", [3, 5, 7, 9])
+def test_odd_cycle_visits_every_cell_but_the_corner(size):
+    cycle = build_odd_cycle(size)
+    neighbours = get_neighbour_lists(size)
+    assert sorted(cycle) == list(range(1, size * size))
+    assert all(cycle[(i + 1) % len(cycle)] in neighbours[cell] for (i, cell) in enumerate(cycle))
+    # the corner can swap with the cell diagonally next to it, as both are next to the cells either side of it
+    assert cycle[:3] == [1, size + 1, size]
+
+
+@pytest.mark.parametrize("bot_class", [ShortcutSnakebot, GreedySnakebot])
+@pytest.mark.parametrize("size", [2, 3, 4, 5, 6, 7, 8])
+def test_cycle_snakebots_win(bot_class, size):
+    for seed in range(10):
+        assert play(bot_class, size, seed) == WON
+
+
+def test_greedy_snakebot_heads_straight_for_the_first_food():
+    for seed in range(10):
+        game = GameState(10, seed)
+        ((row, col), (food_row, food_col)) = (divmod(game.snake.get_head(), 10), divmod(game.food, 10))
+        bot = GreedySnakebot(game)
+        while game.step(bot.get_new_direction()) != ATE:
+            pass
+        assert game.moves == abs(row - food_row) + abs(col - food_col)
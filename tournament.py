@@ -0,0 +1,186 @@
+"""Plays many headless bot games across board sizes, seeds and bots on every core, printing each game's result as
+it finishes and a summary table at the end
+
+Usage:
+    python tournament.py [--sizes 10 20 ...] [--seeds N] [--bots Snakebot ...] [--workers N] [--json]
+"""
+
+import argparse
+import os
+import time
+
+from engine import GameState, DIED, WON
+from snakebot import Snakebot, ShortcutSnakebot, GreedySnakebot
+
+# bots that can finish a board. LookaheadSnakebot only shows how to search with a Position, and dies long before
+# the board is full
+BOTS = {bot_class.__name__: bot_class for bot_class in (Snakebot, ShortcutSnakebot, GreedySnakebot)}
+DEFAULT_MOVE_LIMIT = 10 ** 8
+
+
+def play_game(bot_name, size, seed, move_limit=DEFAULT_MOVE_LIMIT, replay_dir=None, telemetry=None):
+    """plays a single game to the end, or until it has gone on for move_limit moves
+
+    Args:
+        bot_name (str) key of the bot in BOTS
+        size (int) board dimensions
+        seed (int) seed for the game's food placement
+        move_limit (int) moves after which the game is abandoned
+        replay_dir (str) directory to save the game's replay in, or None to not record it
+        telemetry (TelemetryStream) where to send the game's events, or None to not send them
+
+    Returns:
+        dict describing the game. outcome is WON, DIED, STOPPED if the move limit was hit, or INVALID if the
+        bot can't play this board size
+    """
+
+    result = {"bot": bot_name, "size": size, "seed": seed}
+    game = GameState(size, seed)
+    try:
+        bot = BOTS[bot_name](game)
+    except ValueError:
+        result.update(outcome="INVALID", moves=0, food=0, won=False, seconds=0.0, moves_per_second=0.0)
+        return result
+
+    step = game.step
+    get_new_direction = bot.get_new_direction
+    recorder = None
+    if replay_dir is not None:
+        from replay import ReplayRecorder
+
+        recorder = ReplayRecorder(game)
+    telemetry_recorder = None
+    if telemetry is not None:
+        from telemetry import TelemetryRecorder
+
+        telemetry_recorder = TelemetryRecorder(telemetry, game)
+    outcome = "STOPPED"
+    start = time.perf_counter()
+    while game.moves < move_limit:
+        direction = get_new_direction()
+        new_outcome = step(direction)
+        if recorder is not None:
+            recorder.record(direction, new_outcome)
+        if telemetry_recorder is not None:
+            telemetry_recorder.record(direction, new_outcome)
+        if new_outcome == DIED or new_outcome == WON:
+            outcome = new_outcome
+            break
+    seconds = time.perf_counter() - start
+    if telemetry_recorder is not None:
+        telemetry_recorder.stop()
+    if recorder is not None:
+        recorder.save(os.path.join(replay_dir, "%s-%d-%d.snkr" % (bot_name, size, seed)))
+
+    result.update(outcome=outcome, moves=game.moves, food=game.snake.size() - 1, won=outcome == WON,
+                  seconds=seconds, moves_per_second=game.moves / seconds if seconds else 0.0)
+    return result
+
+
+def play_task(task):
+    """unpacks a (bot_name, size, seed, move_limit, replay_dir) task for the process pool"""
+
+    return play_game(*task)
+
+
+def run(bot_names, sizes, seeds, workers, move_limit=DEFAULT_MOVE_LIMIT, replay_dir=None):
+    """plays every combination of bot, size and seed across a pool of processes
+
+    Args:
+        bot_names (list) keys of BOTS
+        sizes (list) board dimensions
+        seeds (iterable) seeds to play each bot and size with
+        workers (int) number of processes
+        move_limit (int) moves after which a game is abandoned
+        replay_dir (str) directory to save every game's replay in, or None to not record them
+
+    Returns:
+        generator of result dicts, in the order the games finish
+    """
+
+    # the biggest boards go first so one slow game doesn't hold up the end of the run
+    tasks = [(bot_name, size, seed, move_limit, replay_dir)
+             for size in sorted(sizes, reverse=True) for bot_name in bot_names for seed in seeds]
+    chunksize = max(1, len(tasks) // (workers * 16))
+    # imported here so single games can be played without loading multiprocessing
+    import multiprocessing
+
+    with multiprocessing.Pool(workers) as pool:
+        for result in pool.imap_unordered(play_task, tasks, chunksize):
+            yield result
+
+
+def summarize(results):
+    """groups results by bot and size
+
+    Args:
+        results (list) result dicts from play_game
+
+    Returns:
+        list of summary dicts sorted by bot then size
+    """
+
+    groups = {}
+    for result in results:
+        groups.setdefault((result["bot"], result["size"]), []).append(result)
+    summaries = []
+    for ((bot_name, size), games) in sorted(groups.items()):
+        played = [game for game in games if game["outcome"] != "INVALID"]
+        count = len(played) or 1
+        seconds = sum(game["seconds"] for game in played)
+        summaries.append({
+            "bot": bot_name, "size": size, "games": len(games), "invalid": len(games) - len(played),
+            "wins": sum(game["won"] for game in played),
+            "mean_moves": sum(game["moves"] for game in played) / count,
+            "mean_food": sum(game["food"] for game in played) / count,
+            "moves_per_second": sum(game["moves"] for game in played) / seconds if seconds else 0.0,
+        })
+    return summaries
+
+
+def main():
+    import json
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 20, 30])
+    parser.add_argument("--seeds", type=int, default=10, help="number of seeds played per bot and size")
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--bots", nargs="+", choices=sorted(BOTS), default=sorted(BOTS))
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--move-limit", type=int, default=DEFAULT_MOVE_LIMIT)
+    parser.add_argument("--replay-dir", help="directory to save a replay of every game in")
+    parser.add_argument("--json", action="store_true", help="print results and summaries as JSON lines")
+    args = parser.parse_args()
+
+    seeds = range(args.first_seed, args.first_seed + args.seeds)
+    results = []
+    start = time.perf_counter()
+    if not args.json:
+        print("%18s %6s %8s %8s %12s %8s %12s" % ("bot", "size", "seed", "outcome", "moves", "food", "moves/s"))
+    for result in run(args.bots, args.sizes, seeds, args.workers, args.move_limit, args.replay_dir):
+        results.append(result)
+        if args.json:
+            print(json.dumps(result), flush=True)
+        else:
+            print("%18s %6d %8d %8s %12d %8d %12.0f" % (result["bot"], result["size"], result["seed"],
+                                                       result["outcome"], result["moves"], result["food"],
+                                                       result["moves_per_second"]), flush=True)
+    elapsed = time.perf_counter() - start
+
+    summaries = summarize(results)
+    if args.json:
+        for summary in summaries:
+            print(json.dumps(dict(summary, summary=True)))
+        return
+    print()
+    print("%18s %6s %6s %6s %14s %10s %12s" % ("bot", "size", "games", "wins", "mean moves", "mean food",
+                                                "moves/s"))
+    for summary in summaries:
+        print("%18s %6d %6d %6d %14.1f %10.1f %12.0f" % (summary["bot"], summary["size"], summary["games"],
+                                                          summary["wins"], summary["mean_moves"],
+                                                          summary["mean_food"], summary["moves_per_second"]))
+    print("\n%d games in %.1f s on %d workers" % (len(results), elapsed, args.workers))
+
+
+if __name__ == "__main__":
+    main()
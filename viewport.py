@@ -0,0 +1,239 @@
+"""Drawing boards too big to fit on the canvas: a window onto the board that follows the head, and a minimap"""
+
+from tkinter import Label, PhotoImage
+
+from cell import Cell
+from engine import EMPTY, SNAKE, FOOD
+from renderer import CanvasRenderer
+
+MINIMAP_PIXELS = 100
+MINIMAP_REFRESH_MILLISECONDS = 500
+MINIMAP_VIEW_COLOR = "#ffffff"
+
+
+class ViewportRenderer(CanvasRenderer):
+    """Draws the square of view_dimensions x view_dimensions cells around the head instead of the whole board.
+        The view jumps to center the head whenever the head gets within a quarter of the view from an edge, so most
+        updates only touch the cells that changed and the whole view is redrawn once every few moves. Everything
+        kept and drawn is for cells in the view, so the cost of an update doesn't grow with the board
+    """
+
+    def __init__(self, canvas, geometry, food_image, snake_color, outline_color, view_dimensions):
+        """sets up a renderer for a board. Call reset before drawing a game
+
+        Args:
+            canvas (Canvas) the canvas to draw on
+            geometry (CellGeometry) the shapes for cells of the size being drawn
+            food_image (PhotoImage) the image drawn for food
+            snake_color (str) fill color of the snake
+            outline_color (str) outline color of body squares and the tail
+            view_dimensions (int) number of cells along each side of the view
+        """
+
+        CanvasRenderer.__init__(self, canvas, geometry, food_image, snake_color, outline_color)
+        self.view_dimensions = view_dimensions
+        self.margin = view_dimensions // 4
+        self.top = 0
+        self.left = 0
+
+    def create_items(self):
+        # Overridden from CanvasRenderer, body squares are kept by cell since only the ones in view are drawn
+        CanvasRenderer.create_items(self)
+        self.body_items = {}
+
+    def get_cell(self, index):
+        # Overridden from CanvasRenderer, cells are positioned relative to the top left corner of the view
+        (row, col) = divmod(index, self.game.dimensions)
+        return Cell((row - self.top, col - self.left), self.geometry)
+
+    def is_visible(self, index):
+        # Overridden from CanvasRenderer
+        (row, col) = divmod(index, self.game.dimensions)
+        return (self.top <= row < self.top + self.view_dimensions
+                and self.left <= col < self.left + self.view_dimensions)
+
+    def draw_body(self):
+        """moves the view to center the head and draws the body squares inside it, found by scanning the game's
+            grid one row of the view at a time
+        """
+
+        self.center_on_head()
+        spare = list(self.body_items.values())
+        self.body_items.clear()
+        game = self.game
+        dimensions = game.dimensions
+        head = game.snake.get_head()
+        tail = game.snake.get_tail()
+        for row in range(self.top, self.top + self.view_dimensions):
+            start = row * dimensions + self.left
+            end = start + self.view_dimensions
+            cell = game.grid.find(SNAKE, start, end)
+            while cell != -1:
+                if cell != head and cell != tail:
+                    self.add_square(cell, spare)
+                cell = game.grid.find(SNAKE, cell + 1, end)
+        for rectangle in spare:
+            self.canvas.delete(rectangle)
+
+    def add_square(self, cell, spare):
+        """draws a body square on a cell, reusing a spare rectangle if there is one
+
+        Args:
+            cell (int) flat index of the body cell
+            spare (list) rectangles that aren't needed where they are
+        """
+
+        coords = self.get_cell(cell).get_coords()
+        if spare:
+            rectangle = spare.pop()
+            self.canvas.coords(rectangle, coords)
+        else:
+            rectangle = self.canvas.create_rectangle(coords, fill=self.snake_color, outline=self.outline_color)
+        self.body_items[cell] = rectangle
+
+    def center_on_head(self):
+        """moves the view so the head is in its middle, as far as the edges of the board allow
+
+        Returns:
+            true if the view moved
+        """
+
+        dimensions = self.game.dimensions
+        (row, col) = divmod(self.head_cell, dimensions)
+        limit = dimensions - self.view_dimensions
+        top = min(max(row - self.view_dimensions // 2, 0), limit)
+        left = min(max(col - self.view_dimensions // 2, 0), limit)
+        moved = (top, left) != (self.top, self.left)
+        (self.top, self.left) = (top, left)
+        return moved
+
+    def head_near_edge(self):
+        """checks whether the head is within the margin of an edge of the view"""
+
+        (row, col) = divmod(self.head_cell, self.game.dimensions)
+        (low, high) = (self.margin, self.view_dimensions - self.margin)
+        return not (low <= row - self.top < high and low <= col - self.left < high)
+
+    def update(self):
+        # Overridden from CanvasRenderer
+        game = self.game
+        steps = game.moves - self.drawn_moves
+        if steps == 0:
+            return
+        self.drawn_moves = game.moves
+        body = game.snake.body
+        self.head_cell = body[0]
+
+        moved = False
+        if self.head_near_edge():
+            moved = self.center_on_head()
+        if moved:
+            self.draw_body()
+        else:
+            # the view didn't move, so the first n cells behind the head are the only ones that can have become body
+            # cells in n steps, and a square stays wherever the grid still has a body cell that isn't an end
+            (grid, head, tail) = (game.grid, body[0], body[-1])
+            spare = []
+            for (cell, rectangle) in list(self.body_items.items()):
+                if grid[cell] != SNAKE or cell == head or cell == tail:
+                    del self.body_items[cell]
+                    spare.append(rectangle)
+            for i in range(1, min(steps, len(body) - 2) + 1):
+                if body[i] not in self.body_items and self.is_visible(body[i]):
+                    self.add_square(body[i], spare)
+            for rectangle in spare:
+                self.canvas.delete(rectangle)
+
+        self.draw_head()
+        if len(body) > 1:
+            self.draw_tail(body[-1], body[-2])
+        if moved or game.food != self.food_cell:
+            self.draw_food()
+
+
+def downsample(grid, dimensions, block):
+    """shrinks a game's grid by combining each block x block square of cells into one. Rows are combined by or-ing
+        them together as integers and columns by taking the largest value, so a square holding any snake or food
+        keeps it however thin the snake is
+
+    Args:
+        grid (bytearray) the game's grid, one byte per cell
+        dimensions (int) number of cells along each side of the grid
+        block (int) number of cells along each side of a square
+
+    Returns:
+        list of bytes, one per row of squares, holding the combined value of each square
+    """
+
+    rows = []
+    for top in range(0, dimensions, block):
+        combined = 0
+        for row in range(top, min(top + block, dimensions)):
+            combined |= int.from_bytes(grid[row * dimensions:(row + 1) * dimensions], "little")
+        line = combined.to_bytes(dimensions, "little")
+        rows.append(bytes(max(line[col:col + block]) for col in range(0, dimensions, block)))
+    return rows
+
+
+class Minimap(Label):
+    """A small picture of the whole board shown in the menu, with the part in view outlined. Redrawn twice a second
+        from a downsampled copy of the board
+    """
+
+    def __init__(self, parent, board, background_color, snake_color, food_color, pixels=MINIMAP_PIXELS, **kwargs):
+        """creates the minimap and starts refreshing it
+
+        Args:
+            parent (widget) the frame this minimap belongs to
+            board (Board) the board to show
+            background_color (str) color of empty cells
+            snake_color (str) color of the snake
+            food_color (str) color of the food
+            pixels (int) largest width of the picture
+            **kwargs (arg list) other optional arguments for Label
+        """
+
+        self.image = PhotoImage(width=pixels, height=pixels)
+        Label.__init__(self, parent, image=self.image, **kwargs)
+        self.board = board
+        self.pixels = pixels
+        # color of each value in the downsampled grid, food wins over snake where both are in a square
+        colors = [None] * 4
+        colors[EMPTY] = background_color
+        colors[SNAKE] = snake_color
+        colors[FOOD] = colors[SNAKE | FOOD] = food_color
+        self.colors = colors
+        self.refresh()
+
+    def refresh(self):
+        """redraws the picture from the board's current game"""
+
+        game = self.board.game
+        block = -(-game.dimensions // self.pixels)
+        rows = [[self.colors[value] for value in row] for row in downsample(game.grid, game.dimensions, block)]
+        renderer = self.board.renderer
+        if isinstance(renderer, ViewportRenderer):
+            self.outline_view(rows, renderer, block)
+        size = len(rows)
+        if self.image.width() != size:
+            self.image.configure(width=size, height=size)
+        self.image.put(" ".join("{" + " ".join(row) + "}" for row in rows))
+        self.after(MINIMAP_REFRESH_MILLISECONDS, self.refresh)
+
+    def outline_view(self, rows, renderer, block):
+        """draws the edges of a renderer's view onto the picture
+
+        Args:
+            rows (list) list of colors for each row of the picture
+            renderer (ViewportRenderer) the renderer whose view is outlined
+            block (int) number of cells along each side of a pixel
+        """
+
+        top = renderer.top // block
+        left = renderer.left // block
+        bottom = min((renderer.top + renderer.view_dimensions - 1) // block, len(rows) - 1)
+        right = min((renderer.left + renderer.view_dimensions - 1) // block, len(rows) - 1)
+        for col in range(left, right + 1):
+            rows[top][col] = rows[bottom][col] = MINIMAP_VIEW_COLOR
+        for row in range(top, bottom + 1):
+            rows[row][left] = rows[row][right] = MINIMAP_VIEW_COLOR